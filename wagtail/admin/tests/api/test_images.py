@@ -1,5 +1,7 @@
 import json
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from wagtail.api.v2.tests.test_images import TestImageDetail, TestImageListing
@@ -174,6 +176,33 @@ class TestAdminImageListing(AdminAPITestCase, TestImageListing):
             )
             self.assertIsInstance(image["meta"]["tags"], list)
 
+    def test_thumbnail_renditions_are_prefetched(self):
+        for image in get_image_model().objects.all():
+            image.renditions.create(
+                filter_spec="max-165x165",
+                file="images/thumbnail-%d.png" % image.id,
+                width=165,
+                height=123,
+            )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get_response()
+
+        self.assertEqual(response.status_code, 200)
+        content = json.loads(response.content.decode("UTF-8"))
+        for image in content["items"]:
+            self.assertEqual(
+                image["thumbnail"]["url"],
+                "/media/images/thumbnail-%d.png" % image["id"],
+            )
+
+        rendition_queries = [
+            query
+            for query in queries.captured_queries
+            if "wagtailimages_rendition" in query["sql"]
+        ]
+        self.assertEqual(len(rendition_queries), 1)
+
 
 class TestAdminImageDetail(AdminAPITestCase, TestImageDetail):
     fixtures = ["demosite.json"]
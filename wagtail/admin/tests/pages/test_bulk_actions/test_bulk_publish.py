@@ -7,7 +7,7 @@ from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
 from wagtail.admin.views.pages.bulk_actions.page_bulk_action import PageBulkAction
-from wagtail.core.models import Page
+from wagtail.core.models import Page, PageLogEntry
 from wagtail.core.signals import page_published
 from wagtail.tests.testapp.models import SimplePage
 from wagtail.tests.utils import WagtailTestUtils
@@ -152,6 +152,48 @@ class TestBulkPublish(TestCase, WagtailTestUtils):
             self.assertEqual(mock_call["instance"], child_page)
             self.assertIsInstance(mock_call["instance"], child_page.specific_class)
 
+    def test_publish_view_post_updates_revisions_and_logs(self):
+        response = self.client.post(self.url)
+        self.assertEqual(response.status_code, 302)
+
+        for child_page in self.pages_to_be_published:
+            published_page = SimplePage.objects.get(id=child_page.id)
+            revision = published_page.get_latest_revision()
+            self.assertEqual(published_page.live_revision, revision)
+            self.assertFalse(published_page.has_unpublished_changes)
+            self.assertIsNotNone(published_page.first_published_at)
+            self.assertFalse(revision.submitted_for_moderation)
+
+            log_entry = PageLogEntry.objects.get(
+                page=child_page, action="wagtail.publish"
+            )
+            self.assertEqual(log_entry.user, self.user)
+            self.assertEqual(log_entry.revision, revision)
+
+    def test_publish_view_post_with_selected_descendant(self):
+        grandchild_page = SimplePage(
+            title="Hello grandchild",
+            slug="hello-grandchild",
+            content="Hello grandchild",
+            live=False,
+        )
+        self.child_pages[0].add_child(instance=grandchild_page)
+        grandchild_page.save_revision()
+
+        response = self.client.post(
+            self.url + f"id={grandchild_page.id}", {"include_descendants": "on"}
+        )
+        self.assertEqual(response.status_code, 302)
+
+        # The grandchild page is published once, as a selected page
+        self.assertTrue(Page.objects.get(id=grandchild_page.id).live)
+        self.assertEqual(
+            PageLogEntry.objects.filter(
+                page=grandchild_page, action="wagtail.publish"
+            ).count(),
+            1,
+        )
+
     def test_after_publish_page(self):
         def hook_func(request, action_type, pages, action_class_instance):
             self.assertEqual(action_type, "publish")
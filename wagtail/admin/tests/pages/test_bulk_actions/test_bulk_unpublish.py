@@ -1,13 +1,16 @@
 from unittest import mock
 
 from django.contrib.auth.models import Permission
+from django.db import connection
 from django.http import HttpRequest, HttpResponse
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
 from wagtail.admin.views.pages.bulk_actions.page_bulk_action import PageBulkAction
-from wagtail.core.models import Page
+from wagtail.core.actions.unpublish_pages import UnpublishPagesAction
+from wagtail.core.models import Page, PageLogEntry
 from wagtail.core.signals import page_unpublished
 from wagtail.tests.testapp.models import SimplePage
 from wagtail.tests.utils import WagtailTestUtils
@@ -140,6 +143,50 @@ class TestBulkUnpublish(TestCase, WagtailTestUtils):
             self.assertEqual(mock_call["instance"], child_page)
             self.assertIsInstance(mock_call["instance"], child_page.specific_class)
 
+    def test_unpublish_view_post_unpublishes_aliases_and_logs(self):
+        alias_page = self.pages_to_be_unpublished[0].create_alias(
+            update_slug="hello-world-alias"
+        )
+
+        response = self.client.post(self.url)
+        self.assertEqual(response.status_code, 302)
+
+        self.assertFalse(Page.objects.get(id=alias_page.id).live)
+        for child_page in self.pages_to_be_unpublished:
+            unpublished_page = Page.objects.get(id=child_page.id)
+            self.assertTrue(unpublished_page.has_unpublished_changes)
+            self.assertIsNone(unpublished_page.live_revision)
+
+            log_entry = PageLogEntry.objects.get(
+                page=child_page, action="wagtail.unpublish"
+            )
+            self.assertEqual(log_entry.user, self.user)
+
+    def test_unpublish_query_count_does_not_grow_with_pages(self):
+        def count_queries(pages):
+            with CaptureQueriesContext(connection) as queries:
+                UnpublishPagesAction(pages, user=self.user).execute(
+                    skip_permission_checks=True
+                )
+            # Frontend cache settings are looked up for each page, from the cache
+            return len([query for query in queries if '"cache"' not in query["sql"]])
+
+        more_pages = [
+            SimplePage(title=f"More {i}", slug=f"more-{i}", content=f"more-{i}")
+            for i in range(10)
+        ]
+        for page in more_pages:
+            self.root_page.add_child(instance=page)
+
+        # Warm up caches, such as the site root paths, that are filled on first use
+        count_queries(self.child_pages[:1])
+
+        self.assertEqual(
+            count_queries(self.child_pages[1:3]), count_queries(more_pages)
+        )
+        for page in self.child_pages[:3] + more_pages:
+            self.assertFalse(Page.objects.get(id=page.id).live)
+
     def test_after_unpublish_page(self):
         def hook_func(request, action_type, pages, action_class_instance):
             self.assertEqual(action_type, "unpublish")
@@ -2,6 +2,7 @@ from django.utils.translation import gettext_lazy as _
 from django.utils.translation import ngettext
 
 from wagtail.admin.views.pages.bulk_actions.page_bulk_action import PageBulkAction
+from wagtail.core.utils import batch_side_effects
 
 
 class DeleteBulkAction(PageBulkAction):
@@ -13,7 +14,7 @@ class DeleteBulkAction(PageBulkAction):
     classes = {"serious"}
 
     def check_perm(self, page):
-        return page.permissions_for_user(self.request.user).can_delete()
+        return self.user_perms.for_page(page).can_delete()
 
     def object_context(self, page):
         return {
@@ -24,10 +25,16 @@ class DeleteBulkAction(PageBulkAction):
     @classmethod
     def execute_action(cls, objects, user=None, **kwargs):
         num_parent_objects, num_child_objects = 0, 0
-        for page in objects:
-            num_parent_objects += 1
-            num_child_objects += page.get_descendant_count()
-            page.delete(user=user)
+        deleted_paths = []
+        with batch_side_effects():
+            for page in sorted(objects, key=lambda page: page.path):
+                num_parent_objects += 1
+                # Pages below a page that has already been deleted are gone with it
+                if any(page.path.startswith(path) for path in deleted_paths):
+                    continue
+                num_child_objects += page.get_descendant_count()
+                page.delete(user=user)
+                deleted_paths.append(page.path)
         return num_parent_objects, num_child_objects
 
     def get_success_message(self, num_parent_objects, num_child_objects):
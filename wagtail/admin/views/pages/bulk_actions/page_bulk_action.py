@@ -1,8 +1,9 @@
 from django import forms
+from django.utils.functional import cached_property
 
 from wagtail.admin.views.bulk_action import BulkAction
 from wagtail.admin.views.pages.search import page_filter_search
-from wagtail.core.models import Page
+from wagtail.core.models import Page, UserPagePermissionsProxy
 
 
 class DefaultPageForm(forms.Form):
@@ -13,6 +14,11 @@ class PageBulkAction(BulkAction):
     models = [Page]
     form_class = DefaultPageForm
 
+    @cached_property
+    def user_perms(self):
+        # Share one permissions lookup across all the pages in the bulk action
+        return UserPagePermissionsProxy(self.request.user)
+
     def get_all_objects_in_listing_query(self, parent_id):
         listing_objects = self.model.objects.all()
 
@@ -39,7 +45,7 @@ class PageBulkAction(BulkAction):
         context["items_with_no_access"] = [
             {
                 "item": page,
-                "can_edit": page.permissions_for_user(self.request.user).can_edit(),
+                "can_edit": self.user_perms.for_page(page).can_edit(),
             }
             for page in context["items_with_no_access"]
         ]
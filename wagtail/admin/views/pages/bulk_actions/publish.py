@@ -2,6 +2,8 @@ from django.utils.translation import gettext_lazy as _
 from django.utils.translation import ngettext
 
 from wagtail.admin.views.pages.bulk_actions.page_bulk_action import PageBulkAction
+from wagtail.core.actions.publish_pages import PublishPagesAction
+from wagtail.core.models import UserPagePermissionsProxy
 
 
 class PublishBulkAction(PageBulkAction):
@@ -12,7 +14,7 @@ class PublishBulkAction(PageBulkAction):
     action_priority = 40
 
     def check_perm(self, page):
-        return page.permissions_for_user(self.request.user).can_publish()
+        return self.user_perms.for_page(page).can_publish()
 
     def object_context(self, obj):
         context = super().object_context(obj)
@@ -38,24 +40,26 @@ class PublishBulkAction(PageBulkAction):
 
     @classmethod
     def execute_action(cls, objects, include_descendants=False, user=None, **kwargs):
-        num_parent_objects, num_child_objects = 0, 0
-        for page in objects:
-            page.get_latest_revision().publish(user=user)
-            num_parent_objects += 1
-
-            if include_descendants:
-                for draft_descendant_page in (
-                    page.get_descendants().not_live().defer_streamfields().specific()
-                ):
+        pages = list(objects)
+        page_ids = {page.pk for page in pages}
+        descendants = []
+        if include_descendants:
+            user_perms = UserPagePermissionsProxy(user) if user else None
+            for page in pages:
+                for draft_descendant_page in page.get_descendants().not_live():
+                    if draft_descendant_page.pk in page_ids:
+                        continue
                     if (
-                        user is None
-                        or draft_descendant_page.permissions_for_user(
-                            user
-                        ).can_publish()
+                        user_perms is None
+                        or user_perms.for_page(draft_descendant_page).can_publish()
                     ):
-                        draft_descendant_page.get_latest_revision().publish(user=user)
-                        num_child_objects += 1
-        return num_parent_objects, num_child_objects
+                        page_ids.add(draft_descendant_page.pk)
+                        descendants.append(draft_descendant_page)
+
+        PublishPagesAction(pages + descendants, user=user).execute(
+            skip_permission_checks=True
+        )
+        return len(pages), len(descendants)
 
     def get_success_message(self, num_parent_objects, num_child_objects):
         include_descendants = self.cleaned_form.cleaned_data["include_descendants"]
@@ -2,6 +2,7 @@ from django.utils.translation import gettext_lazy as _
 from django.utils.translation import ngettext
 
 from wagtail.admin.views.pages.bulk_actions.page_bulk_action import PageBulkAction
+from wagtail.core.actions.unpublish_pages import UnpublishPagesAction
 
 
 class UnpublishBulkAction(PageBulkAction):
@@ -12,7 +13,7 @@ class UnpublishBulkAction(PageBulkAction):
     action_priority = 50
 
     def check_perm(self, page):
-        return page.permissions_for_user(self.request.user).can_unpublish()
+        return self.user_perms.for_page(page).can_unpublish()
 
     def object_context(self, page):
         return {
@@ -45,19 +46,22 @@ class UnpublishBulkAction(PageBulkAction):
         permission_checker=None,
         **kwargs,
     ):
-        num_parent_objects, num_child_objects = 0, 0
-        for page in objects:
-            page.unpublish(user=user)
-            num_parent_objects += 1
-
-            if include_descendants:
-                for live_descendant_page in (
-                    page.get_descendants().live().defer_streamfields().specific()
-                ):
+        pages = list(objects)
+        page_ids = {page.pk for page in pages}
+        descendants = []
+        if include_descendants:
+            for page in pages:
+                for live_descendant_page in page.get_descendants().live():
+                    if live_descendant_page.pk in page_ids:
+                        continue
                     if user is None or permission_checker(live_descendant_page):
-                        live_descendant_page.unpublish()
-                        num_child_objects += 1
-        return num_parent_objects, num_child_objects
+                        page_ids.add(live_descendant_page.pk)
+                        descendants.append(live_descendant_page)
+
+        UnpublishPagesAction(pages, user=user).execute(skip_permission_checks=True)
+        # Descendants are unpublished without being attributed to the user, as before
+        UnpublishPagesAction(descendants).execute()
+        return len(pages), len(descendants)
 
     def get_success_message(self, num_parent_objects, num_child_objects):
         include_descendants = self.cleaned_form.cleaned_data["include_descendants"]
@@ -20,3 +20,11 @@ class WagtailAPIV2AppConfig(AppConfig):
                 raise ImproperlyConfigured(
                     "The setting 'WAGTAILAPI_USE_FRONTENDCACHE' is True but 'wagtail.contrib.frontend_cache' is not in INSTALLED_APPS."
                 )
+
+        # Install response cache invalidation signal handlers
+        if getattr(settings, "WAGTAILAPI_CACHE_ENABLED", False):
+            from wagtail.api.v2.signal_handlers import (
+                register_response_cache_signal_handlers,
+            )
+
+            register_response_cache_signal_handlers()
@@ -0,0 +1,85 @@
+import hashlib
+import json
+import uuid
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import transaction
+from rest_framework.utils.encoders import JSONEncoder
+
+API_VERSION_CACHE_KEY = "wagtailapi_v2_version"
+API_RESPONSE_CACHE_KEY_PREFIX = "wagtailapi_v2_response"
+
+
+def get_etag(data):
+    """
+    Return an ETag for the given response data, which changes whenever the data does
+    """
+    content = json.dumps(data, cls=JSONEncoder)
+    return '"%s"' % hashlib.md5(content.encode("utf-8")).hexdigest()
+
+
+class APIResponseCache:
+    """
+    Stores the serialized data of API responses, along with their ETags.
+
+    Every response is keyed on a version token, which is replaced whenever a page is
+    published, unpublished, moved or deleted, or an image or document is changed, so all
+    responses are discarded at once. This is because API responses often include data
+    from other objects, such as the parent page or images of a page.
+    """
+
+    def __init__(self, cache, timeout=DEFAULT_TIMEOUT):
+        self.cache = cache
+        self.timeout = timeout
+
+    def get_version(self):
+        version = self.cache.get(API_VERSION_CACHE_KEY)
+        if version is None:
+            self.cache.add(API_VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+            version = self.cache.get(API_VERSION_CACHE_KEY)
+        return version
+
+    def invalidate(self):
+        self.cache.set(API_VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+
+    def get_key(self, request):
+        # The absolute URI covers the site (which pages are listed depends on the hostname)
+        # and all query parameters
+        key = hashlib.sha1(request.build_absolute_uri().encode("utf-8")).hexdigest()
+        return "%s:%s:%s" % (API_RESPONSE_CACHE_KEY_PREFIX, self.get_version(), key)
+
+    def get(self, request):
+        """
+        Return a (data, etag) pair for the request, or None if it isn't cached
+        """
+        return self.cache.get(self.get_key(request))
+
+    def set(self, request, data, etag):
+        self.cache.set(self.get_key(request), (data, etag), self.timeout)
+
+
+def get_api_response_cache():
+    """
+    Return the APIResponseCache to use, or None if WAGTAILAPI_CACHE_ENABLED isn't set
+    """
+    if not getattr(settings, "WAGTAILAPI_CACHE_ENABLED", False):
+        return None
+
+    return APIResponseCache(
+        caches[getattr(settings, "WAGTAILAPI_CACHE_ALIAS", DEFAULT_CACHE_ALIAS)],
+        timeout=getattr(settings, "WAGTAILAPI_CACHE_TIMEOUT", DEFAULT_TIMEOUT),
+    )
+
+
+def invalidate_api_response_cache():
+    """
+    Discard all cached API responses. This happens immediately and again once the current
+    transaction commits, so that responses built from the old data in the meantime are
+    not used.
+    """
+    response_cache = get_api_response_cache()
+    if response_cache is not None:
+        response_cache.invalidate()
+        transaction.on_commit(response_cache.invalidate)
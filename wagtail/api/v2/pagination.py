@@ -1,13 +1,46 @@
+import base64
+import json
 from collections import OrderedDict
 
 from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Q, QuerySet
 from rest_framework.pagination import BasePagination
 from rest_framework.response import Response
 
-from .utils import BadRequestError
+from .utils import BadRequestError, parse_boolean
+
+
+def encode_cursor(ordering, value, pk):
+    data = json.dumps([ordering, value, pk])
+    return base64.urlsafe_b64encode(data.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor):
+    try:
+        ordering, value, pk = json.loads(
+            base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        )
+    except (TypeError, ValueError):
+        raise BadRequestError("cursor is not valid")
+
+    return ordering, value, pk
 
 
 class WagtailPagination(BasePagination):
+    """
+    Paginates listings using the ``offset`` and ``limit`` query parameters, or with a
+    cursor if the ``cursor`` parameter is given.
+
+    Cursors point at the last item of the previous page, so each page is fetched by
+    filtering on the ordering field (and the primary key, to break ties) rather than
+    with an OFFSET, which is slow for items deep into large listings. The listing must be
+    ordered by a single non-nullable field. Pass an empty ``cursor`` parameter to fetch
+    the first page, and the ``next_cursor`` value from the response to fetch the next one.
+
+    ``count=false`` omits ``total_count`` from the response, to save counting the items.
+    """
+
     def paginate_queryset(self, queryset, request, view=None):
         limit_max = getattr(settings, "WAGTAILAPI_LIMIT_MAX", 20)
 
@@ -29,24 +62,114 @@ class WagtailPagination(BasePagination):
         if limit_max and limit > limit_max:
             raise BadRequestError("limit cannot be higher than %d" % limit_max)
 
+        try:
+            count = parse_boolean(request.GET.get("count", "true"))
+        except ValueError:
+            raise BadRequestError("count must be 'true' or 'false'")
+
+        self.view = view
+        self.total_count = queryset.count() if count else None
+        self.use_cursor = "cursor" in request.GET
+
+        if self.use_cursor:
+            if "offset" in request.GET:
+                raise BadRequestError("cursor and offset cannot be used together")
+
+            return self.paginate_queryset_with_cursor(
+                queryset, request.GET["cursor"], limit
+            )
+
         start = offset
         stop = offset + limit
 
-        self.view = view
-        self.total_count = queryset.count()
         return queryset[start:stop]
 
+    def get_cursor_ordering(self, queryset):
+        """
+        Return the field that the queryset is ordered by and whether it's in descending
+        order, raising BadRequestError if it can't be paginated with a cursor
+        """
+        if not isinstance(queryset, QuerySet):
+            # Search results are ordered by relevance
+            raise BadRequestError("cursor cannot be used with search")
+
+        model = queryset.model
+        order_by = list(queryset.query.order_by or model._meta.ordering or ["pk"])
+
+        if len(order_by) == 2 and order_by[1].lstrip("-") in (
+            "pk",
+            model._meta.pk.name,
+        ):
+            # Already ordered by the primary key as a tie breaker
+            order_by = order_by[:1]
+
+        if len(order_by) != 1 or not isinstance(order_by[0], str) or order_by[0] == "?":
+            raise BadRequestError("cursor cannot be used with this ordering")
+
+        field_name = order_by[0].lstrip("-")
+        if field_name == "pk":
+            field_name = model._meta.pk.name
+        descending = order_by[0].startswith("-") == queryset.query.standard_ordering
+
+        try:
+            field = model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            raise BadRequestError("cursor cannot be used with this ordering")
+
+        if not field.concrete or field.null or field.is_relation:
+            raise BadRequestError(
+                "cursor cannot be used when ordering by '%s'" % field_name
+            )
+
+        return field, descending
+
+    def paginate_queryset_with_cursor(self, queryset, cursor, limit):
+        field, descending = self.get_cursor_ordering(queryset)
+        ordering = ("-" if descending else "") + field.name
+
+        if not queryset.query.standard_ordering:
+            # Undo reverse(), as the ordering is now given explicitly
+            queryset = queryset.reverse()
+        queryset = queryset.order_by(ordering, "-pk" if descending else "pk")
+
+        if cursor:
+            cursor_ordering, value, pk = decode_cursor(cursor)
+            if cursor_ordering != ordering:
+                raise BadRequestError("cursor is not valid for this ordering")
+
+            lookup = "lt" if descending else "gt"
+            queryset = queryset.filter(
+                Q(**{field.name + "__" + lookup: value})
+                | Q(**{field.name: value, "pk__" + lookup: pk})
+            )
+
+        # Fetch one extra item to find out whether there's a next page
+        items = list(queryset[: limit + 1])
+
+        if len(items) > limit:
+            items = items[:limit]
+            last_item = items[-1]
+            # value_to_string keeps the full precision of values such as datetimes
+            self.next_cursor = encode_cursor(
+                ordering,
+                field.value_to_string(last_item),
+                str(last_item.pk),
+            )
+        else:
+            self.next_cursor = None
+
+        return items
+
     def get_paginated_response(self, data):
+        meta = OrderedDict()
+        if self.total_count is not None:
+            meta["total_count"] = self.total_count
+        if self.use_cursor:
+            meta["next_cursor"] = self.next_cursor
+
         data = OrderedDict(
             [
-                (
-                    "meta",
-                    OrderedDict(
-                        [
-                            ("total_count", self.total_count),
-                        ]
-                    ),
-                ),
+                ("meta", meta),
                 ("items", data),
             ]
         )
@@ -1,3 +1,4 @@
+import functools
 from collections import OrderedDict
 
 from django.urls.exceptions import NoReverseMatch
@@ -145,12 +146,7 @@ class PageParentField(relations.RelatedField):
             return parent
 
     def to_representation(self, value):
-        serializer_class = get_serializer_class(
-            value.__class__,
-            ["id", "type", "detail_url", "html_url", "title"],
-            meta_fields=["type", "detail_url", "html_url"],
-            base=PageSerializer,
-        )
+        serializer_class = get_page_summary_serializer_class(value.__class__)
         serializer = serializer_class(context=self.context)
         return serializer.to_representation(value)
 
@@ -164,12 +160,7 @@ class PageAliasOfField(relations.RelatedField):
         return instance.alias_of
 
     def to_representation(self, value):
-        serializer_class = get_serializer_class(
-            value.__class__,
-            ["id", "type", "detail_url", "html_url", "title"],
-            meta_fields=["type", "detail_url", "html_url"],
-            base=PageSerializer,
-        )
+        serializer_class = get_page_summary_serializer_class(value.__class__)
         serializer = serializer_class(context=self.context)
         return serializer.to_representation(value)
 
@@ -417,3 +408,17 @@ def get_serializer_class(
         attrs.update(field_serializer_overrides)
 
     return type(str(model_.__name__ + "Serializer"), (base,), attrs)
+
+
+@functools.lru_cache(maxsize=None)
+def get_page_summary_serializer_class(model):
+    """
+    Return the serializer class used for pages that are referenced from another page's
+    fields (such as its parent), which is the same for every request
+    """
+    return get_serializer_class(
+        model,
+        ["id", "type", "detail_url", "html_url", "title"],
+        meta_fields=["type", "detail_url", "html_url"],
+        base=PageSerializer,
+    )
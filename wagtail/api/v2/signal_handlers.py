@@ -2,11 +2,12 @@ from django.db.models.signals import post_delete, post_save
 from django.urls import reverse
 
 from wagtail.contrib.frontend_cache.utils import purge_url_from_cache
-from wagtail.core.models import get_page_models
-from wagtail.core.signals import page_published, page_unpublished
+from wagtail.core.models import PageViewRestriction, get_page_models
+from wagtail.core.signals import page_published, page_unpublished, post_page_move
 from wagtail.documents import get_document_model
 from wagtail.images import get_image_model
 
+from .cache import invalidate_api_response_cache
 from .utils import get_base_url
 
 
@@ -59,3 +60,64 @@ def unregister_signal_handlers():
     post_delete.disconnect(purge_image_from_cache, sender=Image)
     post_save.disconnect(purge_document_from_cache, sender=Document)
     post_delete.disconnect(purge_document_from_cache, sender=Document)
+
+
+def invalidate_api_response_cache_signal_handler(**kwargs):
+    invalidate_api_response_cache()
+
+
+def register_response_cache_signal_handlers():
+    Image = get_image_model()
+    Document = get_document_model()
+
+    for model in get_page_models():
+        page_published.connect(
+            invalidate_api_response_cache_signal_handler, sender=model
+        )
+        page_unpublished.connect(
+            invalidate_api_response_cache_signal_handler, sender=model
+        )
+        post_delete.connect(invalidate_api_response_cache_signal_handler, sender=model)
+
+    post_page_move.connect(invalidate_api_response_cache_signal_handler)
+    # Pages that become private must stop being served from the cache
+    post_save.connect(
+        invalidate_api_response_cache_signal_handler, sender=PageViewRestriction
+    )
+    post_delete.connect(
+        invalidate_api_response_cache_signal_handler, sender=PageViewRestriction
+    )
+    post_save.connect(invalidate_api_response_cache_signal_handler, sender=Image)
+    post_delete.connect(invalidate_api_response_cache_signal_handler, sender=Image)
+    post_save.connect(invalidate_api_response_cache_signal_handler, sender=Document)
+    post_delete.connect(invalidate_api_response_cache_signal_handler, sender=Document)
+
+
+def unregister_response_cache_signal_handlers():
+    Image = get_image_model()
+    Document = get_document_model()
+
+    for model in get_page_models():
+        page_published.disconnect(
+            invalidate_api_response_cache_signal_handler, sender=model
+        )
+        page_unpublished.disconnect(
+            invalidate_api_response_cache_signal_handler, sender=model
+        )
+        post_delete.disconnect(
+            invalidate_api_response_cache_signal_handler, sender=model
+        )
+
+    post_page_move.disconnect(invalidate_api_response_cache_signal_handler)
+    post_save.disconnect(
+        invalidate_api_response_cache_signal_handler, sender=PageViewRestriction
+    )
+    post_delete.disconnect(
+        invalidate_api_response_cache_signal_handler, sender=PageViewRestriction
+    )
+    post_save.disconnect(invalidate_api_response_cache_signal_handler, sender=Image)
+    post_delete.disconnect(invalidate_api_response_cache_signal_handler, sender=Image)
+    post_save.disconnect(invalidate_api_response_cache_signal_handler, sender=Document)
+    post_delete.disconnect(
+        invalidate_api_response_cache_signal_handler, sender=Document
+    )
@@ -362,6 +362,24 @@ class TestImageListing(TestCase):
         self.assertEqual(response.status_code, 400)
         self.assertEqual(content, {"message": "offset must be a positive integer"})
 
+    # CURSOR
+
+    def test_cursor(self):
+        image_id_list = []
+        cursor = ""
+        while cursor is not None:
+            response = self.get_response(cursor=cursor, limit=2, order="-id")
+            content = json.loads(response.content.decode("UTF-8"))
+            image_id_list.extend(self.get_image_id_list(content))
+            cursor = content["meta"]["next_cursor"]
+
+        self.assertEqual(
+            image_id_list,
+            list(
+                get_image_model().objects.order_by("-id").values_list("id", flat=True)
+            ),
+        )
+
     # SEARCH
 
     def test_search_for_james_joyce(self):
@@ -4,8 +4,9 @@ from unittest import mock
 
 from django.contrib.auth.models import Group
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection
 from django.test import TestCase
-from django.test.utils import override_settings
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.urls import reverse
 from rest_framework.test import APIClient
 
@@ -1017,6 +1018,121 @@ class TestPageListing(TestCase, WagtailTestUtils):
         self.assertEqual(response.status_code, 400)
         self.assertEqual(content, {"message": "offset must be a positive integer"})
 
+    # CURSOR
+
+    def get_all_pages_with_cursor(self, **params):
+        page_id_list = []
+        cursor = ""
+        while cursor is not None:
+            response = self.get_response(cursor=cursor, limit=3, **params)
+            self.assertEqual(response.status_code, 200)
+            content = json.loads(response.content.decode("UTF-8"))
+            page_id_list.extend(self.get_page_id_list(content))
+            cursor = content["meta"]["next_cursor"]
+
+        return page_id_list
+
+    def test_cursor_returns_all_pages_in_order(self):
+        response = self.get_response(limit=20)
+        content = json.loads(response.content.decode("UTF-8"))
+
+        self.assertEqual(
+            self.get_all_pages_with_cursor(), self.get_page_id_list(content)
+        )
+
+    def test_cursor_with_ordering(self):
+        response = self.get_response(order="-title", limit=20)
+        content = json.loads(response.content.decode("UTF-8"))
+
+        self.assertEqual(
+            self.get_all_pages_with_cursor(order="-title"),
+            self.get_page_id_list(content),
+        )
+
+    def test_cursor_does_not_use_offset(self):
+        first_page = json.loads(
+            self.get_response(cursor="", limit=3).content.decode("UTF-8")
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get_response(
+                cursor=first_page["meta"]["next_cursor"], limit=3, count="false"
+            )
+        content = json.loads(response.content.decode("UTF-8"))
+
+        self.assertEqual(len(content["items"]), 3)
+        self.assertNotIn("total_count", content["meta"])
+        for query in queries.captured_queries:
+            self.assertNotIn("OFFSET", query["sql"])
+
+    def test_cursor_total_count(self):
+        response = self.get_response(cursor="", limit=3)
+        content = json.loads(response.content.decode("UTF-8"))
+
+        self.assertEqual(content["meta"]["total_count"], get_total_page_count())
+        self.assertIsNotNone(content["meta"]["next_cursor"])
+
+    def test_cursor_with_offset_gives_error(self):
+        response = self.get_response(cursor="", offset=3)
+        content = json.loads(response.content.decode("UTF-8"))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            content, {"message": "cursor and offset cannot be used together"}
+        )
+
+    def test_invalid_cursor_gives_error(self):
+        response = self.get_response(cursor="abc")
+        content = json.loads(response.content.decode("UTF-8"))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(content, {"message": "cursor is not valid"})
+
+    def test_cursor_from_other_ordering_gives_error(self):
+        first_page = json.loads(
+            self.get_response(cursor="", limit=3).content.decode("UTF-8")
+        )
+        response = self.get_response(
+            cursor=first_page["meta"]["next_cursor"], order="title"
+        )
+        content = json.loads(response.content.decode("UTF-8"))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(content, {"message": "cursor is not valid for this ordering"})
+
+    def test_cursor_with_nullable_ordering_field_gives_error(self):
+        response = self.get_response(cursor="", order="first_published_at")
+        content = json.loads(response.content.decode("UTF-8"))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            content,
+            {"message": "cursor cannot be used when ordering by 'first_published_at'"},
+        )
+
+    def test_cursor_with_search_gives_error(self):
+        response = self.get_response(cursor="", search="blog")
+        content = json.loads(response.content.decode("UTF-8"))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(content, {"message": "cursor cannot be used with search"})
+
+    # COUNT
+
+    def test_count_false_omits_total_count(self):
+        response = self.get_response(count="false")
+        content = json.loads(response.content.decode("UTF-8"))
+
+        self.assertEqual(content["meta"], {})
+        self.assertEqual(len(content["items"]), get_total_page_count())
+
+    def test_count_not_boolean_gives_error(self):
+        response = self.get_response(count="abc")
+        content = json.loads(response.content.decode("UTF-8"))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(content, {"message": "count must be 'true' or 'false'"})
+
     # SEARCH
 
     def test_search_for_blog(self):
@@ -0,0 +1,217 @@
+import base64
+import json
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.http import http_date
+
+from wagtail.api.v2 import signal_handlers
+from wagtail.api.v2.views import PagesAPIViewSet
+from wagtail.core.models import Page, PageViewRestriction
+from wagtail.tests.utils import WagtailTestUtils
+
+
+class TestConditionalGet(TestCase):
+    fixtures = ["demosite.json"]
+
+    def test_listing_etag(self):
+        response = self.client.get(reverse("wagtailapi_v2:pages:listing"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.has_header("ETag"))
+
+        response = self.client.get(
+            reverse("wagtailapi_v2:pages:listing"),
+            HTTP_IF_NONE_MATCH=response["ETag"],
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_etag_changes_with_content(self):
+        etag = self.client.get(reverse("wagtailapi_v2:pages:detail", args=(2,)))["ETag"]
+
+        page = Page.objects.get(id=2)
+        page.title = "New title"
+        page.save_revision().publish()
+
+        response = self.client.get(
+            reverse("wagtailapi_v2:pages:detail", args=(2,)),
+            HTTP_IF_NONE_MATCH=etag,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_etag_depends_on_query(self):
+        etag = self.client.get(reverse("wagtailapi_v2:pages:listing"))["ETag"]
+
+        response = self.client.get(
+            reverse("wagtailapi_v2:pages:listing"),
+            {"limit": 2},
+            HTTP_IF_NONE_MATCH=etag,
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_detail_has_no_last_modified(self):
+        # Detail responses include related data, such as the parent page, that can
+        # change without the object itself changing, so only the ETag is used
+        response = self.client.get(reverse("wagtailapi_v2:pages:detail", args=(2,)))
+        self.assertTrue(response.has_header("ETag"))
+        self.assertFalse(response.has_header("Last-Modified"))
+
+        response = self.client.get(
+            reverse("wagtailapi_v2:pages:detail", args=(2,)),
+            HTTP_IF_MODIFIED_SINCE=http_date(),
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_no_etag_for_browsable_api(self):
+        response = self.client.get(
+            reverse("wagtailapi_v2:pages:listing"), HTTP_ACCEPT="text/html"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("ETag"))
+
+    def test_no_etag_for_errors(self):
+        response = self.client.get(reverse("wagtailapi_v2:pages:detail", args=(1000,)))
+
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(response.has_header("ETag"))
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+        "api": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "wagtailapi-response-cache-tests",
+        },
+    },
+    WAGTAILAPI_CACHE_ENABLED=True,
+    WAGTAILAPI_CACHE_ALIAS="api",
+)
+class TestResponseCache(TestCase, WagtailTestUtils):
+    fixtures = ["demosite.json"]
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        signal_handlers.register_response_cache_signal_handlers()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        signal_handlers.unregister_response_cache_signal_handlers()
+
+    def setUp(self):
+        caches["api"].clear()
+        self.addCleanup(caches["api"].clear)
+
+    def get_listing(self):
+        return self.client.get(reverse("wagtailapi_v2:pages:listing"))
+
+    def test_listing_is_cached(self):
+        response = self.get_listing()
+
+        with mock.patch.object(
+            PagesAPIViewSet, "get_serializer", side_effect=AssertionError
+        ):
+            cached_response = self.get_listing()
+
+        self.assertEqual(cached_response.status_code, 200)
+        self.assertEqual(cached_response.content, response.content)
+        self.assertEqual(cached_response["ETag"], response["ETag"])
+
+    def test_detail_is_cached(self):
+        response = self.client.get(reverse("wagtailapi_v2:pages:detail", args=(2,)))
+
+        with mock.patch.object(
+            PagesAPIViewSet, "get_serializer", side_effect=AssertionError
+        ):
+            cached_response = self.client.get(
+                reverse("wagtailapi_v2:pages:detail", args=(2,))
+            )
+
+        self.assertEqual(cached_response.content, response.content)
+
+    def test_publish_invalidates_cache(self):
+        self.get_listing()
+
+        page = Page.objects.get(id=2)
+        page.title = "New title"
+        with self.captureOnCommitCallbacks(execute=True):
+            page.save_revision().publish()
+
+        response = self.client.get(reverse("wagtailapi_v2:pages:detail", args=(2,)))
+        self.assertEqual(json.loads(response.content)["title"], "New title")
+
+        response = self.client.get(
+            reverse("wagtailapi_v2:pages:listing"), {"fields": "title"}
+        )
+        self.assertIn(
+            "New title",
+            [item["title"] for item in json.loads(response.content)["items"]],
+        )
+
+    def test_delete_invalidates_cache(self):
+        response = self.get_listing()
+        total_count = json.loads(response.content)["meta"]["total_count"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Page.objects.get(id=16).delete()
+
+        response = self.get_listing()
+        self.assertEqual(
+            json.loads(response.content)["meta"]["total_count"], total_count - 1
+        )
+
+    def get_listed_page_ids(self):
+        response = self.get_listing()
+        return {item["id"] for item in json.loads(response.content)["items"]}
+
+    def test_view_restriction_invalidates_cache(self):
+        url = reverse("wagtailapi_v2:pages:detail", args=(2,))
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertIn(2, self.get_listed_page_ids())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            restriction = PageViewRestriction.objects.create(
+                page=Page.objects.get(id=2),
+                restriction_type=PageViewRestriction.PASSWORD,
+                password="secret",
+            )
+
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertNotIn(2, self.get_listed_page_ids())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            restriction.delete()
+
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertIn(2, self.get_listed_page_ids())
+
+    def test_authenticated_requests_are_not_cached(self):
+        user = self.create_user("apiuser", password="password")
+        credentials = base64.b64encode(
+            ("%s:password" % user.get_username()).encode("utf-8")
+        ).decode("ascii")
+
+        response = self.client.get(
+            reverse("wagtailapi_v2:pages:listing"),
+            HTTP_AUTHORIZATION="Basic " + credentials,
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+        self.assertFalse(caches["api"]._cache)
+
+    def test_private_page_session_is_not_cached(self):
+        session = self.client.session
+        session[PageViewRestriction.passed_view_restrictions_session_key] = [1]
+        session.save()
+
+        self.get_listing()
+
+        self.assertFalse(caches["api"]._cache)
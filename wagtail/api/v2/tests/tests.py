@@ -1,7 +1,12 @@
+from unittest import mock
+
 from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
 from django.utils.encoding import force_bytes
 
 from wagtail.core.models import Site
+from wagtail.tests.demosite.models import BlogEntryPage
+from wagtail.tests.urls import api_router
 
 from ..utils import (
     FieldsParameterParseError,
@@ -9,6 +14,7 @@ from ..utils import (
     parse_boolean,
     parse_fields_parameter,
 )
+from ..views import PagesAPIViewSet, freeze_fields_config, get_cached_serializer_class
 
 
 class DynamicBaseUrl:
@@ -399,3 +405,67 @@ class TestParseBoolean(TestCase):
             parse_boolean("2")
 
         self.assertEqual(str(e.exception), "expected 'true' or 'false', got '2'")
+
+
+class TestSerializerClassCache(TestCase):
+    fixtures = ["demosite.json"]
+
+    def setUp(self):
+        get_cached_serializer_class.cache_clear()
+
+    def get_serializer_class(self, fields_str, show_details=False):
+        return get_cached_serializer_class(
+            PagesAPIViewSet,
+            api_router,
+            BlogEntryPage,
+            freeze_fields_config(parse_fields_parameter(fields_str)),
+            show_details=show_details,
+        )
+
+    def test_freeze_fields_config(self):
+        self.assertEqual(
+            freeze_fields_config(
+                parse_fields_parameter("title,-body,feed_image(_,id)")
+            ),
+            (
+                ("title", False, None),
+                ("body", True, None),
+                ("feed_image", False, (("_", False, None), ("id", False, None))),
+            ),
+        )
+
+    def test_serializer_class_is_reused(self):
+        serializer_class = self.get_serializer_class("title,feed_image(title)")
+
+        self.assertIs(
+            self.get_serializer_class("title,feed_image(title)"), serializer_class
+        )
+        self.assertIn("title", serializer_class.Meta.fields)
+
+    def test_serializer_class_depends_on_arguments(self):
+        serializer_class = self.get_serializer_class("title")
+
+        self.assertIsNot(self.get_serializer_class("date"), serializer_class)
+        self.assertIsNot(
+            self.get_serializer_class("title", show_details=True), serializer_class
+        )
+
+    def test_serializer_class_is_not_rebuilt_per_request(self):
+        with mock.patch.object(
+            PagesAPIViewSet,
+            "_get_serializer_class",
+            wraps=PagesAPIViewSet._get_serializer_class,
+        ) as _get_serializer_class:
+            for i in range(3):
+                response = self.client.get(
+                    reverse("wagtailapi_v2:pages:listing"), {"fields": "title"}
+                )
+                self.assertEqual(response.status_code, 200)
+
+        _get_serializer_class.assert_called_once()
+
+    def test_cache_is_cleared_when_settings_change(self):
+        serializer_class = self.get_serializer_class("title")
+
+        with override_settings(WAGTAILAPI_LIMIT_MAX=5):
+            self.assertIsNot(self.get_serializer_class("title"), serializer_class)
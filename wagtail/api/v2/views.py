@@ -1,10 +1,14 @@
+import functools
 from collections import OrderedDict
 
 from django.conf import settings
 from django.core.exceptions import FieldDoesNotExist
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.http import Http404
 from django.shortcuts import redirect
 from django.urls import path, reverse
+from django.utils.cache import get_conditional_response
 from modelcluster.fields import ParentalKey
 from rest_framework import status
 from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
@@ -14,6 +18,7 @@ from rest_framework.viewsets import GenericViewSet
 from wagtail.api import APIField
 from wagtail.core.models import Page, PageViewRestriction, Site
 
+from .cache import get_api_response_cache, get_etag
 from .filters import (
     AncestorOfFilter,
     ChildOfFilter,
@@ -33,6 +38,45 @@ from .utils import (
     parse_fields_parameter,
 )
 
+# The maximum number of serializer classes kept by get_cached_serializer_class; there is
+# one for each combination of endpoint, model, view type and ?fields= parameter
+SERIALIZER_CLASS_CACHE_SIZE = 1000
+
+
+def freeze_fields_config(fields_config):
+    """
+    Convert a fields config (as returned by parse_fields_parameter) to nested tuples, so
+    that it can be used as a cache key
+    """
+    return tuple(
+        (
+            field_name,
+            negated,
+            freeze_fields_config(sub_fields) if sub_fields else sub_fields,
+        )
+        for field_name, negated, sub_fields in fields_config
+    )
+
+
+@functools.lru_cache(maxsize=SERIALIZER_CLASS_CACHE_SIZE)
+def get_cached_serializer_class(
+    viewset_class, router, model, fields_config, show_details=False
+):
+    """
+    Return the serializer class built by viewset_class._get_serializer_class for the given
+    arguments, reusing the class (and the serializer classes nested within it) from
+    previous requests with the same arguments. fields_config must be frozen with
+    freeze_fields_config.
+    """
+    return viewset_class._get_serializer_class(
+        router, model, fields_config, show_details=show_details
+    )
+
+
+@receiver(setting_changed)
+def reset_serializer_class_cache(**kwargs):
+    get_cached_serializer_class.cache_clear()
+
 
 class BaseAPIViewSet(GenericViewSet):
     renderer_classes = [JSONRenderer, BrowsableAPIRenderer]
@@ -46,6 +90,8 @@ class BaseAPIViewSet(GenericViewSet):
         [
             "limit",
             "offset",
+            "cursor",
+            "count",
             "fields",
             "order",
             "search",
@@ -75,18 +121,75 @@ class BaseAPIViewSet(GenericViewSet):
     def get_queryset(self):
         return self.model.objects.all().order_by("id")
 
-    def listing_view(self, request):
+    def can_cache_response(self, request):
+        """
+        Returns True if the response to this request can be stored in the API response
+        cache, i.e. it's the same for every request to the same URL
+        """
+        return request.method in ("GET", "HEAD") and not request.user.is_authenticated
+
+    def get_cached_response(self, request, get_data):
+        """
+        Returns a Response with the data returned by get_data, which is stored in the API
+        response cache (if WAGTAILAPI_CACHE_ENABLED is set) and reused for later requests
+        to the same URL until the content of the API changes.
+        """
+        response_cache = get_api_response_cache()
+        if response_cache is None or not self.can_cache_response(request):
+            return Response(get_data())
+
+        cached = response_cache.get(request)
+        if cached is None:
+            data = get_data()
+            etag = get_etag(data)
+            response_cache.set(request, data, etag)
+        else:
+            data, etag = cached
+
+        response = Response(data)
+        response["ETag"] = etag
+        return response
+
+    def get_listing_data(self):
         queryset = self.get_queryset()
         self.check_query_parameters(queryset)
         queryset = self.filter_queryset(queryset)
         queryset = self.paginate_queryset(queryset)
         serializer = self.get_serializer(queryset, many=True)
-        return self.get_paginated_response(serializer.data)
+        return self.get_paginated_response(serializer.data).data
+
+    def listing_view(self, request):
+        return self.get_cached_response(request, self.get_listing_data)
 
     def detail_view(self, request, pk):
         instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        return self.get_cached_response(
+            request, lambda: self.get_serializer(instance).data
+        )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+
+        # Answer conditional requests for JSON listing and detail responses with
+        # 304 Not Modified if the client's copy is still up to date
+        if (
+            request.method in ("GET", "HEAD")
+            and self.action in ("listing_view", "detail_view")
+            and isinstance(response, Response)
+            and response.status_code == 200
+            and getattr(request, "accepted_renderer", None) is not None
+            and request.accepted_renderer.format == "json"
+        ):
+            if not response.has_header("ETag"):
+                response["ETag"] = get_etag(response.data)
+
+            # There's no Last-Modified header, as a detail response includes related
+            # data (such as its parent and URL) that changes independently of the object
+            response = get_conditional_response(
+                request, etag=response["ETag"], response=response
+            )
+
+        return response
 
     def find_view(self, request):
         queryset = self.get_queryset()
@@ -360,10 +463,11 @@ class BaseAPIViewSet(GenericViewSet):
         else:
             show_details = True
 
-        return self._get_serializer_class(
+        return get_cached_serializer_class(
+            type(self),
             self.request.wagtailapi_router,
             model,
-            fields_config,
+            freeze_fields_config(fields_config),
             show_details=show_details,
         )
 
@@ -553,6 +657,14 @@ class PagesAPIViewSet(BaseAPIViewSet):
         base = super().get_object()
         return base.specific
 
+    def can_cache_response(self, request):
+        # Visitors who have entered the password of a private page can see it (and its
+        # descendants) in the API
+        session = getattr(request, "session", {})
+        return super().can_cache_response(request) and not session.get(
+            PageViewRestriction.passed_view_restrictions_session_key
+        )
+
     def find_object(self, queryset, request):
         site = Site.find_for_request(request)
         if "html_path" in request.GET and site is not None:
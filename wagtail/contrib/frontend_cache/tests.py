@@ -22,6 +22,7 @@ from wagtail.tests.testapp.models import EventIndex
 
 from .utils import (
     PurgeBatch,
+    batch_purges,
     purge_page_from_cache,
     purge_pages_from_cache,
     purge_url_from_cache,
@@ -466,6 +467,24 @@ class TestCachePurgingFunctions(TestCase):
             ],
         )
 
+    def test_batch_purges(self):
+        page = EventIndex.objects.get(url_path="/home/events/")
+
+        with batch_purges():
+            purge_page_from_cache(page)
+            purge_url_from_cache("http://localhost/foo")
+            purge_page_from_cache(page)
+            self.assertEqual(PURGED_URLS, [])
+
+        self.assertEqual(
+            PURGED_URLS,
+            [
+                "http://localhost/events/",
+                "http://localhost/events/past/",
+                "http://localhost/foo",
+            ],
+        )
+
 
 @override_settings(
     WAGTAILFRONTENDCACHE={
@@ -1,5 +1,7 @@
 import logging
 import re
+import threading
+from contextlib import contextmanager
 from urllib.parse import urlparse, urlunparse
 
 from django.conf import settings
@@ -10,6 +12,8 @@ from wagtail.core.utils import get_content_languages
 
 logger = logging.getLogger("wagtail.frontendcache")
 
+_purge_batch = threading.local()
+
 
 class InvalidFrontendCacheBackendError(ImproperlyConfigured):
     pass
@@ -62,7 +66,35 @@ def purge_url_from_cache(url, backend_settings=None, backends=None):
     purge_urls_from_cache([url], backend_settings=backend_settings, backends=backends)
 
 
+@contextmanager
+def batch_purges():
+    """
+    Collect the URLs purged with the default backends within the block, and purge them
+    in a single batch (with duplicates removed) when it exits
+    """
+    if getattr(_purge_batch, "urls", None) is not None:
+        yield
+        return
+
+    _purge_batch.urls = []
+    try:
+        yield
+    finally:
+        urls = list(dict.fromkeys(_purge_batch.urls))
+        _purge_batch.urls = None
+        if urls:
+            purge_urls_from_cache(urls)
+
+
 def purge_urls_from_cache(urls, backend_settings=None, backends=None):
+    if (
+        backend_settings is None
+        and backends is None
+        and getattr(_purge_batch, "urls", None) is not None
+    ):
+        _purge_batch.urls.extend(urls)
+        return
+
     # Convert each url to urls one for each managed language (WAGTAILFRONTENDCACHE_LANGUAGES setting).
     # The managed languages are common to all the defined backends.
     # This depends on settings.USE_I18N
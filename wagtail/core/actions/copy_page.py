@@ -1,16 +1,48 @@
 import logging
 import uuid
+from collections import defaultdict
 
 from django.core.exceptions import PermissionDenied
-from modelcluster.models import get_all_child_relations
+from django.db import connections, models, router, transaction
+from django.db.models.signals import post_save, pre_save
+from django.utils import timezone
+from modelcluster.fields import ParentalKey, ParentalManyToManyField
+from modelcluster.models import get_all_child_m2m_relations, get_all_child_relations
 
-from wagtail.core.log_actions import log
+from wagtail.core.log_actions import get_active_log_context, log
 from wagtail.core.models.copying import _copy, _copy_m2m_relations
 from wagtail.core.models.i18n import TranslatableMixin
 from wagtail.core.signals import page_published
+from wagtail.core.utils import batch_side_effects
 
 logger = logging.getLogger("wagtail.core")
 
+# The number of pages to copy at a time when copying a subtree in bulk
+BULK_COPY_BATCH_SIZE = 100
+
+# Page fields whose values on a copy must not be taken from the content of the
+# latest revision of the original page
+PRESERVED_REVISION_FIELDS = [
+    "pk",
+    "id",
+    "content_type",
+    "path",
+    "depth",
+    "numchild",
+    "draft_title",
+    "live",
+    "has_unpublished_changes",
+    "owner",
+    "locked",
+    "locked_by",
+    "locked_at",
+    "latest_revision_created_at",
+    "first_published_at",
+    "translation_key",
+    "locale",
+    "alias_of",
+]
+
 
 class CopyPageIntegrityError(RuntimeError):
     """
@@ -100,15 +132,7 @@ class CopyPageAction:
                         "You do not have permission to publish a page at the destination"
                     )
 
-    def _copy_page(
-        self, page, to=None, update_attrs=None, exclude_fields=None, _mpnode_attrs=None
-    ):
-        exclude_fields = (
-            page.default_exclude_fields_in_copy
-            + page.exclude_fields_in_copy
-            + (exclude_fields or [])
-        )
-        specific_page = page.specific
+    def _get_base_update_attrs(self, update_attrs=None):
         if self.keep_live:
             base_update_attrs = {
                 "alias_of": None,
@@ -133,11 +157,10 @@ class CopyPageAction:
         if update_attrs:
             base_update_attrs.update(update_attrs)
 
-        page_copy, child_object_map = _copy(
-            specific_page, exclude_fields=exclude_fields, update_attrs=base_update_attrs
-        )
+        return base_update_attrs
 
-        # Save copied child objects and run process_child_object on them if we need to
+    def _process_child_objects(self, specific_page, page_copy, child_object_map):
+        # Run process_child_object on copied child objects if we need to
         for (child_relation, old_pk), child_object in child_object_map.items():
             if self.process_child_object:
                 self.process_child_object(
@@ -150,6 +173,83 @@ class CopyPageAction:
             ):
                 child_object.translation_key = uuid.uuid4()
 
+    def _prepare_revision_copy(
+        self, revision, specific_page, page_copy, child_object_map
+    ):
+        revision.pk = None
+        revision.submitted_for_moderation = False
+        revision.approved_go_live_at = None
+        revision.page = page_copy
+
+        # Update ID fields in content
+        revision_content = revision.content
+        revision_content["pk"] = page_copy.pk
+
+        for child_relation in get_all_child_relations(specific_page):
+            accessor_name = child_relation.get_accessor_name()
+            try:
+                child_objects = revision_content[accessor_name]
+            except KeyError:
+                # KeyErrors are possible if the revision was created
+                # before this child relation was added to the database
+                continue
+
+            for child_object in child_objects:
+                child_object[child_relation.field.name] = page_copy.pk
+
+                # Remap primary key to copied versions
+                # If the primary key is not recognised (eg, the child object has been deleted from the database)
+                # set the primary key to None
+                copied_child_object = child_object_map.get(
+                    (child_relation, child_object["pk"])
+                )
+                child_object["pk"] = (
+                    copied_child_object.pk if copied_child_object else None
+                )
+
+        revision.content = revision_content
+        return revision
+
+    def _get_log_data(self, page, page_copy, source, destination, locales=None):
+        def get_locale(obj):
+            if locales is not None:
+                return locales[obj.locale_id]
+            return obj.locale
+
+        return {
+            "page": {
+                "id": page_copy.id,
+                "title": page_copy.get_admin_display_title(),
+                "locale": {
+                    "id": page_copy.locale_id,
+                    "language_code": get_locale(page_copy).language_code,
+                },
+            },
+            "source": source,
+            "destination": destination,
+            "keep_live": page_copy.live and self.keep_live,
+            "source_locale": {
+                "id": page.locale_id,
+                "language_code": get_locale(page).language_code,
+            },
+        }
+
+    def _copy_page(
+        self, page, to=None, update_attrs=None, exclude_fields=None, _mpnode_attrs=None
+    ):
+        exclude_fields = (
+            page.default_exclude_fields_in_copy
+            + page.exclude_fields_in_copy
+            + (exclude_fields or [])
+        )
+        specific_page = page.specific
+        base_update_attrs = self._get_base_update_attrs(update_attrs)
+
+        page_copy, child_object_map = _copy(
+            specific_page, exclude_fields=exclude_fields, update_attrs=base_update_attrs
+        )
+        self._process_child_objects(specific_page, page_copy, child_object_map)
+
         # Save the new page
         if _mpnode_attrs:
             # We've got a tree position already reserved. Perform a quick save
@@ -175,40 +275,9 @@ class CopyPageAction:
         # Copy revisions
         if self.copy_revisions:
             for revision in page.revisions.all():
-                revision.pk = None
-                revision.submitted_for_moderation = False
-                revision.approved_go_live_at = None
-                revision.page = page_copy
-
-                # Update ID fields in content
-                revision_content = revision.content
-                revision_content["pk"] = page_copy.pk
-
-                for child_relation in get_all_child_relations(specific_page):
-                    accessor_name = child_relation.get_accessor_name()
-                    try:
-                        child_objects = revision_content[accessor_name]
-                    except KeyError:
-                        # KeyErrors are possible if the revision was created
-                        # before this child relation was added to the database
-                        continue
-
-                    for child_object in child_objects:
-                        child_object[child_relation.field.name] = page_copy.pk
-
-                        # Remap primary key to copied versions
-                        # If the primary key is not recognised (eg, the child object has been deleted from the database)
-                        # set the primary key to None
-                        copied_child_object = child_object_map.get(
-                            (child_relation, child_object["pk"])
-                        )
-                        child_object["pk"] = (
-                            copied_child_object.pk if copied_child_object else None
-                        )
-
-                revision.content = revision_content
-
-                # Save
+                self._prepare_revision_copy(
+                    revision, specific_page, page_copy, child_object_map
+                )
                 revision.save()
 
         # Create a new revision
@@ -225,6 +294,10 @@ class CopyPageAction:
         latest_revision_as_page_revision = latest_revision.save_revision(
             user=self.user, changed=False, clean=False
         )
+        page_copy.draft_title = latest_revision.draft_title
+        page_copy.latest_revision_created_at = (
+            latest_revision.latest_revision_created_at
+        )
         if self.keep_live:
             page_copy.live_revision = latest_revision_as_page_revision
             page_copy.last_published_at = latest_revision_as_page_revision.created_at
@@ -245,33 +318,22 @@ class CopyPageAction:
                 instance=page_copy,
                 action=self.log_action,
                 user=self.user,
-                data={
-                    "page": {
-                        "id": page_copy.id,
-                        "title": page_copy.get_admin_display_title(),
-                        "locale": {
-                            "id": page_copy.locale_id,
-                            "language_code": page_copy.locale.language_code,
-                        },
-                    },
-                    "source": {
+                data=self._get_log_data(
+                    page,
+                    page_copy,
+                    source={
                         "id": parent.id,
                         "title": parent.specific_deferred.get_admin_display_title(),
                     }
                     if parent
                     else None,
-                    "destination": {
+                    destination={
                         "id": to.id,
                         "title": to.specific_deferred.get_admin_display_title(),
                     }
                     if to
                     else None,
-                    "keep_live": page_copy.live and self.keep_live,
-                    "source_locale": {
-                        "id": page.locale_id,
-                        "language_code": page.locale.language_code,
-                    },
-                },
+                ),
             )
             if page_copy.live and self.keep_live:
                 # Log the publish if the use chose to keep the copied page live
@@ -289,18 +351,21 @@ class CopyPageAction:
         from wagtail.core.models import Page
 
         if self.recursive:
-            numchild = 0
+            if self._can_copy_descendants_in_bulk(page):
+                numchild = self._copy_descendants_in_bulk(page, page_copy)
+            else:
+                numchild = 0
 
-            for child_page in page.get_children().specific():
-                newdepth = _mpnode_attrs[1] + 1
-                child_mpnode_attrs = (
-                    Page._get_path(_mpnode_attrs[0], newdepth, numchild),
-                    newdepth,
-                )
-                numchild += 1
-                self._copy_page(
-                    child_page, to=page_copy, _mpnode_attrs=child_mpnode_attrs
-                )
+                for child_page in page.get_children().specific():
+                    newdepth = _mpnode_attrs[1] + 1
+                    child_mpnode_attrs = (
+                        Page._get_path(_mpnode_attrs[0], newdepth, numchild),
+                        newdepth,
+                    )
+                    numchild += 1
+                    self._copy_page(
+                        child_page, to=page_copy, _mpnode_attrs=child_mpnode_attrs
+                    )
 
             if numchild > 0:
                 page_copy.numchild = numchild
@@ -308,12 +373,568 @@ class CopyPageAction:
 
         return page_copy
 
+    def _can_copy_descendants_in_bulk(self, page):
+        """
+        Returns True if the descendants of ``page`` can be copied by
+        ``_copy_descendants_in_bulk``. This requires a database that returns primary
+        keys from bulk inserts, and page models that don't customise saving or
+        restoring revisions and only have simple many-to-many relations, as those
+        methods are bypassed when copying in bulk.
+        """
+        from wagtail.core.models import Page
+
+        connection = connections[router.db_for_write(Page)]
+        if not connection.features.can_return_rows_from_bulk_insert:
+            return False
+
+        for model in self._get_descendant_models(page):
+            if model is None:
+                return False
+
+            if (
+                model.save is not Page.save
+                or model.with_content_json is not Page.with_content_json
+            ):
+                return False
+
+            for field in model._meta.get_fields():
+                if field.many_to_many and not field.auto_created:
+                    through = field.remote_field.through
+                    if not (
+                        through._meta.auto_created
+                        or self._is_child_object_through_model(model, through)
+                    ):
+                        return False
+
+        return True
+
+    def _get_descendant_models(self, page):
+        from django.contrib.contenttypes.models import ContentType
+
+        content_type_ids = (
+            page.get_descendants()
+            .order_by()
+            .values_list("content_type_id", flat=True)
+            .distinct()
+        )
+        return [
+            ContentType.objects.get_for_id(content_type_id).model_class()
+            for content_type_id in content_type_ids
+        ]
+
+    def _is_child_object_through_model(self, model, through):
+        # m2m links with a through model that has a ParentalKey to the model being
+        # copied are copied as child objects
+        return any(
+            isinstance(field, ParentalKey) and issubclass(model, field.related_model)
+            for field in through._meta.get_fields()
+        )
+
+    def _copy_descendants_in_bulk(self, page, page_copy):
+        """
+        Copies all descendants of ``page`` underneath ``page_copy`` (which must
+        already be saved) and returns the number of children of ``page_copy``.
+
+        Rather than copying one page at a time, the tree positions of the whole
+        subtree are reserved up front and pages are then copied in batches of
+        ``BULK_COPY_BATCH_SIZE``, inserting pages, child objects, revisions and log
+        entries with a few queries per batch.
+        """
+        from wagtail.core.models import Locale, Page
+
+        steplen = Page.steplen
+
+        # Reserve a path for every page in the subtree. Paths are numbered in the same
+        # way as copying one level at a time would, and descendants of pages that are
+        # missing from the tree are skipped, as they would not be reached that way.
+        new_paths = {page.path: page_copy.path}
+        numchild = defaultdict(int)
+        source_ids = []
+        for source_id, path in (
+            page.get_descendants().order_by("path").values_list("pk", "path")
+        ):
+            parent_path = new_paths.get(path[:-steplen])
+            if parent_path is None:
+                continue
+
+            new_paths[path] = Page._get_path(
+                parent_path, len(parent_path) // steplen + 1, numchild[parent_path]
+            )
+            numchild[parent_path] += 1
+            source_ids.append(source_id)
+
+        # The details of each copied page that its children need, keyed by the path
+        # of the original page
+        parents = {
+            page.path: {
+                "source_id": page.id,
+                "source_title": page.specific_deferred.get_admin_display_title(),
+                "copy_id": page_copy.id,
+                "copy_title": page_copy.get_admin_display_title(),
+                "url_path": page_copy.url_path,
+            }
+        }
+        locales = Locale.objects.in_bulk()
+
+        with transaction.atomic():
+            for start in range(0, len(source_ids), BULK_COPY_BATCH_SIZE):
+                batch_ids = source_ids[start : start + BULK_COPY_BATCH_SIZE]
+                pages = Page.objects.filter(pk__in=batch_ids).order_by("path")
+                self._copy_batch(
+                    list(pages.specific()), new_paths, numchild, parents, locales
+                )
+
+        return numchild[page_copy.path]
+
+    def _copy_batch(self, pages, new_paths, numchild, parents, locales):
+        from wagtail.core.models import (
+            COMMENTS_RELATION_NAME,
+            Page,
+            PageLogEntry,
+            PageRevision,
+        )
+
+        db = router.db_for_write(Page)
+        now = timezone.now()
+        steplen = Page.steplen
+
+        exclude_fields = {
+            model: model.default_exclude_fields_in_copy + model.exclude_fields_in_copy
+            for model in {type(page) for page in pages}
+        }
+        child_objects = self._get_child_objects(pages, exclude_fields)
+        m2m_values = self._get_m2m_values(pages, exclude_fields)
+
+        revisions = defaultdict(list)
+        if self.copy_revisions:
+            for revision in PageRevision.objects.filter(
+                page_id__in=[page.pk for page in pages]
+            ).order_by("pk"):
+                revisions[revision.page_id].append(revision)
+
+        copies = []
+        for page in pages:
+            base_update_attrs = self._get_base_update_attrs()
+
+            # Child relations and ParentalManyToManyFields were loaded above for
+            # the whole batch, so leave them out of _copy and set them on the copy
+            # here. Relations that aren't copied are set to empty lists so that
+            # serializable_data() doesn't look them up.
+            child_relation_names = [
+                child_relation.get_accessor_name()
+                for child_relation in get_all_child_relations(page)
+            ]
+            parental_m2m_names = [
+                field.name for field in get_all_child_m2m_relations(page)
+            ]
+            page_copy, _ = _copy(
+                page,
+                exclude_fields=exclude_fields[type(page)]
+                + child_relation_names
+                + parental_m2m_names,
+                update_attrs=base_update_attrs,
+            )
+            for name in child_relation_names + parental_m2m_names:
+                setattr(page_copy, name, [])
+
+            child_object_map = {}
+            for child_relation, objects in child_objects[page.pk]:
+                for child_object in objects:
+                    child_object_map[(child_relation, child_object.pk)] = child_object
+                    child_object.pk = None
+                    setattr(child_object, child_relation.field.attname, None)
+
+                setattr(page_copy, child_relation.get_accessor_name(), objects)
+
+            for field, values in m2m_values[page.pk]:
+                if isinstance(field, ParentalManyToManyField):
+                    setattr(page_copy, field.name, values)
+
+            self._process_child_objects(page, page_copy, child_object_map)
+
+            parent = parents[page.path[:-steplen]]
+            page_copy.path = new_paths[page.path]
+            page_copy.depth = len(page_copy.path) // steplen
+            page_copy.numchild = numchild[page_copy.path]
+            page_copy.url_path = parent["url_path"] + page_copy.slug + "/"
+
+            # Copy the pages and revisions into the same state that copying them
+            # with save() and save_revision() would leave them in
+            page_revisions = revisions[page.pk]
+            latest_revision = (
+                max(
+                    page_revisions,
+                    key=lambda revision: (revision.created_at, revision.pk),
+                )
+                if page_revisions
+                else None
+            )
+            if page_copy.has_unpublished_changes and latest_revision:
+                page_copy.draft_title = latest_revision.content.get(
+                    "title", page_copy.title
+                )
+            else:
+                page_copy.draft_title = page_copy.title
+            page_copy.latest_revision_created_at = now
+            if self.keep_live:
+                page_copy.first_published_at = now
+                page_copy.last_published_at = now
+
+            copies.append((page, page_copy, child_object_map, latest_revision, parent))
+            parents[page.path] = {
+                "source_id": page.id,
+                "source_title": page.get_admin_display_title(),
+                "copy_id": None,
+                "copy_title": page_copy.get_admin_display_title(),
+                "url_path": page_copy.url_path,
+            }
+
+        page_copies = [page_copy for _, page_copy, _, _, _ in copies]
+
+        for page_copy in page_copies:
+            pre_save.send(
+                sender=type(page_copy),
+                instance=page_copy,
+                raw=False,
+                using=db,
+                update_fields=None,
+            )
+        self._insert_pages(page_copies, db)
+        for page, page_copy, _, _, _ in copies:
+            parents[page.path]["copy_id"] = page_copy.id
+
+        # Save copied child objects and many-to-many relations
+        children = []
+        through_objects = defaultdict(list)
+        for page, page_copy, child_object_map, _, _ in copies:
+            for (child_relation, _), child_object in child_object_map.items():
+                setattr(child_object, child_relation.field.name, page_copy)
+                children.append(child_object)
+
+            for field, values in m2m_values[page.pk]:
+                through = field.remote_field.through
+                source_field = through._meta.get_field(field.m2m_field_name())
+                target_field = through._meta.get_field(field.m2m_reverse_field_name())
+                through_objects[through].extend(
+                    through(
+                        **{
+                            source_field.attname: page_copy.pk,
+                            target_field.attname: value.pk,
+                        }
+                    )
+                    for value in values
+                )
+
+        created_children = self._insert_child_objects(children, db)
+        for through, objects in through_objects.items():
+            through._default_manager.using(db).bulk_create(objects)
+
+        # Copy revisions, and create a new revision for each copy
+        copied_revisions = []
+        new_revisions = []
+        for page, page_copy, child_object_map, latest_revision, parent in copies:
+            for revision in revisions[page.pk]:
+                copied_revisions.append(
+                    self._prepare_revision_copy(
+                        revision, page, page_copy, child_object_map
+                    )
+                )
+
+            content = page_copy.serializable_data()
+            if page_copy.has_unpublished_changes and latest_revision:
+                latest_content = latest_revision.content
+                content = dict(
+                    latest_content,
+                    **{
+                        field: content[field]
+                        for field in PRESERVED_REVISION_FIELDS
+                        if field in content
+                    },
+                )
+                content["url_path"] = (
+                    parent["url_path"]
+                    + latest_content.get("slug", page_copy.slug)
+                    + "/"
+                )
+                # Comments are not copied
+                content[COMMENTS_RELATION_NAME] = []
+
+            revision = PageRevision(
+                page=page_copy, content=content, user=self.user, created_at=now
+            )
+            revision.expire_at = revision.get_content_expire_at()
+            new_revisions.append(revision)
+
+        PageRevision.objects.using(db).bulk_create(copied_revisions)
+        PageRevision.objects.using(db).bulk_create(new_revisions)
+
+        if self.keep_live:
+            for page_copy, revision in zip(page_copies, new_revisions):
+                page_copy.live_revision = revision
+            Page.objects.using(db).bulk_update(page_copies, ["live_revision"])
+
+        for page_copy in page_copies:
+            post_save.send(
+                sender=type(page_copy),
+                instance=page_copy,
+                created=True,
+                update_fields=None,
+                raw=False,
+                using=db,
+            )
+        for child_object in created_children:
+            post_save.send(
+                sender=type(child_object),
+                instance=child_object,
+                created=True,
+                update_fields=None,
+                raw=False,
+                using=db,
+            )
+        for page_copy, revision in zip(page_copies, new_revisions):
+            if page_copy.live:
+                page_published.send(
+                    sender=page_copy.specific_class,
+                    instance=page_copy,
+                    revision=revision,
+                )
+
+        # Log
+        log_context = get_active_log_context()
+        log_entries = []
+        for (page, page_copy, _, _, parent), revision in zip(copies, new_revisions):
+            cls = type(page_copy)
+            logger.info(
+                'Page created: "%s" id=%d content_type=%s.%s path=%s',
+                page_copy.title,
+                page_copy.id,
+                cls._meta.app_label,
+                cls.__name__,
+                page_copy.url_path,
+            )
+            logger.info(
+                'Page copied: "%s" id=%d from=%d',
+                page_copy.title,
+                page_copy.id,
+                page.id,
+            )
+
+            log_entry_kwargs = {
+                "page": page_copy,
+                "content_type_id": page_copy.content_type_id,
+                "label": page_copy.get_admin_display_title(),
+                "timestamp": now,
+                "uuid": log_context.uuid,
+            }
+            log_entries.append(
+                PageLogEntry(
+                    action="wagtail.create",
+                    user_id=page_copy.owner_id or getattr(log_context.user, "pk", None),
+                    content_changed=True,
+                    **log_entry_kwargs,
+                )
+            )
+            if self.log_action:
+                log_entries.append(
+                    PageLogEntry(
+                        action=self.log_action,
+                        user=self.user or log_context.user,
+                        data=self._get_log_data(
+                            page,
+                            page_copy,
+                            source={
+                                "id": parent["source_id"],
+                                "title": parent["source_title"],
+                            },
+                            destination={
+                                "id": parent["copy_id"],
+                                "title": parent["copy_title"],
+                            },
+                            locales=locales,
+                        ),
+                        **log_entry_kwargs,
+                    )
+                )
+                if page_copy.live and self.keep_live:
+                    log_entries.append(
+                        PageLogEntry(
+                            action="wagtail.publish",
+                            user=self.user or log_context.user,
+                            revision=revision,
+                            **log_entry_kwargs,
+                        )
+                    )
+
+        PageLogEntry.objects.using(db).bulk_create(log_entries)
+
+    def _get_child_objects(self, pages, exclude_fields):
+        """
+        Returns a dict mapping the ID of each page to a list of
+        ``(child_relation, child_objects)`` tuples for the child relations to copy,
+        loading each child relation once for all the pages of a model.
+        """
+        child_objects = defaultdict(list)
+        pages_by_model = defaultdict(list)
+        for page in pages:
+            pages_by_model[type(page)].append(page)
+
+        for model, model_pages in pages_by_model.items():
+            for child_relation in get_all_child_relations(model):
+                if child_relation.get_accessor_name() in exclude_fields[model]:
+                    continue
+
+                parental_key = child_relation.field.attname
+                objects = defaultdict(list)
+                for (
+                    child_object
+                ) in child_relation.related_model._default_manager.filter(
+                    **{parental_key + "__in": [page.pk for page in model_pages]}
+                ).order_by(
+                    "pk"
+                ):
+                    objects[getattr(child_object, parental_key)].append(child_object)
+
+                for page in model_pages:
+                    child_objects[page.pk].append((child_relation, objects[page.pk]))
+
+        return child_objects
+
+    def _get_m2m_values(self, pages, exclude_fields):
+        """
+        Returns a dict mapping the ID of each page to a list of ``(field, values)``
+        tuples for the many-to-many relations to copy, loading each relation once
+        for all the pages of a model.
+        """
+        m2m_values = defaultdict(list)
+        pages_by_model = defaultdict(list)
+        for page in pages:
+            pages_by_model[type(page)].append(page)
+
+        for model, model_pages in pages_by_model.items():
+            for field in model._meta.get_fields():
+                if (
+                    not field.many_to_many
+                    or field.auto_created
+                    or field.name in exclude_fields[model]
+                ):
+                    continue
+
+                through = field.remote_field.through
+                if self._is_child_object_through_model(model, through):
+                    continue
+
+                source_field = through._meta.get_field(field.m2m_field_name())
+                target_field = through._meta.get_field(field.m2m_reverse_field_name())
+                values = defaultdict(list)
+                for link in (
+                    through._default_manager.filter(
+                        **{
+                            source_field.attname
+                            + "__in": [page.pk for page in model_pages]
+                        }
+                    )
+                    .select_related(target_field.name)
+                    .order_by("pk")
+                ):
+                    values[getattr(link, source_field.attname)].append(
+                        getattr(link, target_field.name)
+                    )
+
+                for page in model_pages:
+                    if values[page.pk]:
+                        m2m_values[page.pk].append((field, values[page.pk]))
+
+        return m2m_values
+
+    def _insert_pages(self, page_copies, db):
+        """
+        Inserts the given (specific) pages into the database, one table at a time.
+        """
+        from wagtail.core.models import Page
+
+        # bulk_create() doesn't support multi-table inheritance, so create the
+        # wagtailcore_page rows first to get their IDs
+        base_pages = Page.objects.using(db).bulk_create(
+            [
+                Page(
+                    **{
+                        field.attname: getattr(page_copy, field.attname)
+                        for field in Page._meta.concrete_fields
+                    }
+                )
+                for page_copy in page_copies
+            ]
+        )
+
+        # Then insert the rows of each subclass table. Model._save_table() uses
+        # _insert() to do the same for a single object.
+        pages_by_model = defaultdict(list)
+        for page_copy, base_page in zip(page_copies, base_pages):
+            page_copy.id = base_page.id
+            for model in [type(page_copy)] + type(page_copy)._meta.get_parent_list():
+                if model is not Page and not model._meta.proxy:
+                    for field in model._meta.local_concrete_fields:
+                        if field.remote_field and field.remote_field.parent_link:
+                            setattr(page_copy, field.attname, base_page.id)
+                    pages_by_model[model].append(page_copy)
+
+            page_copy._state.adding = False
+            page_copy._state.db = db
+
+        connection = connections[db]
+        for model, objs in pages_by_model.items():
+            fields = model._meta.local_concrete_fields
+            batch_size = connection.ops.bulk_batch_size(fields, objs) or len(objs)
+            for start in range(0, len(objs), batch_size):
+                model._base_manager._insert(
+                    objs[start : start + batch_size], fields=fields, using=db
+                )
+
+    def _insert_child_objects(self, children, db):
+        """
+        Saves the given child objects, using bulk_create() for those that don't
+        customise saving. Returns the objects that were created in bulk, which
+        haven't had any signals sent yet.
+        """
+        children_by_model = defaultdict(list)
+        for child_object in children:
+            model = type(child_object)
+            if model.save is models.Model.save and not model._meta.parents:
+                children_by_model[model].append(child_object)
+            else:
+                child_object.save()
+
+        created = []
+        for model, objs in children_by_model.items():
+            for child_object in objs:
+                pre_save.send(
+                    sender=model,
+                    instance=child_object,
+                    raw=False,
+                    using=db,
+                    update_fields=None,
+                )
+            created.extend(model._default_manager.using(db).bulk_create(objs))
+
+        return created
+
     def execute(self, skip_permission_checks=False):
         self.check(skip_permission_checks=skip_permission_checks)
 
-        return self._copy_page(
-            self.page,
-            to=self.to,
-            update_attrs=self.update_attrs,
-            exclude_fields=self.exclude_fields,
-        )
+        if not self.recursive:
+            return self._copy_page(
+                self.page,
+                to=self.to,
+                update_attrs=self.update_attrs,
+                exclude_fields=self.exclude_fields,
+            )
+
+        # Apply search index updates and frontend cache purges for the whole subtree
+        # once it has been copied
+        with batch_side_effects():
+            return self._copy_page(
+                self.page,
+                to=self.to,
+                update_attrs=self.update_attrs,
+                exclude_fields=self.exclude_fields,
+            )
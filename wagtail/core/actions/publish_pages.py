@@ -0,0 +1,200 @@
+import logging
+
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from wagtail.core.actions.publish_page_revision import (
+    PublishPagePermissionError,
+    PublishPageRevisionAction,
+)
+from wagtail.core.log_actions import get_active_log_context
+from wagtail.core.signals import page_published
+from wagtail.core.utils import batch_side_effects
+
+logger = logging.getLogger("wagtail.core")
+
+# The number of pages to publish at a time
+BATCH_SIZE = 100
+
+
+class PublishPagesAction:
+    """
+    Publish the latest revisions of several pages, such as those selected for a bulk
+    publish in the admin. Pages without any revisions are skipped.
+
+    Pages are published in batches, loading their latest revisions, clearing the
+    moderation and scheduling state of their revisions and writing log entries with a
+    few queries for each batch. Pages that are scheduled to go live in the future, or
+    that have aliases, comments or a workflow in progress, are published one at a time
+    with ``PublishPageRevisionAction``. Search index updates and frontend cache purges
+    are made once all the pages have been published.
+
+    :param pages: the pages to publish
+    :param user: the publishing user
+    :param log_action: flag for logging the action. Pass False to skip logging.
+    """
+
+    def __init__(self, pages, user=None, log_action=True):
+        self.pages = pages
+        self.user = user
+        self.log_action = log_action
+
+    def check(self, skip_permission_checks=False):
+        from wagtail.core.models import UserPagePermissionsProxy
+
+        if self.user and not skip_permission_checks:
+            user_perms = UserPagePermissionsProxy(self.user)
+            for page in self.pages:
+                if not user_perms.for_page(page).can_publish():
+                    raise PublishPagePermissionError(
+                        "You do not have permission to publish this page"
+                    )
+
+    def _get_latest_revisions(self, page_ids):
+        from wagtail.core.models import Page, PageRevision
+
+        latest_revision_ids = dict(
+            Page.objects.filter(pk__in=page_ids)
+            .annotate(
+                latest_revision_id=Subquery(
+                    PageRevision.objects.filter(page=OuterRef("pk"))
+                    .order_by("-created_at", "-id")
+                    .values("pk")[:1]
+                )
+            )
+            .values_list("pk", "latest_revision_id")
+        )
+        revisions = PageRevision.objects.in_bulk(
+            [
+                revision_id
+                for revision_id in latest_revision_ids.values()
+                if revision_id is not None
+            ]
+        )
+        return {
+            page_id: revisions[revision_id]
+            for page_id, revision_id in latest_revision_ids.items()
+            if revision_id is not None
+        }
+
+    def _get_pages_to_publish_individually(self, page_ids):
+        """
+        Return the IDs of pages that need more than saving their new content and live
+        state to be published
+        """
+        from wagtail.core.models import Comment, Page, WorkflowState
+
+        return (
+            set(
+                Page.objects.filter(alias_of_id__in=page_ids).values_list(
+                    "alias_of_id", flat=True
+                )
+            )
+            | set(
+                Comment.objects.filter(page_id__in=page_ids).values_list(
+                    "page_id", flat=True
+                )
+            )
+            | set(
+                WorkflowState.objects.active()
+                .filter(page_id__in=page_ids)
+                .values_list("page_id", flat=True)
+            )
+        )
+
+    def _publish_batch(self, page_ids):
+        from wagtail.core.models import Page, PageLogEntry, PageRevision
+
+        revisions = self._get_latest_revisions(page_ids)
+        publish_individually = self._get_pages_to_publish_individually(page_ids)
+        now = timezone.now()
+
+        published = []
+        for live_page in Page.objects.filter(pk__in=revisions).specific():
+            revision = revisions[live_page.pk]
+            # Avoid fetching the page again when restoring the revision
+            revision.page = live_page
+            page = revision.as_page_object()
+
+            if (
+                live_page.pk in publish_individually
+                or page.go_live_at
+                and page.go_live_at > now
+            ):
+                PublishPageRevisionAction(
+                    revision, user=self.user, log_action=self.log_action
+                ).execute(skip_permission_checks=True)
+                continue
+
+            page.live = True
+            # The revision being published is the latest one
+            page.has_unpublished_changes = False
+            page.expired = False
+            page.last_published_at = now
+            page.live_revision = revision
+            if page.first_published_at is None:
+                page.first_published_at = now
+            page.save()
+
+            revision.submitted_for_moderation = False
+            revision.approved_go_live_at = None
+            published.append((live_page.title, page, revision))
+
+        if not published:
+            return
+
+        PageRevision.objects.filter(
+            page_id__in=[page.pk for _, page, _ in published]
+        ).update(approved_go_live_at=None, submitted_for_moderation=False)
+
+        log_context = get_active_log_context()
+        log_entries = []
+        for old_title, page, revision in published:
+            page_published.send(
+                sender=page.specific_class, instance=page, revision=revision
+            )
+
+            if self.log_action:
+                log_entry_kwargs = {
+                    "page": page,
+                    "content_type_id": page.content_type_id,
+                    "label": page.get_admin_display_title(),
+                    "timestamp": now,
+                    "user": self.user or log_context.user,
+                    "uuid": log_context.uuid,
+                    "revision": revision,
+                    "data": {},
+                }
+                if page.title != old_title:
+                    log_entry_kwargs["data"] = {
+                        "title": {"old": old_title, "new": page.title}
+                    }
+                    log_entries.append(
+                        PageLogEntry(action="wagtail.rename", **log_entry_kwargs)
+                    )
+
+                log_entries.append(
+                    PageLogEntry(
+                        action="wagtail.publish",
+                        content_changed=True,
+                        **log_entry_kwargs,
+                    )
+                )
+
+            logger.info(
+                'Page published: "%s" id=%d revision_id=%d',
+                page.title,
+                page.id,
+                revision.id,
+            )
+
+        PageLogEntry.objects.bulk_create(log_entries)
+
+    def execute(self, skip_permission_checks=False):
+        self.check(skip_permission_checks=skip_permission_checks)
+
+        page_ids = [page.pk for page in self.pages]
+        with transaction.atomic(), batch_side_effects():
+            for start in range(0, len(page_ids), BATCH_SIZE):
+                self._publish_batch(page_ids[start : start + BATCH_SIZE])
@@ -0,0 +1,159 @@
+import logging
+
+from django.db import router, transaction
+from django.db.models.signals import post_save, pre_save
+from django.utils import timezone
+
+from wagtail.core.actions.unpublish_page import (
+    UnpublishPageAction,
+    UnpublishPagePermissionError,
+)
+from wagtail.core.log_actions import get_active_log_context
+from wagtail.core.signals import page_unpublished
+from wagtail.core.utils import batch_side_effects
+
+logger = logging.getLogger("wagtail.core")
+
+# The number of pages to unpublish at a time
+BATCH_SIZE = 100
+
+
+class UnpublishPagesAction:
+    """
+    Unpublish several pages, such as those selected for a bulk unpublish in the admin,
+    along with any aliases of them. Pages that aren't live are skipped.
+
+    Pages are unpublished in batches, updating their live state, clearing the
+    scheduled publishing of their revisions and writing log entries with a few
+    queries for each batch. Pages whose model overrides ``save()``, and site root
+    pages, are unpublished one at a time with ``UnpublishPageAction``. Search index
+    updates and frontend cache purges are made once all the pages have been
+    unpublished.
+
+    :param pages: the pages to unpublish
+    :param user: the user unpublishing the pages
+    :param log_action: flag for logging the action. Pass False to skip logging.
+    """
+
+    def __init__(self, pages, user=None, log_action=True):
+        self.pages = pages
+        self.user = user
+        self.log_action = log_action
+
+    def check(self, skip_permission_checks=False):
+        from wagtail.core.models import UserPagePermissionsProxy
+
+        if self.user and not skip_permission_checks:
+            user_perms = UserPagePermissionsProxy(self.user)
+            for page in self.pages:
+                if not user_perms.for_page(page).can_unpublish():
+                    raise UnpublishPagePermissionError(
+                        "You do not have permission to unpublish this page"
+                    )
+
+    def _unpublish_batch(self, page_ids, user):
+        """
+        Unpublish the given pages, and return the IDs of any live aliases of the
+        pages that were unpublished here
+        """
+        from wagtail.core.models import Page, PageLogEntry, PageRevision, Site
+
+        db = router.db_for_write(Page)
+        site_root_ids = set(
+            Site.objects.filter(root_page_id__in=page_ids).values_list(
+                "root_page_id", flat=True
+            )
+        )
+
+        pages = []
+        for page in Page.objects.filter(pk__in=page_ids).live().specific():
+            if type(page).save is not Page.save or page.pk in site_root_ids:
+                UnpublishPageAction(
+                    page, user=user, log_action=self.log_action
+                ).execute(skip_permission_checks=True)
+                continue
+
+            page.live = False
+            page.has_unpublished_changes = True
+            page.live_revision = None
+            pages.append(page)
+
+        if not pages:
+            return []
+
+        for page in pages:
+            pre_save.send(
+                sender=type(page),
+                instance=page,
+                raw=False,
+                using=db,
+                update_fields=None,
+            )
+        unpublished_ids = [page.pk for page in pages]
+        Page.objects.filter(pk__in=unpublished_ids).update(
+            live=False, has_unpublished_changes=True, live_revision=None
+        )
+        PageRevision.objects.filter(page_id__in=unpublished_ids).update(
+            approved_go_live_at=None
+        )
+
+        now = timezone.now()
+        log_context = get_active_log_context()
+        log_entries = []
+        for page in pages:
+            post_save.send(
+                sender=type(page),
+                instance=page,
+                created=False,
+                update_fields=None,
+                raw=False,
+                using=db,
+            )
+            page_unpublished.send(sender=page.specific_class, instance=page)
+
+            if self.log_action:
+                log_entries.append(
+                    PageLogEntry(
+                        page=page,
+                        content_type_id=page.content_type_id,
+                        label=page.get_admin_display_title(),
+                        action="wagtail.unpublish",
+                        timestamp=now,
+                        user=user or log_context.user,
+                        uuid=log_context.uuid,
+                    )
+                )
+
+            logger.info('Page unpublished: "%s" id=%d', page.title, page.id)
+
+        PageLogEntry.objects.bulk_create(log_entries)
+
+        return list(
+            Page.objects.filter(alias_of_id__in=unpublished_ids, live=True).values_list(
+                "pk", flat=True
+            )
+        )
+
+    def execute(self, skip_permission_checks=False):
+        self.check(skip_permission_checks=skip_permission_checks)
+
+        page_ids = [page.pk for page in self.pages]
+        seen_ids = set(page_ids)
+        user = self.user
+        with transaction.atomic(), batch_side_effects():
+            while page_ids:
+                alias_ids = []
+                for start in range(0, len(page_ids), BATCH_SIZE):
+                    alias_ids.extend(
+                        self._unpublish_batch(
+                            page_ids[start : start + BATCH_SIZE], user
+                        )
+                    )
+
+                # Then unpublish the aliases of these pages, as unpublishing each page
+                # individually would
+                page_ids = [
+                    alias_id for alias_id in alias_ids if alias_id not in seen_ids
+                ]
+                seen_ids.update(page_ids)
+                user = None
@@ -59,6 +59,11 @@ class Block(metaclass=BaseBlock):
         icon = "placeholder"
         classname = None
         group = ""
+        # If true, the rendered HTML of this block is cached when it's rendered as an item
+        # of a StreamField; cache_vary_on lists the template context variables (which may
+        # be dotted paths, such as "request.site.pk") that the rendering depends on
+        cache = False
+        cache_vary_on = ()
 
     # Attributes of Meta which can legally be modified after the block has been instantiated.
     # Used to implement __eq__. label is not included here, despite it technically being mutable via
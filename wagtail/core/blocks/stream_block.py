@@ -1,17 +1,27 @@
+import hashlib
 import itertools
+import json
 import uuid
 from collections import OrderedDict, defaultdict
 from collections.abc import MutableSequence
 
 from django import forms
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
 from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.forms.utils import ErrorList
+from django.template import Variable, VariableDoesNotExist
+from django.utils.encoding import force_str
 from django.utils.functional import cached_property
 from django.utils.html import format_html_join
+from django.utils.safestring import SafeData, mark_safe
 from django.utils.translation import gettext as _
 
 from wagtail.admin.staticfiles import versioned_static
 from wagtail.core.telepath import Adapter, register
+from wagtail.core.utils import json_loads
 
 from .base import Block, BoundBlock, DeclarativeSubBlocksMetaclass, get_help_icon
 
@@ -407,6 +417,63 @@ class StreamValue(MutableSequence):
             """
             return self.block.name
 
+        def render(self, context=None):
+            if self.id and self.block.meta.cache:
+                return self._render_cached(context)
+            return super().render(context=context)
+
+        def render_as_block(self, context=None):
+            return self.render(context=context)
+
+        def get_cache_key(self, context=None):
+            """
+            Return the key that the rendered HTML of this block is cached under, which
+            changes whenever the block's value, its template or any of the context variables
+            named in the block's cache_vary_on meta option change
+            """
+            vary_on = []
+            for name in self.block.meta.cache_vary_on:
+                try:
+                    vary_on.append(force_str(Variable(name).resolve(context or {})))
+                except VariableDoesNotExist:
+                    vary_on.append(None)
+
+            content = json.dumps(
+                [
+                    self.block.get_prep_value(self.value),
+                    self.block.get_template(context=context),
+                    vary_on,
+                ],
+                cls=DjangoJSONEncoder,
+                sort_keys=True,
+            )
+            return "wagtail_block:%s:%s:%s" % (
+                self.block_type,
+                self.id,
+                hashlib.sha1(content.encode("utf-8")).hexdigest(),
+            )
+
+        def _render_cached(self, context=None):
+            cache = caches[
+                getattr(settings, "WAGTAIL_BLOCK_CACHE_ALIAS", DEFAULT_CACHE_ALIAS)
+            ]
+            cache_key = self.get_cache_key(context)
+
+            cached = cache.get(cache_key)
+            if cached is None:
+                html = super().render(context=context)
+                # Blocks without a template render their value as a plain string, which
+                # must still be escaped when output, so record whether it was safe
+                cache.set(
+                    cache_key,
+                    (isinstance(html, SafeData), str(html)),
+                    getattr(settings, "WAGTAIL_BLOCK_CACHE_TIMEOUT", DEFAULT_TIMEOUT),
+                )
+                return html
+
+            is_safe, html = cached
+            return mark_safe(html) if is_safe else html
+
         def get_prep_value(self):
             return {
                 "type": self.block_type,
@@ -460,7 +527,9 @@ class StreamValue(MutableSequence):
         def __repr__(self):
             return repr(list(self))
 
-    def __init__(self, stream_block, stream_data, is_lazy=False, raw_text=None):
+    def __init__(
+        self, stream_block, stream_data, is_lazy=False, raw_text=None, raw_json=None
+    ):
         """
         Construct a StreamValue linked to the given StreamBlock,
         with child values given in stream_data.
@@ -479,10 +548,23 @@ class StreamValue(MutableSequence):
         migrated to a StreamField. In this situation we return a blank StreamValue
         with the raw text accessible under the `raw_text` attribute, so that migration
         code can be rewritten to convert it as desired.
+
+        raw_json is the stream data as a JSON string, as stored in the database. If this is
+        passed, stream_data is ignored and the string is only decoded when the stream is first
+        accessed (in the same way as for is_lazy=True), so that values which are loaded but
+        never used cost very little.
         """
         self.stream_block = (
             stream_block  # the StreamBlock object that handles this value
         )
+
+        if raw_json is not None:
+            # _raw_data, _bound_blocks and raw_text are set by _decode_raw_json when first
+            # looked up (see __getattr__)
+            self.is_lazy = True
+            self._raw_json = raw_json
+            return
+
         self.is_lazy = is_lazy
         self.raw_text = raw_text
 
@@ -499,6 +581,43 @@ class StreamValue(MutableSequence):
                 self._construct_stream_child(item) for item in stream_data
             ]
 
+    def __getattr__(self, name):
+        # Only called for attributes that haven't been set, i.e. before the JSON
+        # passed as raw_json has been decoded
+        if name in ("_raw_data", "_bound_blocks", "raw_text") and (
+            "_raw_json" in self.__dict__
+        ):
+            self._decode_raw_json()
+            return getattr(self, name)
+
+        raise AttributeError(
+            "%r object has no attribute %r" % (type(self).__name__, name)
+        )
+
+    def _decode_raw_json(self):
+        raw_json = self.__dict__.pop("_raw_json")
+        self.raw_text = None
+
+        try:
+            stream_data = json_loads(raw_json)
+        except ValueError:
+            # value is not valid JSON; most likely, this field was previously a
+            # rich text field before being migrated to StreamField, and the data
+            # was left intact in the migration. Treat it as an empty stream, but keep
+            # the raw text available so that it can be used to migrate that data
+            stream_data = None
+            self.raw_text = raw_json
+
+        # stream_data is None if the JSON was the literal string 'null', which should
+        # never happen but is treated as an empty stream to be safe. Unrecognised block
+        # types are dropped, as in StreamBlock.to_python
+        self._raw_data = [
+            child_data
+            for child_data in stream_data or []
+            if child_data["type"] in self.stream_block.child_blocks
+        ]
+        self._bound_blocks = [None] * len(self._raw_data)
+
     def _construct_stream_child(self, item):
         """
         Create a StreamChild instance from a (type, value, id) or (type, value) tuple,
@@ -628,6 +747,41 @@ class StreamValue(MutableSequence):
         return self.__html__()
 
 
+def prefetch_stream_values(stream_values):
+    """
+    Convert the raw data of all the given StreamValues to native values, with one call to
+    each child block's bulk_to_python method for all the items of that block type across
+    all the values (rather than one per value), so that database lookups such as those made
+    by chooser blocks are batched into a single query per block type.
+
+    Items that have already been converted are left as they are.
+    """
+    # mapping of id(child block) => (child block, list of (stream value, index) pairs);
+    # blocks are keyed by identity, as they implement __eq__ but are not hashable
+    pending_items = OrderedDict()
+
+    for stream_value in stream_values:
+        for i, bound_block in enumerate(stream_value._bound_blocks):
+            if bound_block is not None:
+                continue
+
+            type_name = stream_value._raw_data[i]["type"]
+            child_block = stream_value.stream_block.child_blocks[type_name]
+            pending_items.setdefault(id(child_block), (child_block, []))[1].append(
+                (stream_value, i)
+            )
+
+    for child_block, items in pending_items.values():
+        converted_values = child_block.bulk_to_python(
+            [stream_value._raw_data[i]["value"] for stream_value, i in items]
+        )
+
+        for (stream_value, i), value in zip(items, converted_values):
+            stream_value._bound_blocks[i] = StreamValue.StreamChild(
+                child_block, value, id=stream_value._raw_data[i].get("id")
+            )
+
+
 class StreamBlockAdapter(Adapter):
     js_constructor = "wagtail.blocks.StreamBlock"
 
@@ -4,8 +4,15 @@ from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.utils.encoding import force_str
 
-from wagtail.core.blocks import Block, BlockField, StreamBlock, StreamValue
+from wagtail.core.blocks import (
+    BaseStreamBlock,
+    Block,
+    BlockField,
+    StreamBlock,
+    StreamValue,
+)
 from wagtail.core.rich_text import get_text_for_indexing
+from wagtail.core.utils import json_loads
 
 
 class RichTextField(models.TextField):
@@ -105,23 +112,29 @@ class StreamField(models.Field):
         elif isinstance(value, StreamValue):
             return value
         elif isinstance(value, str):
-            try:
-                unpacked_value = json.loads(value)
-            except ValueError:
-                # value is not valid JSON; most likely, this field was previously a
-                # rich text field before being migrated to StreamField, and the data
-                # was left intact in the migration. Return an empty stream instead
-                # (but keep the raw text available as an attribute, so that it can be
-                # used to migrate that data to StreamField)
-                return StreamValue(self.stream_block, [], raw_text=value)
-
-            if unpacked_value is None:
-                # we get here if value is the literal string 'null'. This should probably
-                # never happen if the rest of the (de)serialization code is working properly,
-                # but better to handle it just in case...
-                return StreamValue(self.stream_block, [])
-
-            return self.stream_block.to_python(unpacked_value)
+            if type(self.stream_block).to_python is not BaseStreamBlock.to_python:
+                # Decode the JSON now, as the block needs to convert it itself
+                try:
+                    unpacked_value = json_loads(value)
+                except ValueError:
+                    # value is not valid JSON; most likely, this field was previously a
+                    # rich text field before being migrated to StreamField, and the data
+                    # was left intact in the migration. Return an empty stream instead
+                    # (but keep the raw text available as an attribute, so that it can be
+                    # used to migrate that data to StreamField)
+                    return StreamValue(self.stream_block, [], raw_text=value)
+
+                if unpacked_value is None:
+                    # we get here if value is the literal string 'null'. This should probably
+                    # never happen if the rest of the (de)serialization code is working properly,
+                    # but better to handle it just in case...
+                    return StreamValue(self.stream_block, [])
+
+                return self.stream_block.to_python(unpacked_value)
+
+            # The JSON is only decoded when the value is first accessed, so that pages
+            # loaded for listings and menus don't pay for decoding their content
+            return StreamValue(self.stream_block, None, raw_json=value)
         else:
             # See if it looks like the standard non-smart representation of a
             # StreamField value: a list of (block_name, value) tuples
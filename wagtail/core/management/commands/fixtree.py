@@ -47,8 +47,20 @@ class Command(BaseCommand):
                 page.delete()
 
         self.handle_model(Page, "page", "pages", any_page_problems_fixed, options)
+        self.handle_url_paths()
         self.handle_model(Collection, "collection", "collections", False, options)
 
+    def handle_url_paths(self):
+        self.stdout.write("Checking page URL paths for problems...")
+        updated_count = Page.fix_url_paths()
+        if updated_count:
+            self.stdout.write(
+                "Incorrect url_path value found for %d %s; fixed.\n\n"
+                % (updated_count, "pages" if updated_count != 1 else "page")
+            )
+        else:
+            self.stdout.write("No problems found.\n\n")
+
     def handle_model(
         self, model, model_name, model_name_plural, any_problems_fixed, options
     ):
@@ -1,18 +1,24 @@
 from django.core.management.base import BaseCommand
-from django.utils import dateparse, timezone
+from django.utils import timezone
 
 from wagtail.core.models import Page, PageRevision
+from wagtail.core.utils import batch_side_effects
 
+# The number of pages or revisions to load at a time
+BATCH_SIZE = 100
 
-def revision_date_expired(r):
-    expiry_str = r.content.get("expire_at")
-    if not expiry_str:
-        return False
-    expire_at = dateparse.parse_datetime(expiry_str)
-    if expire_at < timezone.now():
-        return True
-    else:
-        return False
+
+def iterate_in_batches(queryset, batch_size=BATCH_SIZE):
+    """
+    Yield the objects in the queryset, loading batch_size of them at a time. The IDs
+    are all fetched up front, so objects that are changed along the way (and so no longer
+    match the queryset) are still processed.
+    """
+    ids = list(queryset.order_by("pk").values_list("pk", flat=True))
+    for start in range(0, len(ids), batch_size):
+        yield from queryset.model._default_manager.filter(
+            pk__in=ids[start : start + batch_size]
+        ).order_by("pk")
 
 
 class Command(BaseCommand):
@@ -31,6 +37,15 @@ class Command(BaseCommand):
             self.stdout.write("Will do a dry run.")
             dryrun = True
 
+        if dryrun:
+            self.process_scheduled_changes(dryrun)
+        else:
+            # Apply search index updates and frontend cache purges once all the
+            # changes in this run have been made
+            with batch_side_effects():
+                self.process_scheduled_changes(dryrun)
+
+    def process_scheduled_changes(self, dryrun):
         # 1. get all expired pages with live = True
         expired_pages = Page.objects.filter(live=True, expire_at__lt=timezone.now())
         if dryrun:
@@ -48,19 +63,15 @@ class Command(BaseCommand):
                 self.stdout.write("No expired pages to be deactivated found.")
         else:
             # Unpublish the expired pages
-            # Cast to list to make sure the query is fully evaluated
-            # before unpublishing anything
-            for page in list(expired_pages):
+            for page in iterate_in_batches(expired_pages):
                 page.unpublish(
                     set_expired=True, log_action="wagtail.unpublish.scheduled"
                 )
 
         # 2. get all page revisions for moderation that have been expired
-        expired_revs = [
-            r
-            for r in PageRevision.objects.filter(submitted_for_moderation=True)
-            if revision_date_expired(r)
-        ]
+        expired_revs = PageRevision.objects.filter(
+            submitted_for_moderation=True, expire_at__lt=timezone.now()
+        )
         if dryrun:
             self.stdout.write("---------------------------------")
             if expired_revs:
@@ -73,9 +84,7 @@ class Command(BaseCommand):
                     rev_data = er.content
                     self.stdout.write(
                         "{0}\t{1}\t{2}".format(
-                            dateparse.parse_datetime(
-                                rev_data.get("expire_at")
-                            ).strftime("%Y-%m-%d %H:%M"),
+                            er.expire_at.strftime("%Y-%m-%d %H:%M"),
                             rev_data.get("slug"),
                             rev_data.get("title"),
                         )
@@ -83,9 +92,7 @@ class Command(BaseCommand):
             else:
                 self.stdout.write("No expired revision to be dropped from moderation.")
         else:
-            for er in expired_revs:
-                er.submitted_for_moderation = False
-                er.save()
+            expired_revs.update(submitted_for_moderation=False)
 
         # 3. get all revisions that need to be published
         revs_for_publishing = PageRevision.objects.filter(
@@ -109,7 +116,7 @@ class Command(BaseCommand):
             else:
                 self.stdout.write("No pages to go live.")
         else:
-            for rp in revs_for_publishing:
+            for rp in iterate_in_batches(revs_for_publishing):
                 # just run publish for the revision -- since the approved go
                 # live datetime is before now it will make the page live
                 rp.publish(user=rp.user, log_action="wagtail.publish.scheduled")
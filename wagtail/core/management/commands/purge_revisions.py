@@ -1,8 +1,8 @@
-from django.core.management.base import BaseCommand
-from django.db.models import Q
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Exists, Max, Min, OuterRef, Q
 from django.utils import timezone
 
-from wagtail.core.models import PageRevision
+from wagtail.core.models import Comment, PageRevision
 
 try:
     from wagtail.core.models import WorkflowState
@@ -11,6 +11,8 @@ try:
 except ImportError:
     workflow_support = False
 
+DEFAULT_CHUNK_SIZE = 10000
+
 
 class Command(BaseCommand):
     help = "Delete page revisions which are not the latest revision for a page, published or scheduled to be published, or in moderation"
@@ -21,11 +23,41 @@ class Command(BaseCommand):
             type=int,
             help="Only delete revisions older than this number of days",
         )
+        parser.add_argument(
+            "--keep",
+            type=int,
+            default=1,
+            help="The number of most recent revisions to keep for each page (default: 1)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="The range of revision IDs to delete at a time (default: %d)"
+            % DEFAULT_CHUNK_SIZE,
+        )
 
     def handle(self, *args, **options):
         days = options.get("days")
+        keep = options["keep"]
+        chunk_size = options["chunk_size"]
+        verbosity = options["verbosity"]
+
+        if keep < 1:
+            raise CommandError("--keep must be at least 1")
+        if chunk_size < 1:
+            raise CommandError("--chunk-size must be at least 1")
+
+        def progress(deleted_count, last_id, max_id):
+            if verbosity >= 2:
+                self.stdout.write(
+                    "Deleted %d revisions (up to revision ID %d of %d)"
+                    % (deleted_count, last_id, max_id)
+                )
 
-        revisions_deleted = purge_revisions(days=days)
+        revisions_deleted = purge_revisions(
+            days=days, keep=keep, chunk_size=chunk_size, progress=progress
+        )
 
         if revisions_deleted:
             self.stdout.write(
@@ -37,7 +69,18 @@ class Command(BaseCommand):
             self.stdout.write("No revisions deleted")
 
 
-def purge_revisions(days=None):
+def newer_revisions_q(page_id, created_at, revision_id):
+    """
+    Return a Q object matching the revisions of the given page that are newer than the
+    revision with the given creation time and ID (using the same ordering as
+    PageRevision.get_next). The arguments may be values or expressions such as OuterRef.
+    """
+    return Q(page_id=page_id) & (
+        Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=revision_id)
+    )
+
+
+def get_purgeable_revisions(days=None, keep=1):
     # exclude revisions which have been submitted for moderation in the old system
     purgeable_revisions = PageRevision.objects.exclude(
         submitted_for_moderation=True
@@ -58,12 +101,74 @@ def purge_revisions(days=None):
         # only include revisions which were created before the cut off date
         purgeable_revisions = purgeable_revisions.filter(created_at__lt=purgeable_until)
 
+    # don't delete the latest `keep` revisions for any page, i.e. only include revisions
+    # that have at least that many newer revisions
+    newer_revisions = PageRevision.objects.filter(
+        newer_revisions_q(OuterRef("page_id"), OuterRef("created_at"), OuterRef("id"))
+    )
+    return purgeable_revisions.filter(Exists(newer_revisions[keep - 1 : keep]))
+
+
+def move_comments_to_next_revisions(revision_ids):
+    """
+    Move the comments created on the given revisions to the next revision of the same
+    page that isn't one of them, as PageRevision.delete does, since they may still apply
+    """
+    revisions_with_comments = (
+        PageRevision.objects.filter(id__in=revision_ids)
+        .filter(Exists(Comment.objects.filter(revision_created_id=OuterRef("id"))))
+        .values_list("id", "page_id", "created_at")
+    )
+
+    for revision_id, page_id, created_at in revisions_with_comments:
+        next_revision = (
+            PageRevision.objects.filter(
+                newer_revisions_q(page_id, created_at, revision_id)
+            )
+            .exclude(id__in=revision_ids)
+            .order_by("created_at", "id")
+            .first()
+        )
+        if next_revision:
+            Comment.objects.filter(revision_created_id=revision_id).update(
+                revision_created=next_revision
+            )
+
+
+def purge_revisions(days=None, keep=1, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """
+    Delete the page revisions that are not in moderation, approved to go live or among the
+    ``keep`` most recent revisions of their page, and (if ``days`` is given) are older than
+    that number of days. Returns the number of revisions deleted.
+
+    Revisions are found and deleted with a fixed number of queries for each range of
+    ``chunk_size`` revision IDs, so that no long-running transactions or locks are needed.
+    ``progress`` is called after each range with the number of revisions deleted so far,
+    the last ID in the range and the highest revision ID.
+    """
+    purgeable_revisions = get_purgeable_revisions(days=days, keep=keep)
+
+    id_range = PageRevision.objects.aggregate(min_id=Min("id"), max_id=Max("id"))
+    if id_range["min_id"] is None:
+        return 0
+
     deleted_revisions_count = 0
 
-    for revision in purgeable_revisions:
-        # don't delete the latest revision for any page
-        if not revision.is_latest_revision():
-            revision.delete()
-            deleted_revisions_count += 1
+    for start_id in range(id_range["min_id"], id_range["max_id"] + 1, chunk_size):
+        end_id = min(start_id + chunk_size - 1, id_range["max_id"])
+
+        revision_ids = list(
+            purgeable_revisions.filter(id__gte=start_id, id__lte=end_id).values_list(
+                "id", flat=True
+            )
+        )
+
+        if revision_ids:
+            move_comments_to_next_revisions(revision_ids)
+            PageRevision.objects.filter(id__in=revision_ids).delete()
+            deleted_revisions_count += len(revision_ids)
+
+        if progress is not None:
+            progress(deleted_revisions_count, end_id, id_range["max_id"])
 
     return deleted_revisions_count
@@ -7,12 +7,8 @@ class Command(BaseCommand):
 
     help = "Resets url_path fields on each page recursively"
 
-    def set_subtree(self, root, parent=None):
-        root.set_url_path(parent)
-        root.save(update_fields=["url_path"])
-        for child in root.get_children():
-            self.set_subtree(child, root)
-
     def handle(self, *args, **options):
-        for node in Page.get_root_nodes():
-            self.set_subtree(node)
+        updated_count = Page.fix_url_paths()
+
+        if options["verbosity"] >= 1:
+            self.stdout.write("Updated url_path on %d pages" % updated_count)
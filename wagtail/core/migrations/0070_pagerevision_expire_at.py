@@ -0,0 +1,52 @@
+from django.db import migrations, models
+from django.db.models import Q
+from django.utils import dateparse
+
+
+def populate_revision_expire_at(apps, schema_editor):
+    # Only revisions that are still pending (in moderation or scheduled) are looked at by
+    # publish_scheduled_pages, so leave the rest of the revision history alone
+    PageRevision = apps.get_model("wagtailcore.PageRevision")
+    pending_revisions = PageRevision.objects.filter(
+        Q(submitted_for_moderation=True) | Q(approved_go_live_at__isnull=False)
+    )
+
+    revisions_to_update = []
+    for revision in pending_revisions.only("id", "content").iterator():
+        expire_at = revision.content.get("expire_at")
+        if expire_at:
+            revision.expire_at = dateparse.parse_datetime(expire_at)
+            revisions_to_update.append(revision)
+
+    PageRevision.objects.bulk_update(
+        revisions_to_update, ["expire_at"], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wagtailcore", "0069_log_entry_jsonfield"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pagerevision",
+            name="expire_at",
+            field=models.DateTimeField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                null=True,
+                verbose_name="expiry date/time",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="page",
+            name="expire_at",
+            field=models.DateTimeField(
+                blank=True, db_index=True, null=True, verbose_name="expiry date/time"
+            ),
+        ),
+        migrations.RunPython(populate_revision_expire_at, migrations.RunPython.noop),
+    ]
@@ -33,7 +33,7 @@ from django.dispatch import receiver
 from django.http import Http404
 from django.template.response import TemplateResponse
 from django.urls import NoReverseMatch, reverse
-from django.utils import timezone
+from django.utils import dateparse, timezone
 from django.utils import translation as translation
 from django.utils.cache import patch_cache_control
 from django.utils.encoding import force_str
@@ -55,6 +55,12 @@ from wagtail.core.actions.unpublish_page import UnpublishPageAction
 from wagtail.core.fields import StreamField
 from wagtail.core.forms import TaskStateCommentForm
 from wagtail.core.log_actions import log
+from wagtail.core.page_permissions import get_page_permission_summary
+from wagtail.core.page_urls import (
+    NOT_CACHED,
+    get_page_url_cache,
+    get_site_root_path_index,
+)
 from wagtail.core.query import PageQuerySet
 from wagtail.core.signals import (
     page_published,
@@ -69,6 +75,7 @@ from wagtail.core.signals import (
     workflow_rejected,
     workflow_submitted,
 )
+from wagtail.core.sites import invalidate_site_routing_table
 from wagtail.core.treebeard import TreebeardPathFixMixin
 from wagtail.core.url_routing import RouteResult
 from wagtail.core.utils import (
@@ -283,7 +290,7 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
         verbose_name=_("go live date/time"), blank=True, null=True
     )
     expire_at = models.DateTimeField(
-        verbose_name=_("expiry date/time"), blank=True, null=True
+        verbose_name=_("expiry date/time"), blank=True, null=True, db_index=True
     )
     expired = models.BooleanField(
         verbose_name=_("expired"), default=False, editable=False
@@ -419,6 +426,82 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
 
         return self.url_path
 
+    @classmethod
+    def fix_url_paths(cls, root=None, batch_size=1000):
+        """
+        Recalculate the url_path of every page (or, if ``root`` is given, of that page and
+        its descendants) from the slugs of its ancestors, and return the number of pages
+        that were changed.
+
+        The tree is processed one level at a time, reading each page's slug alongside its
+        parent's url_path in batches of ``batch_size`` pages, and writing the changed values
+        with ``bulk_update``. The number of queries depends on the number of pages and the
+        depth of the tree, not on its shape. Pages whose parent is missing are left alone.
+        """
+        pages = Page.objects.all()
+        if root is not None:
+            pages = pages.filter(path__startswith=root.path)
+
+        max_depth = pages.aggregate(max_depth=models.Max("depth"))["max_depth"]
+        if max_depth is None:
+            return 0
+
+        min_depth = root.depth if root is not None else 1
+        updated_count = 0
+
+        with transaction.atomic():
+            if min_depth == 1:
+                # the tree root always has a url_path of '/'
+                updated_count += (
+                    pages.filter(depth=1).exclude(url_path="/").update(url_path="/")
+                )
+                min_depth = 2
+
+            for depth in range(min_depth, max_depth + 1):
+                # The parent's path is the page's path minus the last step
+                parent_url_path = Page.objects.filter(
+                    path=Substr(OuterRef("path"), 1, (depth - 1) * cls.steplen)
+                ).values("url_path")[:1]
+                level = pages.filter(depth=depth).annotate(
+                    parent_url_path=Subquery(parent_url_path)
+                )
+
+                last_pk = None
+                while True:
+                    batch = level.order_by("pk")
+                    if last_pk is not None:
+                        batch = batch.filter(pk__gt=last_pk)
+                    rows = list(
+                        batch.values_list("pk", "slug", "url_path", "parent_url_path")[
+                            :batch_size
+                        ]
+                    )
+                    if not rows:
+                        break
+                    last_pk = rows[-1][0]
+
+                    pages_to_update = []
+                    for pk, slug, url_path, parent_url_path in rows:
+                        if parent_url_path is None:
+                            # orphaned page
+                            continue
+
+                        new_url_path = parent_url_path + slug + "/"
+                        if new_url_path != url_path:
+                            pages_to_update.append(Page(pk=pk, url_path=new_url_path))
+
+                    if pages_to_update:
+                        Page.objects.bulk_update(pages_to_update, ["url_path"])
+                        updated_count += len(pages_to_update)
+
+        if updated_count:
+            # Site root paths are derived from the url_paths of the sites' root pages
+            cache.delete("wagtail_site_root_paths")
+            invalidate_site_routing_table()
+            transaction.on_commit(invalidate_site_routing_table)
+
+        return updated_count
+
     @staticmethod
     def _slug_is_available(slug, parent_page, page=None):
         """
@@ -569,6 +652,9 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
         # always check if this page is a site root, even if it's new.
         if self.is_site_root():
             cache.delete("wagtail_site_root_paths")
+            # The site routing table holds a copy of each site's root page
+            invalidate_site_routing_table()
+            transaction.on_commit(invalidate_site_routing_table)
 
         # Log
         if is_new:
@@ -851,6 +937,61 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
             else:
                 raise Http404
 
+    def _route_by_url_path(self, request, path_components):
+        """
+        Equivalent to ``self.specific.route(request, path_components)``, but rather than
+        looking up one child page per path component, fetches all of the pages along the
+        path with a single query on ``url_path``. Pages of types that override ``route``
+        are routed by calling their ``route`` method with the remaining path components.
+        """
+        page_model = self.specific_class
+        if page_model is None or page_model.route is not Page.route:
+            return self.specific.route(request, path_components)
+
+        url_paths = []
+        url_path = self.url_path
+        for component in path_components:
+            url_path += component + "/"
+            url_paths.append(url_path)
+
+        # The slug condition lets the database use the index on slug
+        pages_by_url_path = {}
+        for values in Page.objects.filter(
+            path__startswith=self.path,
+            url_path__in=url_paths,
+            slug__in=path_components,
+        ).values("id", "url_path", "content_type_id"):
+            if values["url_path"] in pages_by_url_path:
+                # The tree has two pages with the same URL path; leave it to route()
+                # to find the one that it would have found
+                return self.specific.route(request, path_components)
+            pages_by_url_path[values["url_path"]] = values
+
+        page_id = self.id
+        for i, url_path in enumerate(url_paths):
+            values = pages_by_url_path.get(url_path)
+            if values is None:
+                raise Http404
+
+            page_id = values["id"]
+            page_model = ContentType.objects.get_for_id(
+                values["content_type_id"]
+            ).model_class()
+            if page_model is None:
+                return Page.objects.get(id=page_id).specific.route(
+                    request, path_components[i + 1 :]
+                )
+            if page_model.route is not Page.route:
+                return page_model._default_manager.get(id=page_id).route(
+                    request, path_components[i + 1 :]
+                )
+
+        page = page_model._default_manager.get(id=page_id)
+        if page.live:
+            return RouteResult(page)
+        else:
+            raise Http404
+
     def get_admin_display_title(self):
         """
         Return the title for this page as it should appear in the admin backend;
@@ -1180,17 +1321,29 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
             cache_object._wagtail_cached_site_root_paths = Site.get_site_root_paths()
             return cache_object._wagtail_cached_site_root_paths
 
+    def _get_site_root_path_index(self, request=None):
+        """
+        Return a ``SiteRootPathIndex`` of ``Site.get_site_root_paths()``, using the cached
+        copy on the request object if available.
+        """
+        cache_object = request if request else self
+        try:
+            return cache_object._wagtail_cached_site_root_path_index
+        except AttributeError:
+            cache_object._wagtail_cached_site_root_path_index = (
+                get_site_root_path_index(self._get_site_root_paths(request))
+            )
+            return cache_object._wagtail_cached_site_root_path_index
+
     def _get_relevant_site_root_paths(self, cache_object=None):
         """
         .. versionadded::2.16
 
         Returns a tuple of root paths for all sites this page belongs to.
         """
-        return tuple(
-            srp
-            for srp in self._get_site_root_paths(cache_object)
-            if self.url_path.startswith(srp.root_path)
-        )
+        return self._get_site_root_path_index(
+            cache_object
+        ).get_relevant_site_root_paths(self.url_path)
 
     def get_url_parts(self, request=None):
         """
@@ -1210,6 +1363,26 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
         when calling ``super``.
         """
 
+        site = Site.find_for_request(request)
+
+        url_cache = get_page_url_cache()
+        if url_cache is not None:
+            # The result only depends on the inputs in the key, so can be shared between
+            # all pages with the same url_path
+            url_cache_key = url_cache.get_key(
+                self.url_path,
+                self._get_site_root_path_index(request),
+                site.pk if site else None,
+            )
+            url_parts = url_cache.get(url_cache_key)
+            if url_parts is NOT_CACHED:
+                url_parts = self._get_url_parts(site, request)
+                url_cache.set(url_cache_key, url_parts)
+            return url_parts
+
+        return self._get_url_parts(site, request)
+
+    def _get_url_parts(self, site, request=None):
         possible_sites = self._get_relevant_site_root_paths(request)
 
         if not possible_sites:
@@ -1217,7 +1390,6 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
 
         site_id, root_path, root_url, language_code = possible_sites[0]
 
-        site = Site.find_for_request(request)
         if site:
             for site_id, root_path, root_url, language_code in possible_sites:
                 if site_id == site.pk:
@@ -2157,10 +2329,28 @@ class PageRevision(models.Model):
     approved_go_live_at = models.DateTimeField(
         verbose_name=_("approved go live at"), null=True, blank=True, db_index=True
     )
+    # A copy of the expiry date/time in the revision content, so that
+    # publish_scheduled_pages can find expired revisions without decoding their content
+    expire_at = models.DateTimeField(
+        verbose_name=_("expiry date/time"),
+        null=True,
+        blank=True,
+        db_index=True,
+        editable=False,
+    )
 
     objects = models.Manager()
     submitted_revisions = SubmittedRevisionsManager()
 
+    def get_content_expire_at(self):
+        """
+        Return the expiry date/time recorded in the revision content, or None
+        """
+        expire_at = self.content.get("expire_at") if self.content else None
+        if isinstance(expire_at, str):
+            expire_at = dateparse.parse_datetime(expire_at)
+        return expire_at
+
     def save(self, user=None, *args, **kwargs):
         # Set default value for created_at to now
         # We cannot use auto_now_add as that will override
@@ -2168,6 +2358,13 @@ class PageRevision(models.Model):
         if self.created_at is None:
             self.created_at = timezone.now()
 
+        # Keep expire_at in step with the content
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "content" in update_fields:
+            self.expire_at = self.get_content_expire_at()
+            if update_fields is not None and "expire_at" not in update_fields:
+                kwargs["update_fields"] = list(update_fields) + ["expire_at"]
+
         super().save(*args, **kwargs)
         if self.submitted_for_moderation:
             # ensure that all other revisions of this page have the 'submitted for moderation' flag unset
@@ -2345,6 +2542,14 @@ class UserPagePermissionsProxy:
                 group__user=self.user
             ).select_related("page")
 
+    @cached_property
+    def permission_summary(self):
+        """
+        A PagePermissionSummary of the page permissions granted to this user's groups,
+        reduced to the minimal set of subtrees for each permission type
+        """
+        return get_page_permission_summary(self.user)
+
     def revisions_for_moderation(self):
         """Return a queryset of page revisions awaiting moderation that this user has publish permission on"""
 
@@ -2354,22 +2559,15 @@ class UserPagePermissionsProxy:
         if self.user.is_superuser:
             return PageRevision.submitted_revisions.all()
 
-        # get the list of pages for which they have direct publish permission
-        # (i.e. they can publish any page within this subtree)
-        publishable_pages_paths = (
-            self.permissions.filter(permission_type="publish")
-            .values_list("page__path", flat=True)
-            .distinct()
+        # compile a filter expression to apply to the PageRevision.submitted_revisions manager:
+        # return only those pages within the subtrees that they have direct publish
+        # permission on (i.e. they can publish any page within this subtree)
+        only_my_sections = self.permission_summary.get_filter(
+            "publish", field_name="page__path"
         )
-        if not publishable_pages_paths:
+        if only_my_sections is None:
             return PageRevision.objects.none()
 
-        # compile a filter expression to apply to the PageRevision.submitted_revisions manager:
-        # return only those pages whose paths start with one of the publishable_pages paths
-        only_my_sections = Q(page__path__startswith=publishable_pages_paths[0])
-        for page_path in publishable_pages_paths[1:]:
-            only_my_sections = only_my_sections | Q(page__path__startswith=page_path)
-
         # return the filtered queryset
         return PageRevision.submitted_revisions.filter(only_my_sections)
 
@@ -2389,30 +2587,33 @@ class UserPagePermissionsProxy:
         if self.user.is_superuser:
             return Page.objects.all()
 
-        explorable_pages = Page.objects.none()
+        summary = self.permission_summary
+        if not summary.grants:
+            return Page.objects.none()
 
-        # Creates a union queryset of all objects the user has access to add,
-        # edit and publish
-        for perm in self.permissions.filter(
-            Q(permission_type="add")
-            | Q(permission_type="edit")
-            | Q(permission_type="publish")
-            | Q(permission_type="lock")
-        ):
-            explorable_pages |= Page.objects.descendant_of(perm.page, inclusive=True)
+        # All pages within the subtrees that the user has access to add, edit,
+        # publish or lock
+        explorable_filter = summary.get_filter("add", "edit", "publish", "lock")
+        if explorable_filter is None:
+            explorable_filter = Q(pk__in=[])
 
         # For all pages with specific permissions, add their ancestors as
         # explorable. This will allow deeply nested pages to be accessed in the
         # explorer. For example, in the hierarchy A>B>C>D where the user has
         # 'edit' access on D, they will be able to navigate to D without having
         # explicit access to A, B or C.
-        page_permissions = Page.objects.filter(group_permissions__in=self.permissions)
-        for page in page_permissions:
-            explorable_pages |= page.get_ancestors()
+        ancestor_paths = summary.get_ancestor_paths()
+        if ancestor_paths:
+            explorable_filter |= Q(path__in=ancestor_paths)
+
+        explorable_pages = Page.objects.filter(explorable_filter)
 
         # Remove unnecessary top-level ancestors that the user has no access to
-        fca_page = page_permissions.first_common_ancestor()
-        explorable_pages = explorable_pages.filter(path__startswith=fca_page.path)
+        common_ancestor_path = summary.get_common_ancestor_path()
+        if common_ancestor_path:
+            explorable_pages = explorable_pages.filter(
+                path__startswith=common_ancestor_path
+            )
 
         return explorable_pages
 
@@ -2424,21 +2625,26 @@ class UserPagePermissionsProxy:
         if self.user.is_superuser:
             return Page.objects.all()
 
-        editable_pages = Page.objects.none()
+        summary = self.permission_summary
 
-        for perm in self.permissions.filter(permission_type="add"):
-            # user has edit permission on any subpage of perm.page
-            # (including perm.page itself) that is owned by them
-            editable_pages |= Page.objects.descendant_of(
-                perm.page, inclusive=True
-            ).filter(owner=self.user)
+        # user has edit permission on any page within a subtree they have 'edit'
+        # permission on, regardless of owner
+        editable_filter = summary.get_filter("edit")
 
-        for perm in self.permissions.filter(permission_type="edit"):
-            # user has edit permission on any subpage of perm.page
-            # (including perm.page itself) regardless of owner
-            editable_pages |= Page.objects.descendant_of(perm.page, inclusive=True)
+        # ...and on any page within a subtree they have 'add' permission on that is
+        # owned by them
+        add_filter = summary.get_filter("add")
+        if add_filter is not None:
+            add_filter &= Q(owner=self.user)
+            if editable_filter is None:
+                editable_filter = add_filter
+            else:
+                editable_filter |= add_filter
+
+        if editable_filter is None:
+            return Page.objects.none()
 
-        return editable_pages
+        return Page.objects.filter(editable_filter)
 
     def can_edit_pages(self):
         """Return True if the user has permission to edit any pages"""
@@ -2452,14 +2658,13 @@ class UserPagePermissionsProxy:
         if self.user.is_superuser:
             return Page.objects.all()
 
-        publishable_pages = Page.objects.none()
-
-        for perm in self.permissions.filter(permission_type="publish"):
-            # user has publish permission on any subpage of perm.page
-            # (including perm.page itself)
-            publishable_pages |= Page.objects.descendant_of(perm.page, inclusive=True)
+        # user has publish permission on any page within a subtree they have
+        # 'publish' permission on
+        publishable_filter = self.permission_summary.get_filter("publish")
+        if publishable_filter is None:
+            return Page.objects.none()
 
-        return publishable_pages
+        return Page.objects.filter(publishable_filter)
 
     def can_publish_pages(self):
         """Return True if the user has permission to publish any pages"""
@@ -2472,7 +2677,7 @@ class UserPagePermissionsProxy:
         if not self.user.is_active:
             return False
         else:
-            return self.permissions.filter(permission_type="unlock").exists()
+            return "unlock" in self.permission_summary.permission_types
 
 
 class PagePermissionTester:
@@ -2483,11 +2688,11 @@ class PagePermissionTester:
         self.page_is_root = page.depth == 1  # Equivalent to page.is_root()
 
         if self.user.is_active and not self.user.is_superuser:
-            self.permissions = {
-                perm.permission_type
-                for perm in user_perms.permissions
-                if self.page.path.startswith(perm.page.path)
-            }
+            self.permissions = (
+                user_perms.permission_summary.get_permission_types_for_path(
+                    self.page.path
+                )
+            )
 
     def user_has_lock(self):
         return self.page.locked_by_id == self.user.pk
@@ -8,7 +8,7 @@ from django.db.models.functions import Lower
 from django.http.request import split_domain_port
 from django.utils.translation import gettext_lazy as _
 
-from wagtail.core.sites import get_site_for_hostname
+from wagtail.core.sites import get_site_for_hostname, get_site_routing_table
 
 
 class SiteManager(models.Manager):
@@ -107,7 +107,10 @@ class Site(models.Model):
         port = request.get_port()
         site = None
         try:
-            site = get_site_for_hostname(hostname, port)
+            if getattr(settings, "WAGTAIL_SITE_ROUTING_TABLE_ENABLED", False):
+                site = get_site_routing_table().get_site_for_hostname(hostname, port)
+            else:
+                site = get_site_for_hostname(hostname, port)
         except Site.DoesNotExist:
             pass
             # copy old SiteMiddleware behavior
@@ -0,0 +1,175 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.db import transaction
+from django.utils import translation
+from django.utils.cache import cc_delim_re, get_max_age
+
+PAGE_RESPONSE_CACHE_KEY_PREFIX = "wagtail_page_response"
+PAGE_RESPONSE_CACHE_VERSION_KEY_PREFIX = "wagtail_page_response_version"
+
+
+def get_vary_headers(response):
+    """
+    Return the lower-cased header names listed in the response's Vary header
+    """
+    if not response.has_header("Vary"):
+        return []
+    return [
+        header.strip().lower()
+        for header in cc_delim_re.split(response["Vary"])
+        if header.strip()
+    ]
+
+
+class PageResponseCache:
+    """
+    Caches the responses of Wagtail's page serving view for anonymous users.
+
+    Responses are keyed on the site, the requested URL, the active language and the headers
+    listed in WAGTAIL_PAGE_CACHE_VARY_HEADERS, along with a version token for the page that
+    served them. Publishing or unpublishing a page replaces its version token, which
+    invalidates every cached response for that page - including the extra paths it serves
+    (as listed by ``get_cached_paths()``), which are served by the same page.
+
+    Lookups happen after routing and the ``before_serve_page`` hooks, so that view
+    restrictions and other hooks are still applied to every request; only the call to
+    ``page.serve()`` (and so template rendering) is skipped.
+    """
+
+    def __init__(self, cache, timeout=None, vary_headers=()):
+        self.cache = cache
+        self.timeout = timeout
+        self.vary_headers = tuple(vary_headers)
+
+    def can_cache_request(self, request):
+        if request.method not in ("GET", "HEAD"):
+            return False
+
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            return False
+
+        return True
+
+    def can_cache_response(self, page, response, request=None):
+        if response.status_code != 200 or response.streaming or response.cookies:
+            return False
+
+        # Responses containing a CSRF token are specific to the visitor's CSRF cookie.
+        # Django 4.0 renamed the flag that get_token() sets on the request.
+        if request is not None and (
+            request.META.get("CSRF_COOKIE_USED")
+            or request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+        ):
+            return False
+
+        # The cache key only distinguishes requests by the headers listed in
+        # WAGTAIL_PAGE_CACHE_VARY_HEADERS, and by language
+        covered_headers = {header.lower() for header in self.vary_headers}
+        covered_headers.add("accept-language")
+        if not set(get_vary_headers(response)) <= covered_headers:
+            return False
+
+        cache_control = response.get("Cache-Control", "")
+        if any(
+            directive in cache_control
+            for directive in ("private", "no-cache", "no-store")
+        ):
+            return False
+
+        # Never store pages that some users can't see
+        return not page.get_view_restrictions().exists()
+
+    def get_version(self, page):
+        version_key = "%s:%d" % (PAGE_RESPONSE_CACHE_VERSION_KEY_PREFIX, page.id)
+        version = self.cache.get(version_key)
+        if version is None:
+            # Use add() so that concurrent requests settle on the same version
+            self.cache.add(version_key, uuid.uuid4().hex, None)
+            version = self.cache.get(version_key)
+        return version
+
+    def get_key(self, request, site, page):
+        key_parts = [
+            request.method,
+            request.scheme,
+            request.get_host(),
+            str(site.id),
+            request.get_full_path(),
+            translation.get_language() or "",
+            self.get_version(page) or "",
+        ]
+        key_parts.extend(
+            request.headers.get(header, "") for header in self.vary_headers
+        )
+        key_hash = hashlib.sha1("\n".join(key_parts).encode("utf-8")).hexdigest()
+        return "%s:%d:%s" % (PAGE_RESPONSE_CACHE_KEY_PREFIX, page.id, key_hash)
+
+    def serve(self, page, request, site, args, kwargs):
+        """
+        Return the cached response for this request if there is one, otherwise serve the
+        page and cache the response
+        """
+        key = self.get_key(request, site, page)
+        response = self.cache.get(key)
+        if response is not None:
+            return response
+
+        response = page.serve(request, *args, **kwargs)
+
+        def store(response):
+            if self.can_cache_response(page, response, request):
+                timeout = self.timeout
+                if timeout is None:
+                    timeout = get_max_age(response)
+                if timeout is None:
+                    timeout = self.cache.default_timeout
+                if timeout:
+                    # The timeout only applies to this cache; clients still have to
+                    # revalidate, so that they see newly published content
+                    self.cache.set(key, response, timeout)
+
+        if hasattr(response, "add_post_render_callback") and not response.is_rendered:
+            # Template responses are rendered later on; cache the rendered content
+            response.add_post_render_callback(store)
+        else:
+            store(response)
+
+        return response
+
+    def invalidate(self, page):
+        self.cache.set(
+            "%s:%d" % (PAGE_RESPONSE_CACHE_VERSION_KEY_PREFIX, page.id),
+            uuid.uuid4().hex,
+            None,
+        )
+
+
+def get_page_response_cache():
+    """
+    Return the PageResponseCache configured by the WAGTAIL_PAGE_CACHE_* settings, or None
+    if WAGTAIL_PAGE_CACHE_ENABLED is not set
+    """
+    if not getattr(settings, "WAGTAIL_PAGE_CACHE_ENABLED", False):
+        return None
+
+    return PageResponseCache(
+        caches[getattr(settings, "WAGTAIL_PAGE_CACHE_ALIAS", DEFAULT_CACHE_ALIAS)],
+        timeout=getattr(settings, "WAGTAIL_PAGE_CACHE_TIMEOUT", None),
+        vary_headers=getattr(settings, "WAGTAIL_PAGE_CACHE_VARY_HEADERS", []),
+    )
+
+
+def invalidate_page_response_cache(page):
+    """
+    Discard all cached responses for the given page. This happens immediately and again once
+    the current transaction commits, so that requests made in the meantime cannot cache the
+    old content again.
+    """
+    page_cache = get_page_response_cache()
+    if page_cache is not None:
+        page_cache.invalidate(page)
+        transaction.on_commit(lambda: page_cache.invalidate(page))
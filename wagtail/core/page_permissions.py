@@ -0,0 +1,168 @@
+import posixpath
+import uuid
+from bisect import bisect_right
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+
+PAGE_PERMISSIONS_GENERATION_CACHE_KEY = "wagtail_page_permissions_generation"
+PAGE_PERMISSION_SUMMARY_CACHE_KEY_PREFIX = "wagtail_page_permission_summary"
+
+
+def get_covering_paths(paths):
+    """
+    Return the smallest sorted tuple of page paths whose subtrees cover the subtrees of
+    all the given paths, i.e. the given paths without any that are below another one.
+    """
+    covering_paths = []
+    for path in sorted(set(paths)):
+        # Sorting puts every path directly after its ancestors and their other descendants
+        if not covering_paths or not path.startswith(covering_paths[-1]):
+            covering_paths.append(path)
+    return tuple(covering_paths)
+
+
+class PagePermissionSummary:
+    """
+    The page permissions that a user has been granted through their groups, reduced to
+    the paths of the pages at the top of each subtree the user has a permission on.
+
+    Since each subtree is only listed once, page querysets can be filtered with a single
+    ``path__startswith`` condition per subtree, and the permissions for a given page can
+    be found without any queries.
+    """
+
+    def __init__(self, grants):
+        # grants is a list of (permission_type, page path) pairs
+        self.grants = list(grants)
+
+        paths_by_permission_type = {}
+        for permission_type, path in self.grants:
+            paths_by_permission_type.setdefault(permission_type, []).append(path)
+
+        self.paths_by_permission_type = {
+            permission_type: get_covering_paths(paths)
+            for permission_type, paths in paths_by_permission_type.items()
+        }
+
+    @property
+    def permission_types(self):
+        return set(self.paths_by_permission_type)
+
+    def get_paths(self, *permission_types):
+        """
+        Return the covering paths of the subtrees where the user has any of the given
+        permission types
+        """
+        return get_covering_paths(
+            path
+            for permission_type in permission_types
+            for path in self.paths_by_permission_type.get(permission_type, ())
+        )
+
+    def get_permission_types_for_path(self, path):
+        """
+        Return the set of permission types that the user has on the page with the given path
+        """
+        permission_types = set()
+        for permission_type, paths in self.paths_by_permission_type.items():
+            # As covering paths don't overlap, the only one that can be an ancestor of
+            # path is the last one that sorts before it
+            i = bisect_right(paths, path)
+            if i and path.startswith(paths[i - 1]):
+                permission_types.add(permission_type)
+        return permission_types
+
+    def get_ancestor_paths(self):
+        """
+        Return the set of paths of all the ancestors of the pages that the user has been
+        granted any permission on
+        """
+        from wagtail.core.models import Page
+
+        return {
+            path[:length]
+            for permission_type, path in self.grants
+            for length in range(Page.steplen, len(path), Page.steplen)
+        }
+
+    def get_common_ancestor_path(self):
+        """
+        Return the path of the first common ancestor of the pages that the user has been
+        granted any permission on (see ``PageQuerySet.first_common_ancestor``), or an empty
+        string if they have no common ancestor
+        """
+        from wagtail.core.models import Page
+
+        common_path = posixpath.commonprefix(
+            [path[: -Page.steplen] for permission_type, path in self.grants]
+        )
+        return common_path[: len(common_path) - len(common_path) % Page.steplen]
+
+    def get_filter(self, *permission_types, field_name="path"):
+        """
+        Return a Q object matching the pages in the subtrees where the user has any of
+        the given permission types, or None if there are none
+        """
+        paths = self.get_paths(*permission_types)
+        if not paths:
+            return None
+        return reduce(or_, [Q(**{field_name + "__startswith": path}) for path in paths])
+
+
+def get_page_permissions_generation():
+    generation = cache.get(PAGE_PERMISSIONS_GENERATION_CACHE_KEY)
+    if generation is None:
+        cache.add(PAGE_PERMISSIONS_GENERATION_CACHE_KEY, uuid.uuid4().hex, None)
+        generation = cache.get(PAGE_PERMISSIONS_GENERATION_CACHE_KEY)
+    return generation
+
+
+def _bump_page_permissions_generation():
+    cache.set(PAGE_PERMISSIONS_GENERATION_CACHE_KEY, uuid.uuid4().hex, None)
+
+
+def invalidate_page_permission_summaries():
+    """
+    Discard the cached page permission summaries of all users. This happens immediately and
+    again once the current transaction commits, so that summaries built from the old
+    permissions in the meantime are not used.
+    """
+    if getattr(settings, "WAGTAIL_PAGE_PERMISSION_CACHE_ENABLED", False):
+        _bump_page_permissions_generation()
+        transaction.on_commit(_bump_page_permissions_generation)
+
+
+def get_page_permission_summary(user):
+    """
+    Return a PagePermissionSummary of the page permissions granted to the given user's
+    groups. If WAGTAIL_PAGE_PERMISSION_CACHE_ENABLED is set, the permissions are cached
+    until any group's page permissions, any user's groups or the page tree change.
+    """
+    from wagtail.core.models import GroupPagePermission
+
+    def get_grants():
+        return list(
+            GroupPagePermission.objects.filter(group__user=user).values_list(
+                "permission_type", "page__path"
+            )
+        )
+
+    if not getattr(settings, "WAGTAIL_PAGE_PERMISSION_CACHE_ENABLED", False):
+        return PagePermissionSummary(get_grants())
+
+    cache_key = "%s:%s:%s" % (
+        PAGE_PERMISSION_SUMMARY_CACHE_KEY_PREFIX,
+        get_page_permissions_generation(),
+        user.pk,
+    )
+    grants = cache.get(cache_key)
+    if grants is None:
+        grants = get_grants()
+        cache.set(cache_key, grants)
+
+    return PagePermissionSummary(grants)
@@ -0,0 +1,144 @@
+import itertools
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.urls import get_script_prefix, get_urlconf
+from django.utils import translation
+
+_fingerprints = itertools.count()
+
+# Returned by PageURLCache.get() for missing keys, as None is a valid result
+NOT_CACHED = object()
+
+
+class SiteRootPathIndex:
+    """
+    A trie of site root paths, keyed by URL path segment, used to find the root paths of all
+    sites that a page belongs to without testing every root path against its url_path.
+
+    Lookups return root paths in the same order as the list the index was built from
+    (i.e. the order of ``Site.get_site_root_paths()``, most specific path first).
+    """
+
+    def __init__(self, site_root_paths):
+        self.site_root_paths = tuple(site_root_paths)
+
+        # Each node is a dict of child nodes keyed by path segment; the None key holds the
+        # positions of the root paths that end at that node
+        self.root = {}
+        for position, site_root_path in enumerate(self.site_root_paths):
+            node = self.root
+            for segment in self.get_segments(site_root_path.root_path):
+                node = node.setdefault(segment, {})
+            node.setdefault(None, []).append(position)
+
+        # Identifies this set of site root paths in PageURLCache keys
+        self.fingerprint = next(_fingerprints)
+
+    @staticmethod
+    def get_segments(path):
+        return [segment for segment in path.split("/") if segment]
+
+    def get_relevant_site_root_paths(self, url_path):
+        """
+        Return a tuple of the site root paths that url_path starts with
+        """
+        node = self.root
+        positions = list(node.get(None, ()))
+
+        for segment in self.get_segments(url_path):
+            node = node.get(segment)
+            if node is None:
+                break
+            positions.extend(node.get(None, ()))
+
+        positions.sort()
+        return tuple(self.site_root_paths[position] for position in positions)
+
+
+_site_root_path_index = None
+
+
+def get_site_root_path_index(site_root_paths):
+    """
+    Return a SiteRootPathIndex for the given site root paths, reusing the one built for the
+    previous call if the site root paths haven't changed since.
+    """
+    global _site_root_path_index
+
+    index = _site_root_path_index
+    if index is None or index.site_root_paths != tuple(site_root_paths):
+        index = SiteRootPathIndex(site_root_paths)
+        _site_root_path_index = index
+
+    return index
+
+
+class PageURLCache:
+    """
+    A bounded, least-recently-used mapping of the inputs of ``Page.get_url_parts()`` to its
+    result.
+
+    The URL parts of a page only depend on its url_path, the site root paths, the site being
+    served, the active language and the URL configuration, all of which are part of the key.
+    Moving a page or changing its slug gives it a new url_path (and so a new key), and any
+    change to the sites gives a new set of site root paths, so entries never need to be
+    invalidated; stale ones simply stop being used and fall out of the cache.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_key(self, url_path, site_root_path_index, site_id):
+        return (
+            url_path,
+            site_root_path_index.fingerprint,
+            site_id,
+            translation.get_language(),
+            get_urlconf(settings.ROOT_URLCONF),
+            get_script_prefix(),
+        )
+
+    def get(self, key):
+        with self._lock:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                return NOT_CACHED
+            return self._entries[key]
+
+    def set(self, key, url_parts):
+        with self._lock:
+            self._entries[key] = url_parts
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_page_url_cache = None
+_page_url_cache_lock = threading.Lock()
+
+
+def get_page_url_cache():
+    """
+    Return the PageURLCache for this process, or None if WAGTAIL_PAGE_URL_CACHE_ENABLED
+    is not set
+    """
+    global _page_url_cache
+
+    if not getattr(settings, "WAGTAIL_PAGE_URL_CACHE_ENABLED", False):
+        return None
+
+    with _page_url_cache_lock:
+        if _page_url_cache is None:
+            _page_url_cache = PageURLCache(
+                getattr(settings, "WAGTAIL_PAGE_URL_CACHE_SIZE", 10000)
+            )
+        return _page_url_cache
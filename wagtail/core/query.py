@@ -4,12 +4,13 @@ from collections import defaultdict
 
 from django.apps import apps
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import CharField, Prefetch, Q
+from django.db.models import CharField, Model, Prefetch, Q
 from django.db.models.expressions import Exists, OuterRef
 from django.db.models.functions import Length, Substr
 from django.db.models.query import BaseIterable, ModelIterable
 from treebeard.mp_tree import MP_NodeQuerySet
 
+from wagtail.core.blocks.stream_block import StreamValue, prefetch_stream_values
 from wagtail.core.models.sites import Site
 from wagtail.search.queryset import SearchableQuerySetMixin
 
@@ -144,13 +145,26 @@ class PageQuerySet(SearchableQuerySetMixin, TreeQuerySet):
         super().__init__(*args, **kwargs)
         # set by defer_streamfields()
         self._defer_streamfields = False
+        # set by prefetch_stream_blocks()
+        self._prefetch_stream_blocks = None
+        self._prefetch_stream_blocks_done = False
 
     def _clone(self):
         """Ensure clones inherit custom attribute values."""
         clone = super()._clone()
         clone._defer_streamfields = self._defer_streamfields
+        clone._prefetch_stream_blocks = self._prefetch_stream_blocks
         return clone
 
+    def _fetch_all(self):
+        super()._fetch_all()
+        if (
+            self._prefetch_stream_blocks is not None
+            and not self._prefetch_stream_blocks_done
+        ):
+            prefetch_stream_blocks(self._result_cache, *self._prefetch_stream_blocks)
+            self._prefetch_stream_blocks_done = True
+
     def live_q(self):
         return Q(live=True)
 
@@ -381,6 +395,19 @@ class PageQuerySet(SearchableQuerySetMixin, TreeQuerySet):
             return clone
         return clone.defer(*streamfield_names)
 
+    def prefetch_stream_blocks(self, *field_names):
+        """
+        Apply to a queryset to convert the StreamField values of all the results to native
+        values in bulk on evaluation, so that the database lookups made by chooser blocks
+        (such as ImageChooserBlock) are batched into one query per block type across all the
+        pages, rather than one or more per page. Usually combined with ``specific()``.
+
+        If no field names are given, all StreamFields of each page are prefetched.
+        """
+        clone = self._clone()
+        clone._prefetch_stream_blocks = field_names
+        return clone
+
     def specific(self, defer=False):
         """
         This efficiently gets all the specific pages for the queryset, using
@@ -480,6 +507,33 @@ class PageQuerySet(SearchableQuerySetMixin, TreeQuerySet):
         )
 
 
+def prefetch_stream_blocks(objects, *field_names):
+    """
+    Convert the StreamField values of all the given model instances to native values in
+    bulk (see ``PageQuerySet.prefetch_stream_blocks``). If no field names are given, all
+    StreamFields of each instance are converted. Deferred fields are skipped.
+    """
+    from wagtail.core.fields import StreamField
+
+    stream_values = []
+    for obj in objects:
+        if not isinstance(obj, Model):
+            continue
+
+        for field in obj._meta.concrete_fields:
+            if not isinstance(field, StreamField):
+                continue
+            if field_names and field.name not in field_names:
+                continue
+
+            # Reading a deferred field would load it with an extra query
+            value = obj.__dict__.get(field.attname)
+            if isinstance(value, StreamValue):
+                stream_values.append(value)
+
+    prefetch_stream_values(stream_values)
+
+
 def specific_iterator(qs, defer=False):
     """
     This efficiently iterates all the specific pages in a queryset, using
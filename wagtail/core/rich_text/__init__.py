@@ -1,5 +1,6 @@
 import re
 from html import unescape
+from typing import List, Optional
 
 from django.db.models import Model
 from django.template.loader import render_to_string
@@ -38,13 +39,25 @@ def expand_db_html(html):
                     {
                         linktype: handler.expand_db_attributes
                         for linktype, handler in link_rules.items()
-                    }
+                    },
+                    {
+                        linktype: handler.expand_db_attributes_many
+                        for linktype, handler in link_rules.items()
+                        # Handlers that don't subclass EntityHandler may not have this
+                        if hasattr(handler, "expand_db_attributes_many")
+                    },
                 ),
                 EmbedRewriter(
                     {
                         embedtype: handler.expand_db_attributes
                         for embedtype, handler in embed_rules.items()
-                    }
+                    },
+                    {
+                        embedtype: handler.expand_db_attributes_many
+                        for embedtype, handler in embed_rules.items()
+                        # Handlers that don't subclass EntityHandler may not have this
+                        if hasattr(handler, "expand_db_attributes_many")
+                    },
                 ),
             ]
         )
@@ -115,6 +128,23 @@ class EntityHandler:
         model = cls.get_model()
         return model._default_manager.get(id=attrs["id"])
 
+    @classmethod
+    def get_many(cls, attrs_list: List[dict]) -> List[Optional[Model]]:
+        """
+        Fetch the instances referenced by each dict of attributes in a single query.
+        Returns a list in the same order as attrs_list, with None for any instance that
+        does not exist.
+        """
+        model = cls.get_model()
+        instance_ids = [attrs.get("id") for attrs in attrs_list]
+        instances_by_id = model._default_manager.in_bulk(
+            [id for id in instance_ids if id]
+        )
+        instances_by_str_id = {
+            str(pk): instance for pk, instance in instances_by_id.items()
+        }
+        return [instances_by_str_id.get(str(id)) for id in instance_ids]
+
     @staticmethod
     def expand_db_attributes(attrs: dict) -> str:
         """
@@ -123,6 +153,15 @@ class EntityHandler:
         """
         raise NotImplementedError
 
+    @classmethod
+    def expand_db_attributes_many(cls, attrs_list: List[dict]) -> List[str]:
+        """
+        Given a list of attribute dicts from entity tags of this type, returns a list of
+        real HTML representations in the same order. Override this to fetch all referenced
+        objects at once, rather than one at a time through expand_db_attributes.
+        """
+        return [cls.expand_db_attributes(attrs) for attrs in attrs_list]
+
 
 class LinkHandler(EntityHandler):
     pass
@@ -1,6 +1,6 @@
 from django.utils.html import escape
 
-from wagtail.core.models import Page
+from wagtail.core.models import Locale, Page, Site
 from wagtail.core.rich_text import LinkHandler
 
 
@@ -15,10 +15,91 @@ class PageLinkHandler(LinkHandler):
     def get_instance(cls, attrs):
         return super().get_instance(attrs).specific
 
+    @classmethod
+    def get_many(cls, attrs_list):
+        # Fetch the specific pages with one query per page type, rather than one
+        # query per page followed by another for .specific
+        page_ids = [attrs.get("id") for attrs in attrs_list]
+        pages = (
+            Page.objects.filter(id__in=[id for id in page_ids if id])
+            .defer_streamfields()
+            .specific()
+        )
+        pages_by_str_id = {str(page.id): page for page in pages}
+        return [pages_by_str_id.get(str(id)) for id in page_ids]
+
+    @classmethod
+    def get_localized_many(cls, pages):
+        """
+        Equivalent to [page.localized for page in pages], but fetches all translations
+        into the active locale with a single query.
+        """
+        try:
+            locale = Locale.get_active()
+        except (LookupError, Locale.DoesNotExist):
+            return pages
+
+        translation_keys = {
+            page.translation_key
+            for page in pages
+            if page is not None and page.locale_id != locale.id
+        }
+        if not translation_keys:
+            return pages
+
+        # As with Page.localized, only live translations are used
+        translations = (
+            Page.objects.filter(
+                translation_key__in=translation_keys, locale=locale, live=True
+            )
+            .defer_streamfields()
+            .specific()
+        )
+        translations_by_key = {
+            translation.translation_key: translation for translation in translations
+        }
+        return [
+            translations_by_key.get(page.translation_key, page)
+            if page is not None
+            else None
+            for page in pages
+        ]
+
+    @classmethod
+    def expand_page(cls, page):
+        """
+        Return the opening <a> tag for a link to the given (localized, specific) page
+        """
+        return '<a href="%s">' % escape(page.url)
+
     @classmethod
     def expand_db_attributes(cls, attrs):
         try:
             page = cls.get_instance(attrs)
-            return '<a href="%s">' % escape(page.localized.specific.url)
+            return cls.expand_page(page.localized.specific)
         except Page.DoesNotExist:
             return "<a>"
+
+    @classmethod
+    def expand_db_attributes_many(cls, attrs_list):
+        if (
+            cls.expand_db_attributes.__func__
+            is not PageLinkHandler.expand_db_attributes.__func__
+        ):
+            # Respect subclasses that customise how each link is expanded
+            return super().expand_db_attributes_many(attrs_list)
+
+        pages = cls.get_localized_many(cls.get_many(attrs_list))
+
+        # Share a single copy of the site root paths between all pages, rather than
+        # having each page look them up from the cache
+        site_root_paths = Site.get_site_root_paths()
+
+        results = []
+        for page in pages:
+            if page is None:
+                results.append("<a>")
+                continue
+            page._wagtail_cached_site_root_paths = site_root_paths
+            results.append(cls.expand_page(page))
+        return results
@@ -25,75 +25,161 @@ def extract_attrs(attr_string):
     return attributes
 
 
-class EmbedRewriter:
+class TagRewriter:
+    """
+    Base class for rewriters that replace tags matched by a regular expression. Rewriting
+    happens in two passes: all matched tags are collected and grouped by their type first,
+    so that a bulk rule for that type can expand every tag of that type at once (for example,
+    to fetch all referenced objects from the database in a single query); the resulting
+    HTML fragments are then substituted back into the string.
+
+    Subclasses must define `tag_pattern` and implement `get_tag_type_from_attrs`.
+    """
+
+    tag_pattern = None
+
+    def __init__(self, rules=None, bulk_rules=None):
+        self.rules = rules or {}
+        self.bulk_rules = bulk_rules or {}
+
+    def get_tag_type_from_attrs(self, attrs):
+        """
+        Return the type of the tag with the given attributes, or None if it has no type
+        """
+        raise NotImplementedError
+
+    def get_tag_replacements(self, tag_type, attrs_list):
+        """
+        Return a list of HTML fragments, one for each set of attributes in attrs_list, for
+        tags of the given type
+        """
+        if tag_type in self.bulk_rules:
+            return self.bulk_rules[tag_type](attrs_list)
+        try:
+            rule = self.rules[tag_type]
+        except KeyError:
+            return [
+                self.get_unknown_tag_replacement(tag_type, attrs)
+                for attrs in attrs_list
+            ]
+        return [rule(attrs) for attrs in attrs_list]
+
+    def get_unknown_tag_replacement(self, tag_type, attrs):
+        return ""
+
+    def extract_tags(self, html):
+        """
+        Return a dict mapping each tag type to a list of (match, attrs) tuples for the tags of
+        that type within html. Tags that should be left untouched are omitted.
+        """
+        tags_by_type = {}
+        for match in self.tag_pattern.finditer(html):
+            attrs = extract_attrs(match.group(1))
+            tag_type = self.get_tag_type_from_attrs(attrs)
+            tags_by_type.setdefault(tag_type, []).append((match, attrs))
+        return tags_by_type
+
+    def __call__(self, html):
+        tags_by_type = self.extract_tags(html)
+        if not tags_by_type:
+            return html
+
+        replacements = []
+        for tag_type, tags in tags_by_type.items():
+            fragments = self.get_tag_replacements(
+                tag_type, [attrs for match, attrs in tags]
+            )
+            for (match, attrs), fragment in zip(tags, fragments):
+                replacements.append((match, fragment))
+
+        replacements.sort(key=lambda replacement: replacement[0].start())
+
+        offset = 0
+        result = []
+        for match, fragment in replacements:
+            result.append(html[offset : match.start()])
+            result.append(match.group(0) if fragment is None else fragment)
+            offset = match.end()
+        result.append(html[offset:])
+        return "".join(result)
+
+
+class EmbedRewriter(TagRewriter):
     """
     Rewrites <embed embedtype="foo" /> tags within rich text into the HTML fragment given by the
     embed rule for 'foo'. Each embed rule is a function that takes a dict of attributes and
     returns the HTML fragment.
+
+    Rules may also be supplied in bulk form through `bulk_rules`: functions that take a list of
+    attribute dicts and return a list of HTML fragments, in the same order.
     """
 
-    def __init__(self, embed_rules):
+    tag_pattern = FIND_EMBED_TAG
+
+    def __init__(self, embed_rules, bulk_rules=None):
+        super().__init__(embed_rules, bulk_rules)
         self.embed_rules = embed_rules
 
+    def get_tag_type_from_attrs(self, attrs):
+        return attrs.get("embedtype")
+
     def replace_tag(self, match):
         attrs = extract_attrs(match.group(1))
-        try:
-            rule = self.embed_rules[attrs["embedtype"]]
-        except KeyError:
-            # silently drop any tags with an unrecognised or missing embedtype attribute
-            return ""
-        return rule(attrs)
+        tag_type = self.get_tag_type_from_attrs(attrs)
+        return self.get_tag_replacements(tag_type, [attrs])[0]
 
-    def __call__(self, html):
-        return FIND_EMBED_TAG.sub(self.replace_tag, html)
 
-
-class LinkRewriter:
+class LinkRewriter(TagRewriter):
     """
     Rewrites <a linktype="foo"> tags within rich text into the HTML fragment given by the
     rule for 'foo'. Each link rule is a function that takes a dict of attributes and
     returns the HTML fragment for the opening tag (only).
+
+    Rules may also be supplied in bulk form through `bulk_rules`: functions that take a list of
+    attribute dicts and return a list of HTML fragments, in the same order.
     """
 
-    def __init__(self, link_rules):
+    tag_pattern = FIND_A_TAG
+
+    def __init__(self, link_rules, bulk_rules=None):
+        super().__init__(link_rules, bulk_rules)
         self.link_rules = link_rules
 
-    def replace_tag(self, match):
-        attrs = extract_attrs(match.group(1))
+    def get_tag_type_from_attrs(self, attrs):
         try:
-            link_type = attrs["linktype"]
+            return attrs["linktype"]
         except KeyError:
-            link_type = None
             href = attrs.get("href", None)
             if href:
                 # From href attribute we try to detect only the linktypes that we
                 # currently support (`external` & `email`, `page` has a default handler)
                 # from the link chooser.
                 if href.startswith(("http:", "https:")):
-                    link_type = "external"
+                    return "external"
                 elif href.startswith("mailto:"):
-                    link_type = "email"
+                    return "email"
                 elif href.startswith("#"):
-                    link_type = "anchor"
-
-            if not link_type:
-                # otherwise return ordinary links without a linktype unchanged
-                return match.group(0)
+                    return "anchor"
+
+    def get_tag_replacements(self, tag_type, attrs_list):
+        if tag_type is None:
+            # return ordinary links without a linktype unchanged
+            return [None] * len(attrs_list)
+        return super().get_tag_replacements(tag_type, attrs_list)
+
+    def get_unknown_tag_replacement(self, tag_type, attrs):
+        if tag_type in ["email", "external", "anchor"]:
+            # If no rule is registered for supported types
+            # return ordinary links without a linktype unchanged
+            return None
+        # unrecognised link type
+        return "<a>"
 
-        try:
-            rule = self.link_rules[link_type]
-        except KeyError:
-            if link_type in ["email", "external", "anchor"]:
-                # If no rule is registered for supported types
-                # return ordinary links without a linktype unchanged
-                return match.group(0)
-            # unrecognised link type
-            return "<a>"
-
-        return rule(attrs)
-
-    def __call__(self, html):
-        return FIND_A_TAG.sub(self.replace_tag, html)
+    def replace_tag(self, match):
+        attrs = extract_attrs(match.group(1))
+        tag_type = self.get_tag_type_from_attrs(attrs)
+        fragment = self.get_tag_replacements(tag_type, [attrs])[0]
+        return match.group(0) if fragment is None else fragment
 
 
 class MultiRuleRewriter:
@@ -1,21 +1,34 @@
 import logging
 
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
 from django.core.cache import cache
-from django.db.models.signals import post_delete, post_save, pre_delete
-
-from wagtail.core.models import Locale, Page, Site
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+
+from wagtail.core.models import GroupPagePermission, Locale, Page, Site
+from wagtail.core.page_cache import invalidate_page_response_cache
+from wagtail.core.page_permissions import invalidate_page_permission_summaries
+from wagtail.core.signals import page_published, page_unpublished, post_page_move
+from wagtail.core.sites import invalidate_site_routing_table
 from wagtail.core.utils import get_locales_display_names
 
 logger = logging.getLogger("wagtail.core")
 
 
 # Clear the wagtail_site_root_paths from the cache whenever Site records are updated.
+# The site routing table is invalidated immediately (for the current process) and again
+# once the transaction commits, so that other processes cannot rebuild it from stale data.
 def post_save_site_signal_handler(instance, update_fields=None, **kwargs):
     cache.delete("wagtail_site_root_paths")
+    invalidate_site_routing_table()
+    transaction.on_commit(invalidate_site_routing_table)
 
 
 def post_delete_site_signal_handler(instance, **kwargs):
     cache.delete("wagtail_site_root_paths")
+    invalidate_site_routing_table()
+    transaction.on_commit(invalidate_site_routing_table)
 
 
 def pre_delete_page_unpublish(sender, instance, **kwargs):
@@ -33,6 +46,17 @@ def reset_locales_display_names_cache(sender, instance, **kwargs):
     get_locales_display_names.cache_clear()
 
 
+# Discard cached responses for a page whenever its live content changes
+def page_live_content_changed_signal_handler(instance, **kwargs):
+    invalidate_page_response_cache(instance)
+
+
+# Discard cached page permission summaries whenever the page permissions granted to any
+# user could have changed (including through pages moving, which changes their paths)
+def page_permissions_changed_signal_handler(**kwargs):
+    invalidate_page_permission_summaries()
+
+
 def register_signal_handlers():
     post_save.connect(post_save_site_signal_handler, sender=Site)
     post_delete.connect(post_delete_site_signal_handler, sender=Site)
@@ -40,5 +64,21 @@ def register_signal_handlers():
     pre_delete.connect(pre_delete_page_unpublish, sender=Page)
     post_delete.connect(post_delete_page_log_deletion, sender=Page)
 
+    page_published.connect(page_live_content_changed_signal_handler)
+    page_unpublished.connect(page_live_content_changed_signal_handler)
+
+    post_save.connect(
+        page_permissions_changed_signal_handler, sender=GroupPagePermission
+    )
+    post_delete.connect(
+        page_permissions_changed_signal_handler, sender=GroupPagePermission
+    )
+    post_delete.connect(page_permissions_changed_signal_handler, sender=Group)
+    m2m_changed.connect(
+        page_permissions_changed_signal_handler,
+        sender=get_user_model().groups.through,
+    )
+    post_page_move.connect(page_permissions_changed_signal_handler)
+
     post_save.connect(reset_locales_display_names_cache, sender=Locale)
     post_delete.connect(reset_locales_display_names_cache, sender=Locale)
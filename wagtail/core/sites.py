@@ -1,5 +1,9 @@
+import uuid
+
 from django.apps import apps
+from django.core.cache import cache
 from django.db.models import Case, IntegerField, Q, When
+from django.db.models.functions import Lower
 
 MATCH_HOSTNAME_PORT = 0
 MATCH_HOSTNAME_DEFAULT = 1
@@ -50,3 +54,129 @@ def get_site_for_hostname(hostname, port):
             return sites[len(sites) == 2]
 
     raise Site.DoesNotExist()
+
+
+SITE_ROUTING_TABLE_GENERATION_CACHE_KEY = "wagtail_site_routing_table_generation"
+
+
+class SiteRoutingTable:
+    """
+    A process-local lookup table of all Site records, used to resolve a hostname / port
+    combination to a Site without querying the database.
+
+    The table stores raw field values for each site (and its root page) rather than model
+    instances, so that every lookup returns fresh objects that are safe to mutate or
+    annotate for the duration of a single request.
+    """
+
+    def __init__(self, generation, site_rows, root_page_rows):
+        self.generation = generation
+        self.site_rows = site_rows
+        self.root_page_rows = root_page_rows
+
+        self.sites_by_hostname = {}
+        self.default_site_id = None
+        for site_id, values in site_rows.items():
+            self.sites_by_hostname.setdefault(values["hostname"], []).append(site_id)
+            if values["is_default_site"]:
+                self.default_site_id = site_id
+
+    @classmethod
+    def build(cls, generation):
+        Site = apps.get_model("wagtailcore.Site")
+        Page = apps.get_model("wagtailcore.Page")
+
+        site_fields = [field.attname for field in Site._meta.concrete_fields]
+        page_fields = [field.attname for field in Page._meta.concrete_fields]
+
+        site_rows = {}
+        for values in Site.objects.order_by(Lower("hostname")).values(*site_fields):
+            site_rows[values["id"]] = values
+
+        root_page_rows = {}
+        root_page_ids = {values["root_page_id"] for values in site_rows.values()}
+        for values in Page.objects.filter(id__in=root_page_ids).values(*page_fields):
+            root_page_rows[values["id"]] = values
+
+        return cls(generation, site_rows, root_page_rows)
+
+    def _make_site(self, site_id):
+        Site = apps.get_model("wagtailcore.Site")
+        Page = apps.get_model("wagtailcore.Page")
+
+        site_values = self.site_rows[site_id]
+        site = Site.from_db(None, list(site_values.keys()), list(site_values.values()))
+
+        root_page_values = self.root_page_rows.get(site_values["root_page_id"])
+        if root_page_values is not None:
+            # Mirror the select_related("root_page") of get_site_for_hostname
+            site.root_page = Page.from_db(
+                None, list(root_page_values.keys()), list(root_page_values.values())
+            )
+
+        return site
+
+    def get_site_for_hostname(self, hostname, port):
+        """
+        Return the Site for the given hostname and port, following the same rules as
+        get_site_for_hostname. Raises Site.DoesNotExist if no site matches.
+        """
+        Site = apps.get_model("wagtailcore.Site")
+
+        # request.get_port() returns a string, which the database would coerce for us
+        try:
+            port = int(port)
+        except (TypeError, ValueError):
+            pass
+
+        hostname_matches = self.sites_by_hostname.get(hostname, [])
+
+        for site_id in hostname_matches:
+            if self.site_rows[site_id]["port"] == port:
+                return self._make_site(site_id)
+
+        if self.default_site_id in hostname_matches:
+            return self._make_site(self.default_site_id)
+
+        if len(hostname_matches) == 1:
+            return self._make_site(hostname_matches[0])
+
+        if self.default_site_id is not None:
+            return self._make_site(self.default_site_id)
+
+        raise Site.DoesNotExist()
+
+
+_site_routing_table = None
+
+
+def get_site_routing_table():
+    """
+    Return the SiteRoutingTable for the current process, rebuilding it if the generation
+    stored in the cache shows that Site records have changed since it was built.
+    """
+    global _site_routing_table
+
+    generation = cache.get(SITE_ROUTING_TABLE_GENERATION_CACHE_KEY)
+    if generation is None:
+        # Nothing in the cache yet (or it was evicted); start a new generation. Use add()
+        # so that concurrent workers all settle on the same value.
+        cache.add(SITE_ROUTING_TABLE_GENERATION_CACHE_KEY, uuid.uuid4().hex, None)
+        generation = cache.get(SITE_ROUTING_TABLE_GENERATION_CACHE_KEY)
+
+    table = _site_routing_table
+    if table is None or generation is None or table.generation != generation:
+        table = SiteRoutingTable.build(generation)
+        _site_routing_table = table
+
+    return table
+
+
+def invalidate_site_routing_table():
+    """
+    Force all processes to rebuild their SiteRoutingTable on their next lookup.
+    """
+    global _site_routing_table
+
+    _site_routing_table = None
+    cache.set(SITE_ROUTING_TABLE_GENERATION_CACHE_KEY, uuid.uuid4().hex, None)
@@ -4,13 +4,16 @@ import collections
 import json
 import unittest
 from decimal import Decimal
+from unittest import mock
 
 # non-standard import name for gettext_lazy, to prevent strings from being picked up for translation
 from django import forms
+from django.core.cache import caches
 from django.core.exceptions import ValidationError
 from django.forms.utils import ErrorList
+from django.template import Context, Template
 from django.template.loader import render_to_string
-from django.test import SimpleTestCase, TestCase
+from django.test import SimpleTestCase, TestCase, override_settings
 from django.utils.safestring import SafeData, mark_safe
 from django.utils.translation import gettext_lazy as __
 
@@ -4947,3 +4950,113 @@ class TestOverriddenGetTemplateBlockTag(TestCase):
         )
         template = block.get_template()
         self.assertEqual(template, block.my_new_template)
+
+
+class CachedHeadingBlock(blocks.CharBlock):
+    class Meta:
+        cache = True
+        cache_vary_on = ["language"]
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+        "blocks": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    },
+    WAGTAIL_BLOCK_CACHE_ALIAS="blocks",
+)
+class TestBlockRenderCache(SimpleTestCase):
+    def setUp(self):
+        self.block = blocks.StreamBlock(
+            [
+                ("heading", CachedHeadingBlock()),
+                ("paragraph", blocks.CharBlock()),
+            ]
+        )
+        self.addCleanup(caches["blocks"].clear)
+
+    def get_stream_value(self, heading="Hello", block_id="0001"):
+        return self.block.to_python(
+            [
+                {"type": "heading", "value": heading, "id": block_id},
+                {"type": "paragraph", "value": "World", "id": "0002"},
+            ]
+        )
+
+    def test_render_is_cached(self):
+        value = self.get_stream_value()
+        self.assertEqual(value[0].render(), "Hello")
+
+        with mock.patch.object(CachedHeadingBlock, "render") as render:
+            self.assertEqual(self.get_stream_value()[0].render(), "Hello")
+            self.assertEqual(
+                self.get_stream_value()[0].render_as_block(context={}), "Hello"
+            )
+
+        render.assert_not_called()
+
+    def test_cached_plain_text_is_not_marked_safe(self):
+        value = self.get_stream_value(heading="<script>alert(1)</script>")
+        uncached = value[0].render()
+        cached = self.get_stream_value(heading="<script>alert(1)</script>")[0].render()
+
+        self.assertNotIsInstance(uncached, SafeData)
+        self.assertNotIsInstance(cached, SafeData)
+        self.assertEqual(
+            Template("{{ block }}").render(Context({"block": cached})),
+            "&lt;script&gt;alert(1)&lt;/script&gt;",
+        )
+
+    def test_cached_safe_html_is_marked_safe(self):
+        with mock.patch.object(
+            CachedHeadingBlock, "render", return_value=mark_safe("<h2>Hello</h2>")
+        ):
+            self.get_stream_value()[0].render()
+
+        cached = self.get_stream_value()[0].render()
+        self.assertIsInstance(cached, SafeData)
+        self.assertEqual(cached, "<h2>Hello</h2>")
+
+    def test_blocks_without_cache_are_not_cached(self):
+        self.get_stream_value()[1].render()
+        self.assertEqual(self.get_stream_value()[1].render(), "World")
+
+        with mock.patch.object(
+            blocks.CharBlock, "render", return_value="Rendered"
+        ) as render:
+            self.assertEqual(self.get_stream_value()[1].render(), "Rendered")
+
+        render.assert_called_once()
+
+    def test_changed_value_is_rendered(self):
+        self.get_stream_value()[0].render()
+        self.assertEqual(
+            self.get_stream_value(heading="Goodbye")[0].render(), "Goodbye"
+        )
+
+    def test_cache_key(self):
+        child = self.get_stream_value()[0]
+        self.assertEqual(child.get_cache_key(), child.get_cache_key({}))
+        self.assertNotEqual(
+            child.get_cache_key(),
+            self.get_stream_value(block_id="0003")[0].get_cache_key(),
+        )
+        self.assertNotEqual(
+            child.get_cache_key({"language": "en"}),
+            child.get_cache_key({"language": "fr"}),
+        )
+        # Context variables that aren't declared in cache_vary_on don't affect the key
+        self.assertEqual(
+            child.get_cache_key({"language": "en", "page": "Home"}),
+            child.get_cache_key({"language": "en", "page": "About"}),
+        )
+
+    def test_blocks_without_id_are_not_cached(self):
+        value = self.get_stream_value(block_id=None)
+        value[0].render()
+        self.assertFalse(caches["blocks"]._cache)
+
+    @override_settings(WAGTAIL_BLOCK_CACHE_ALIAS="default")
+    def test_cache_alias_setting(self):
+        self.get_stream_value()[0].render()
+        self.assertFalse(caches["blocks"]._cache)
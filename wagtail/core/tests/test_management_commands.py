@@ -4,11 +4,13 @@ from unittest import mock
 
 from django.contrib.auth import get_user_model
 from django.core import management
-from django.db import models
+from django.db import connection, models
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
-from wagtail.core.models import Collection, Page, PageLogEntry, PageRevision
+from wagtail.core.management.commands.purge_revisions import purge_revisions
+from wagtail.core.models import Collection, Comment, Page, PageLogEntry, PageRevision
 from wagtail.core.signals import page_published, page_unpublished
 from wagtail.tests.testapp.models import EventPage, SecretPage, SimplePage
 
@@ -118,6 +120,17 @@ class TestFixTreeCommand(TestCase):
         # Check that christmas_page has been deleted
         self.assertFalse(Page.objects.filter(id=christmas_page.id).exists())
 
+    def test_fixes_url_paths(self):
+        christmas_page = Page.objects.get(slug="christmas")
+        Page.objects.filter(id=christmas_page.id).update(url_path="/wrong/")
+
+        output = self.run_command().read()
+
+        self.assertIn("Incorrect url_path value found for 1 page; fixed.", output)
+        self.assertEqual(
+            Page.objects.get(id=christmas_page.id).url_path, "/home/events/christmas/"
+        )
+
     def test_remove_path_holes(self):
         events_index = Page.objects.get(url_path="/home/events/")
         # Delete the event page in path position 0001
@@ -154,11 +167,85 @@ class TestSetUrlPathsCommand(TestCase):
     fixtures = ["test.json"]
 
     def run_command(self):
-        management.call_command("set_url_paths", stdout=StringIO())
+        output = StringIO()
+        management.call_command("set_url_paths", stdout=output)
+        return output.getvalue()
 
     def test_set_url_paths(self):
+        url_paths = dict(Page.objects.values_list("id", "url_path"))
+
+        output = self.run_command()
+
+        self.assertEqual(dict(Page.objects.values_list("id", "url_path")), url_paths)
+        self.assertIn("Updated url_path on 0 pages", output)
+
+    def test_fixes_incorrect_url_paths(self):
+        url_paths = dict(Page.objects.values_list("id", "url_path"))
+        Page.objects.filter(url_path__startswith="/home/events/").update(
+            url_path="/wrong/"
+        )
+        Page.objects.filter(depth=1).update(url_path="/wrong/")
+
+        output = self.run_command()
+
+        self.assertEqual(dict(Page.objects.values_list("id", "url_path")), url_paths)
+        self.assertIn(
+            "Updated url_path on %d pages"
+            % (Page.objects.filter(url_path__startswith="/home/events/").count() + 1),
+            output,
+        )
+
+    def test_fix_url_paths_for_subtree(self):
+        events_index = Page.objects.get(url_path="/home/events/")
+        about_us = Page.objects.get(url_path="/home/about-us/")
+        Page.objects.filter(url_path__startswith="/home/events/").update(
+            url_path="/wrong/"
+        )
+        Page.objects.filter(id=about_us.id).update(url_path="/wrong/")
+
+        updated_count = Page.fix_url_paths(root=events_index)
+
+        self.assertEqual(
+            updated_count,
+            Page.objects.descendant_of(events_index, inclusive=True).count(),
+        )
+        self.assertEqual(Page.objects.get(id=events_index.id).url_path, "/home/events/")
+        christmas_page = Page.objects.get(slug="christmas")
+        self.assertEqual(christmas_page.url_path, "/home/events/christmas/")
+        self.assertEqual(Page.objects.get(id=about_us.id).url_path, "/wrong/")
+
+    def test_orphans_are_left_alone(self):
+        christmas_page = Page.objects.get(slug="christmas")
+        # Delete the parent page without deleting its descendants
+        models.Model.delete(Page.objects.get(url_path="/home/events/"))
+        Page.objects.filter(id=christmas_page.id).update(url_path="/orphan/")
+
         self.run_command()
 
+        self.assertEqual(Page.objects.get(id=christmas_page.id).url_path, "/orphan/")
+
+    def test_query_count_does_not_depend_on_page_count(self):
+        def count_queries():
+            Page.objects.filter(depth__gt=1).update(url_path="/wrong/")
+            with CaptureQueriesContext(connection) as queries:
+                Page.fix_url_paths()
+            return len(queries)
+
+        query_count = count_queries()
+
+        events_index = Page.objects.get(url_path="/home/events/")
+        for i in range(10):
+            events_index.add_child(
+                instance=SimplePage(
+                    title="Event %d" % i, slug="event-%d" % i, content="hello"
+                )
+            )
+
+        self.assertEqual(count_queries(), query_count)
+        self.assertEqual(
+            Page.objects.get(slug="event-0").url_path, "/home/events/event-0/"
+        )
+
 
 class TestPublishScheduledPagesCommand(TestCase):
     def setUp(self):
@@ -346,6 +433,83 @@ class TestPublishScheduledPagesCommand(TestCase):
             PageRevision.objects.filter(page=p, submitted_for_moderation=True).exists()
         )
 
+    def test_revision_expire_at_follows_content(self):
+        expire_at = timezone.now() + timedelta(days=1)
+        page = SimplePage(
+            title="Hello world!",
+            slug="hello-world",
+            content="hello",
+            expire_at=expire_at,
+        )
+        self.root_page.add_child(instance=page)
+
+        revision = page.save_revision(submitted_for_moderation=True)
+        revision.refresh_from_db()
+        self.assertEqual(revision.expire_at, expire_at)
+
+        page.expire_at = None
+        revision = page.save_revision(submitted_for_moderation=True)
+        revision.refresh_from_db()
+        self.assertIsNone(revision.expire_at)
+
+    def test_future_expired_revision_stays_in_mod_queue(self):
+        page = SimplePage(
+            title="Hello world!",
+            slug="hello-world",
+            content="hello",
+            live=False,
+            expire_at=timezone.now() + timedelta(days=1),
+        )
+        self.root_page.add_child(instance=page)
+        page.save_revision(submitted_for_moderation=True)
+
+        management.call_command("publish_scheduled_pages")
+
+        self.assertTrue(
+            PageRevision.objects.filter(
+                page=page, submitted_for_moderation=True
+            ).exists()
+        )
+
+    def test_query_count_when_nothing_is_due(self):
+        page = SimplePage(
+            title="Hello world!",
+            slug="hello-world",
+            content="hello",
+            live=False,
+            expire_at=timezone.now() + timedelta(days=1),
+        )
+        self.root_page.add_child(instance=page)
+        page.save_revision(submitted_for_moderation=True)
+
+        # One query each for expired pages, expired revisions and revisions to publish
+        with self.assertNumQueries(3):
+            management.call_command("publish_scheduled_pages")
+
+    def test_search_index_updates_are_batched(self):
+        for i in range(3):
+            page = SimplePage(
+                title="Hello world %d" % i,
+                slug="hello-world-%d" % i,
+                content="hello",
+                live=True,
+                expire_at=timezone.now() - timedelta(days=1),
+            )
+            self.root_page.add_child(instance=page)
+
+        backend = mock.MagicMock()
+        with mock.patch(
+            "wagtail.search.queue.get_search_backends_with_name",
+            return_value=[("default", backend)],
+        ), self.captureOnCommitCallbacks(execute=True):
+            management.call_command("publish_scheduled_pages")
+
+        self.assertFalse(Page.objects.filter(slug__startswith="hello-world").live())
+        backend.add_bulk.assert_called_once()
+        model, objs = backend.add_bulk.call_args[0]
+        self.assertEqual(model, SimplePage)
+        self.assertEqual(len(objs), 3)
+
 
 class TestPurgeRevisionsCommand(TestCase):
     fixtures = ["test.json"]
@@ -443,6 +607,86 @@ class TestPurgeRevisionsCommand(TestCase):
         # revision is now older than 30 days, so should be deleted
         self.assertNotIn(old_revision, PageRevision.objects.filter(page=self.page))
 
+    def test_keep_option(self):
+        revisions = [self.page.save_revision() for i in range(5)]
+
+        management.call_command("purge_revisions", "--keep=3", stdout=StringIO())
+
+        self.assertEqual(
+            list(PageRevision.objects.filter(page=self.page).order_by("id")),
+            revisions[2:],
+        )
+
+    def test_keep_must_be_positive(self):
+        with self.assertRaises(management.CommandError):
+            management.call_command("purge_revisions", "--keep=0", stdout=StringIO())
+
+    def test_revisions_of_other_pages_are_not_counted(self):
+        other_page = self.root_page.add_child(
+            instance=SimplePage(title="Other page", slug="other-page", content="hello")
+        )
+        revision = self.page.save_revision()
+        other_page.save_revision()
+        other_page.save_revision()
+
+        self.run_command()
+
+        self.assertIn(revision, PageRevision.objects.filter(page=self.page))
+        self.assertEqual(PageRevision.objects.filter(page=other_page).count(), 1)
+
+    def test_latest_revision_is_found_by_creation_time(self):
+        newest_revision = self.page.save_revision()
+        older_revision = self.page.save_revision()
+        older_revision.created_at = newest_revision.created_at - timedelta(days=1)
+        older_revision.save()
+
+        self.run_command()
+
+        self.assertEqual(
+            list(PageRevision.objects.filter(page=self.page)), [newest_revision]
+        )
+
+    def test_chunked_deletion(self):
+        revisions = [self.page.save_revision() for i in range(10)]
+
+        stdout = StringIO()
+        management.call_command(
+            "purge_revisions", "--chunk-size=3", verbosity=2, stdout=stdout
+        )
+
+        self.assertEqual(
+            list(PageRevision.objects.filter(page=self.page)), [revisions[-1]]
+        )
+        self.assertIn("Deleted 9 revisions", stdout.getvalue())
+        self.assertIn("Successfully deleted 9 revisions", stdout.getvalue())
+
+    def test_query_count_does_not_depend_on_revision_count(self):
+        for i in range(20):
+            self.page.save_revision()
+
+        # One query for the ID range, and a fixed number to find and delete the
+        # revisions (with their related objects) in a single chunk
+        with self.assertNumQueries(8):
+            self.assertEqual(purge_revisions(), 19)
+
+    def test_comments_moved_to_next_remaining_revision(self):
+        user = get_user_model().objects.first()
+        revision_1 = self.page.save_revision()
+        comment = Comment.objects.create(
+            page=self.page,
+            user=user,
+            text="A comment",
+            contentpath="title",
+            revision_created=revision_1,
+        )
+        self.page.save_revision()
+        revision_3 = self.page.save_revision()
+
+        self.run_command()
+
+        comment.refresh_from_db()
+        self.assertEqual(comment.revision_created, revision_3)
+
 
 class TestCreateLogEntriesFromRevisionsCommand(TestCase):
     fixtures = ["test.json"]
@@ -0,0 +1,209 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.test import Client, TestCase, override_settings
+
+from wagtail.core import hooks
+from wagtail.core.models import Page
+from wagtail.core.page_cache import get_page_response_cache
+from wagtail.tests.testapp.models import EventPage
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "cache",
+    },
+    "pages": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "wagtail-page-cache-tests",
+    },
+}
+
+
+@override_settings(
+    CACHES=CACHES,
+    WAGTAIL_PAGE_CACHE_ENABLED=True,
+    WAGTAIL_PAGE_CACHE_ALIAS="pages",
+    WAGTAIL_PAGE_CACHE_TIMEOUT=60,
+)
+class TestPageResponseCache(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        caches["pages"].clear()
+        self.addCleanup(caches["pages"].clear)
+        self.christmas_page = EventPage.objects.get(url_path="/home/events/christmas/")
+
+    def assertServedFromCache(self, url, **extra):
+        with mock.patch.object(EventPage, "serve") as serve:
+            response = self.client.get(url, **extra)
+        serve.assert_not_called()
+        return response
+
+    def assertNotServedFromCache(self, url, **extra):
+        with mock.patch.object(
+            EventPage, "serve", autospec=True, side_effect=EventPage.serve
+        ) as serve:
+            response = self.client.get(url, **extra)
+        serve.assert_called_once()
+        return response
+
+    @override_settings(WAGTAIL_PAGE_CACHE_ENABLED=False)
+    def test_disabled_by_default(self):
+        self.assertIsNone(get_page_response_cache())
+
+    def test_serve_from_cache(self):
+        response = self.assertNotServedFromCache("/events/christmas/")
+        self.assertContains(response, "<h1>Christmas</h1>")
+
+        response = self.assertServedFromCache("/events/christmas/")
+        self.assertContains(response, "<h1>Christmas</h1>")
+
+    def test_cache_timeout_is_not_sent_to_clients(self):
+        with self.settings(WAGTAIL_PAGE_CACHE_ENABLED=False):
+            uncached_response = self.client.get("/events/christmas/")
+
+        for response in (
+            self.assertNotServedFromCache("/events/christmas/"),
+            self.assertServedFromCache("/events/christmas/"),
+        ):
+            self.assertEqual(
+                response.get("Cache-Control"), uncached_response.get("Cache-Control")
+            )
+            self.assertFalse(response.has_header("Expires"))
+
+    def test_hooks_still_run_on_cache_hits(self):
+        self.client.get("/events/christmas/")
+
+        def before_serve_page(page, request, serve_args, serve_kwargs):
+            return HttpResponse("Hooked")
+
+        with hooks.register_temporarily("before_serve_page", before_serve_page):
+            response = self.client.get("/events/christmas/")
+
+        self.assertEqual(response.content, b"Hooked")
+
+    def test_query_string_is_part_of_key(self):
+        self.client.get("/events/christmas/")
+        self.assertNotServedFromCache("/events/christmas/?page=2")
+
+    def test_vary_headers(self):
+        with self.settings(WAGTAIL_PAGE_CACHE_VARY_HEADERS=["X-Device"]):
+            self.client.get("/events/christmas/", HTTP_X_DEVICE="desktop")
+            self.assertServedFromCache("/events/christmas/", HTTP_X_DEVICE="desktop")
+            self.assertNotServedFromCache("/events/christmas/", HTTP_X_DEVICE="mobile")
+
+    def test_authenticated_users_are_not_cached(self):
+        user = get_user_model().objects.create_user(
+            username="visitor", email="visitor@example.com", password="password"
+        )
+        self.client.force_login(user)
+
+        self.assertNotServedFromCache("/events/christmas/")
+        self.assertNotServedFromCache("/events/christmas/")
+
+    def test_pages_with_view_restrictions_are_not_cached(self):
+        page_cache = get_page_response_cache()
+        restricted_page = Page.objects.get(url_path="/home/secret-plans/")
+
+        self.assertFalse(
+            page_cache.can_cache_response(restricted_page, HttpResponse("Secret"))
+        )
+        self.assertFalse(
+            page_cache.can_cache_response(
+                restricted_page.get_children().first(), HttpResponse("Secret")
+            )
+        )
+        self.assertTrue(
+            page_cache.can_cache_response(self.christmas_page, HttpResponse("Public"))
+        )
+
+    def test_uncacheable_responses_are_not_stored(self):
+        page_cache = get_page_response_cache()
+
+        response = HttpResponse("Private")
+        response["Cache-Control"] = "private"
+        self.assertFalse(page_cache.can_cache_response(self.christmas_page, response))
+
+        response = HttpResponse("Cookie")
+        response.set_cookie("foo", "bar")
+        self.assertFalse(page_cache.can_cache_response(self.christmas_page, response))
+
+        self.assertFalse(
+            page_cache.can_cache_response(
+                self.christmas_page, HttpResponse("Not found", status=404)
+            )
+        )
+
+    def test_pages_using_csrf_token_are_not_cached(self):
+        # The form on this page includes a CSRF token, which belongs to each visitor
+        first_visitor = Client(enforce_csrf_checks=True)
+        second_visitor = Client(enforce_csrf_checks=True)
+
+        first_response = first_visitor.get("/contact-us/")
+        second_response = second_visitor.get("/contact-us/")
+
+        self.assertIn("csrftoken", first_response.cookies)
+        self.assertIn("csrftoken", second_response.cookies)
+        self.assertNotEqual(
+            first_response.context["csrf_token"],
+            second_response.context["csrf_token"],
+        )
+
+        response = second_visitor.post(
+            "/contact-us/",
+            {
+                "your_email": "bob@example.com",
+                "your_message": "hello world",
+                "your_choices": {"foo": "", "bar": "", "baz": ""},
+                "csrfmiddlewaretoken": second_response.context["csrf_token"],
+            },
+        )
+        self.assertNotEqual(response.status_code, 403)
+
+    def test_responses_with_uncovered_vary_headers_are_not_stored(self):
+        page_cache = get_page_response_cache()
+
+        response = HttpResponse("Varies")
+        response["Vary"] = "Cookie"
+        self.assertFalse(page_cache.can_cache_response(self.christmas_page, response))
+
+        response = HttpResponse("Varies")
+        response["Vary"] = "Accept-Language"
+        self.assertTrue(page_cache.can_cache_response(self.christmas_page, response))
+
+        with self.settings(WAGTAIL_PAGE_CACHE_VARY_HEADERS=["X-Device"]):
+            response = HttpResponse("Varies")
+            response["Vary"] = "x-device"
+            self.assertTrue(
+                get_page_response_cache().can_cache_response(
+                    self.christmas_page, response
+                )
+            )
+
+    def test_invalidated_on_publish(self):
+        self.client.get("/events/christmas/")
+
+        self.christmas_page.title = "Christmas 2.0"
+        self.christmas_page.save_revision().publish()
+
+        response = self.assertNotServedFromCache("/events/christmas/")
+        self.assertContains(response, "<h1>Christmas 2.0</h1>")
+
+    def test_other_pages_stay_cached_on_publish(self):
+        self.client.get("/events/christmas/")
+
+        saint_patrick = EventPage.objects.get(url_path="/home/events/saint-patrick/")
+        saint_patrick.save_revision().publish()
+
+        self.assertServedFromCache("/events/christmas/")
+
+    def test_invalidated_on_unpublish(self):
+        self.client.get("/events/christmas/")
+
+        self.christmas_page.unpublish()
+
+        response = self.client.get("/events/christmas/")
+        self.assertEqual(response.status_code, 404)
@@ -1,5 +1,6 @@
 import datetime
 import unittest
+from unittest import mock
 from unittest.mock import Mock
 
 import pytz
@@ -8,14 +9,17 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models.signals import post_save
 from django.http import Http404, HttpRequest
 from django.test import Client, TestCase
 from django.test.client import RequestFactory
-from django.test.utils import override_settings
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.utils import timezone, translation
 from freezegun import freeze_time
 
 from wagtail.core.actions.copy_for_translation import ParentNotTranslatedError
+from wagtail.core.actions.copy_page import CopyPageAction
 from wagtail.core.models import (
     Comment,
     Locale,
@@ -26,7 +30,9 @@ from wagtail.core.models import (
     get_page_models,
     get_translatable_models,
 )
+from wagtail.core.page_urls import get_page_url_cache
 from wagtail.core.signals import page_published
+from wagtail.tests.routablepage.models import RoutablePageTest
 from wagtail.tests.testapp.models import (
     AbstractPage,
     Advert,
@@ -755,6 +761,23 @@ class TestRoutingWithI18N(TestRouting):
             )
 
 
+@override_settings(WAGTAIL_PAGE_URL_CACHE_ENABLED=True)
+class TestRoutingWithPageURLCache(TestRouting):
+    # Run all the routing tests again with the page URL cache enabled, checking that
+    # the cached URLs are the same as the computed ones
+
+    def setUp(self):
+        super().setUp()
+        get_page_url_cache().clear()
+
+
+@override_settings(WAGTAIL_PAGE_URL_CACHE_ENABLED=True)
+class TestRoutingWithI18NAndPageURLCache(TestRoutingWithI18N):
+    def setUp(self):
+        super().setUp()
+        get_page_url_cache().clear()
+
+
 class TestServeView(TestCase):
     fixtures = ["test.json"]
 
@@ -861,6 +884,90 @@ class TestServeView(TestCase):
         self.assertContains(response, "bad googlebot no cookie")
 
 
+@override_settings(WAGTAIL_URL_PATH_ROUTING_ENABLED=True)
+class TestServeViewWithURLPathRouting(TestServeView):
+    # Run all the serve view tests again, routing requests by url_path
+    pass
+
+
+class TestRouteByURLPath(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        self.homepage = Page.objects.get(url_path="/home/")
+        self.request = HttpRequest()
+
+    def assertRoutesTo(self, path_components, page):
+        route_result = self.homepage._route_by_url_path(self.request, path_components)
+        self.assertEqual(
+            tuple(route_result),
+            tuple(self.homepage.specific.route(self.request, path_components)),
+        )
+        self.assertEqual(route_result[0], page)
+        self.assertIs(type(route_result[0]), type(page))
+
+    def test_route(self):
+        self.assertRoutesTo([], self.homepage.specific)
+        self.assertRoutesTo(
+            ["events"], Page.objects.get(url_path="/home/events/").specific
+        )
+        self.assertRoutesTo(
+            ["events", "christmas"],
+            EventPage.objects.get(url_path="/home/events/christmas/"),
+        )
+
+    def test_unknown_page(self):
+        with self.assertRaises(Http404):
+            self.homepage._route_by_url_path(self.request, ["events", "quinquagesima"])
+        with self.assertRaises(Http404):
+            self.homepage._route_by_url_path(self.request, ["nothing", "christmas"])
+
+    def test_unpublished_page(self):
+        with self.assertRaises(Http404):
+            self.homepage._route_by_url_path(
+                self.request, ["events", "tentative-unpublished-event"]
+            )
+
+    def test_page_outside_root(self):
+        events_page = Page.objects.get(url_path="/home/events/")
+        with self.assertRaises(Http404):
+            events_page._route_by_url_path(self.request, ["home", "events"])
+
+    def test_num_queries(self):
+        page = self.homepage
+        for slug in ["one", "two", "three", "four"]:
+            page = page.add_child(instance=SimplePage(title=slug, content="hello"))
+
+        # Prime the content type cache
+        for page in Page.objects.all():
+            page.specific_class
+
+        # One query to find the pages along the path, and one for the specific page,
+        # however deep it is
+        with self.assertNumQueries(2):
+            page, args, kwargs = self.homepage._route_by_url_path(
+                self.request, ["one", "two", "three", "four"]
+            )
+        self.assertEqual(page.url_path, "/home/one/two/three/four/")
+        self.assertIsInstance(page, SimplePage)
+
+    def test_page_type_that_overrides_route(self):
+        events_page = Page.objects.get(url_path="/home/events/")
+        routable_page = events_page.add_child(
+            instance=RoutablePageTest(title="Routable Page", slug="routable", live=True)
+        )
+
+        page, args, kwargs = self.homepage._route_by_url_path(
+            self.request, ["events", "routable", "archive", "year", "2014"]
+        )
+
+        # RoutablePageMixin.route returns the view and its arguments in args
+        self.assertEqual(page, routable_page)
+        view, view_args, view_kwargs = args
+        self.assertEqual(view.__func__, RoutablePageTest.archive_by_year)
+        self.assertEqual(view_args, ("2014",))
+
+
 class TestStaticSitePaths(TestCase):
     def setUp(self):
         self.root_page = Page.objects.get(id=1)
@@ -1774,6 +1881,249 @@ class TestCopyPage(TestCase):
             "You cannot copy a tree branch recursively into itself",
         )
 
+    def get_subtree_summary(self, page):
+        summary = []
+        for descendant in page.get_descendants().order_by("path").specific():
+            latest_revision = descendant.get_latest_revision()
+            summary.append(
+                (
+                    descendant.url_path[len(page.url_path) :],
+                    descendant.depth - page.depth,
+                    descendant.numchild,
+                    type(descendant),
+                    descendant.title,
+                    descendant.draft_title,
+                    descendant.live,
+                    descendant.has_unpublished_changes,
+                    descendant.live_revision_id == latest_revision.id,
+                    descendant.revisions.count(),
+                    latest_revision.content["title"],
+                    latest_revision.content["url_path"][len(page.url_path) :],
+                )
+            )
+        return summary
+
+    def test_copy_page_copies_recursively_in_bulk(self):
+        events_index = EventIndex.objects.get(url_path="/home/events/")
+        christmas_event = EventPage.objects.get(url_path="/home/events/christmas/")
+        christmas_event.categories = [EventCategory.objects.create(name="Holidays")]
+        christmas_event.save()
+        christmas_event.title = "Christmas draft"
+        christmas_event.save_revision()
+        # Add a grandchild, to copy more than one level
+        christmas_event.add_child(
+            instance=SimplePage(title="Christmas dinner", slug="dinner", content="Hi")
+        )
+
+        bulk_copy = events_index.copy(
+            recursive=True,
+            update_attrs={"title": "Bulk events", "slug": "bulk-events"},
+        )
+        with mock.patch.object(
+            CopyPageAction, "_can_copy_descendants_in_bulk", return_value=False
+        ):
+            page_by_page_copy = events_index.copy(
+                recursive=True,
+                update_attrs={"title": "Other events", "slug": "other-events"},
+            )
+
+        # The bulk copy should be the same as copying one page at a time
+        self.assertEqual(
+            self.get_subtree_summary(bulk_copy),
+            self.get_subtree_summary(page_by_page_copy),
+        )
+        self.assertEqual(
+            bulk_copy.get_descendants().count(), events_index.get_descendants().count()
+        )
+        self.assertEqual(Page.find_problems(), ([], [], [], [], []))
+
+        new_christmas_event = EventPage.objects.get(
+            url_path="/home/bulk-events/christmas/"
+        )
+        self.assertEqual(new_christmas_event.draft_title, "Christmas draft")
+        self.assertEqual(
+            [speaker.first_name for speaker in new_christmas_event.speakers.all()],
+            [speaker.first_name for speaker in christmas_event.speakers.all()],
+        )
+        self.assertNotEqual(
+            new_christmas_event.speakers.get().id, christmas_event.speakers.get().id
+        )
+        self.assertEqual(
+            list(new_christmas_event.categories.values_list("name", flat=True)),
+            ["Holidays"],
+        )
+
+        # Check that child object IDs in the copied revisions were remapped
+        revision_speakers = new_christmas_event.get_latest_revision().content[
+            "speakers"
+        ]
+        self.assertEqual(
+            [speaker["pk"] for speaker in revision_speakers],
+            [new_christmas_event.speakers.get().id],
+        )
+        self.assertEqual(
+            [speaker["page"] for speaker in revision_speakers],
+            [new_christmas_event.id],
+        )
+
+        # Multi-table inheritance pages should have a row in each table
+        new_saint_patrick_event = SingleEventPage.objects.get(
+            url_path="/home/bulk-events/saint-patrick/"
+        )
+        self.assertTrue(
+            EventPage.objects.filter(id=new_saint_patrick_event.id).exists()
+        )
+
+    def test_copy_page_copies_recursively_in_bulk_logs_actions(self):
+        events_index = EventIndex.objects.get(url_path="/home/events/")
+        user = get_user_model().objects.get(email="eventmoderator@example.com")
+
+        new_events_index = events_index.copy(
+            recursive=True,
+            update_attrs={"title": "New events index", "slug": "new-events-index"},
+            user=user,
+        )
+
+        new_christmas_event = EventPage.objects.get(
+            url_path="/home/new-events-index/christmas/"
+        )
+        self.assertEqual(
+            set(
+                PageLogEntry.objects.filter(page=new_christmas_event).values_list(
+                    "action", "user"
+                )
+            ),
+            {
+                ("wagtail.create", user.pk),
+                ("wagtail.copy", user.pk),
+                ("wagtail.publish", user.pk),
+            },
+        )
+        copy_log = PageLogEntry.objects.get(
+            page=new_christmas_event, action="wagtail.copy"
+        )
+        self.assertEqual(copy_log.data["source"]["id"], events_index.id)
+        self.assertEqual(copy_log.data["destination"]["id"], new_events_index.id)
+        self.assertEqual(copy_log.data["destination"]["title"], "New events index")
+        self.assertEqual(copy_log.data["page"]["id"], new_christmas_event.id)
+        self.assertEqual(
+            PageLogEntry.objects.get(
+                page=new_christmas_event, action="wagtail.publish"
+            ).revision,
+            new_christmas_event.live_revision,
+        )
+
+    def test_copy_page_copies_recursively_in_bulk_sends_signals(self):
+        events_index = EventIndex.objects.get(url_path="/home/events/")
+        saved_pages = []
+        published_pages = []
+
+        def post_save_handler(sender, instance, created, **kwargs):
+            if isinstance(instance, Page) and created:
+                saved_pages.append(instance.url_path)
+
+        def page_published_handler(sender, instance, **kwargs):
+            published_pages.append(instance.url_path)
+
+        post_save.connect(post_save_handler)
+        page_published.connect(page_published_handler)
+        try:
+            events_index.copy(
+                recursive=True,
+                update_attrs={"title": "New events index", "slug": "new-events-index"},
+            )
+        finally:
+            post_save.disconnect(post_save_handler)
+            page_published.disconnect(page_published_handler)
+
+        new_url_paths = [
+            "/home/new-events-index" + url_path[len(events_index.url_path) - 1 :]
+            for url_path in events_index.get_descendants().values_list(
+                "url_path", flat=True
+            )
+        ]
+        self.assertEqual(
+            sorted(saved_pages), sorted(["/home/new-events-index/"] + new_url_paths)
+        )
+        self.assertEqual(
+            sorted(published_pages),
+            sorted(
+                ["/home/new-events-index/"]
+                + [
+                    "/home/new-events-index"
+                    + url_path[len(events_index.url_path) - 1 :]
+                    for url_path in events_index.get_descendants()
+                    .live()
+                    .values_list("url_path", flat=True)
+                ]
+            ),
+        )
+
+    def test_copy_page_copies_recursively_in_bulk_query_count(self):
+        events_index = EventIndex.objects.get(url_path="/home/events/")
+
+        def add_events(count):
+            for i in range(count):
+                events_index.add_child(
+                    instance=EventPage(
+                        title="Event",
+                        slug="event-%d" % events_index.get_children().count(),
+                        location="The moon",
+                        audience="public",
+                        cost="free",
+                        date_from=datetime.date(2022, 1, 1),
+                    )
+                ).save_revision().publish()
+
+        def get_database_queries(copy_number):
+            with CaptureQueriesContext(connection) as queries:
+                events_index.copy(
+                    recursive=True,
+                    update_attrs={
+                        "title": "Copy %d" % copy_number,
+                        "slug": "copy-%d" % copy_number,
+                    },
+                )
+
+            # Leave out lookups of the page URLs to purge from the frontend cache,
+            # which are made for each published page
+            return [
+                query
+                for query in queries.captured_queries
+                if '"cache"' not in query["sql"]
+            ]
+
+        add_events(5)
+        get_database_queries(1)
+        queries = get_database_queries(2)
+
+        add_events(10)
+        more_queries = get_database_queries(3)
+
+        # The number of queries shouldn't depend on the number of pages copied
+        self.assertEqual(len(more_queries), len(queries))
+
+    def test_copy_page_recursively_falls_back_to_copying_page_by_page(self):
+        events_index = EventIndex.objects.get(url_path="/home/events/")
+        action = CopyPageAction(events_index, recursive=True)
+        self.assertTrue(action._can_copy_descendants_in_bulk(events_index))
+
+        def save(self, *args, **kwargs):
+            return Page.save(self, *args, **kwargs)
+
+        with mock.patch.object(EventPage, "save", save):
+            self.assertFalse(action._can_copy_descendants_in_bulk(events_index))
+
+            new_events_index = events_index.copy(
+                recursive=True,
+                update_attrs={"title": "New events index", "slug": "new-events-index"},
+            )
+
+        self.assertEqual(
+            new_events_index.get_descendants().count(),
+            events_index.get_descendants().count(),
+        )
+
     def test_copy_page_updates_user(self):
         event_moderator = get_user_model().objects.get(
             email="eventmoderator@example.com"
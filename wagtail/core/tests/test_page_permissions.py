@@ -2,7 +2,10 @@ import json
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
-from django.test import Client, TestCase, override_settings
+from django.db import connection
+from django.db.models import Q
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from wagtail.core.models import (
@@ -14,6 +17,7 @@ from wagtail.core.models import (
     Workflow,
     WorkflowTask,
 )
+from wagtail.core.page_permissions import PagePermissionSummary, get_covering_paths
 from wagtail.tests.testapp.models import (
     BusinessSubIndex,
     EventIndex,
@@ -501,6 +505,41 @@ class TestPagePermission(TestCase):
         self.assertTrue(explorable_pages.filter(id=businessy_events.id).exists())
         self.assertTrue(explorable_pages.filter(id=events_page.id).exists())
 
+    def test_explorable_pages_matches_permission_subtrees_and_ancestors(self):
+        corporate_editor = get_user_model().objects.get(
+            email="corporateeditor@example.com"
+        )
+        permissions = GroupPagePermission.objects.filter(group__user=corporate_editor)
+
+        expected_pages = set()
+        for perm in permissions:
+            if perm.permission_type in ["add", "edit", "publish", "lock"]:
+                expected_pages.update(
+                    Page.objects.descendant_of(perm.page, inclusive=True)
+                )
+            expected_pages.update(perm.page.get_ancestors())
+        common_ancestor = Page.objects.filter(
+            group_permissions__in=permissions
+        ).first_common_ancestor()
+        expected_pages = {
+            page
+            for page in expected_pages
+            if page.path.startswith(common_ancestor.path)
+        }
+
+        explorable_pages = UserPagePermissionsProxy(corporate_editor).explorable_pages()
+
+        self.assertEqual(set(explorable_pages), expected_pages)
+
+    def test_explorable_pages_without_permissions(self):
+        user = get_user_model().objects.create_user(
+            username="nopermissions",
+            email="nopermissions@example.com",
+            password="password",
+        )
+
+        self.assertFalse(UserPagePermissionsProxy(user).explorable_pages().exists())
+
     def test_editable_pages_for_user_with_edit_permission(self):
         event_moderator = get_user_model().objects.get(
             email="eventmoderator@example.com"
@@ -915,3 +954,140 @@ class TestPagePermissionTesterCanCopyTo(TestCase):
         self.assertFalse(
             singleton_page_perms.can_copy_to(self.singleton_page.get_parent())
         )
+
+
+class TestPagePermissionSummary(SimpleTestCase):
+    def setUp(self):
+        self.summary = PagePermissionSummary(
+            [
+                ("add", "000100010002"),
+                ("add", "0001000100020003"),
+                ("edit", "0001000100020003"),
+                ("add", "000100010005"),
+                ("publish", "00010001000200030004"),
+            ]
+        )
+
+    def test_get_covering_paths(self):
+        self.assertEqual(
+            get_covering_paths(
+                ["000100010002", "0001000100020003", "000100010005", "000100010002"]
+            ),
+            ("000100010002", "000100010005"),
+        )
+
+    def test_get_paths(self):
+        self.assertEqual(
+            self.summary.get_paths("add"), ("000100010002", "000100010005")
+        )
+        self.assertEqual(
+            self.summary.get_paths("edit", "publish"), ("0001000100020003",)
+        )
+        self.assertEqual(self.summary.get_paths("lock"), ())
+
+    def test_get_permission_types_for_path(self):
+        self.assertEqual(self.summary.get_permission_types_for_path("00010001"), set())
+        self.assertEqual(
+            self.summary.get_permission_types_for_path("000100010002"), {"add"}
+        )
+        self.assertEqual(
+            self.summary.get_permission_types_for_path("00010001000200030009"),
+            {"add", "edit"},
+        )
+        self.assertEqual(
+            self.summary.get_permission_types_for_path("000100010002000300040001"),
+            {"add", "edit", "publish"},
+        )
+        self.assertEqual(
+            self.summary.get_permission_types_for_path("000100010006"), set()
+        )
+
+    def test_get_ancestor_paths(self):
+        self.assertEqual(
+            self.summary.get_ancestor_paths(),
+            {
+                "0001",
+                "00010001",
+                "000100010002",
+                "0001000100020003",
+            },
+        )
+
+    def test_get_common_ancestor_path(self):
+        self.assertEqual(self.summary.get_common_ancestor_path(), "00010001")
+        self.assertEqual(
+            PagePermissionSummary(
+                [("add", "0001000100020003"), ("edit", "0001000100020004")]
+            ).get_common_ancestor_path(),
+            "000100010002",
+        )
+
+    def test_get_filter(self):
+        self.assertIsNone(self.summary.get_filter("lock"))
+        self.assertEqual(
+            self.summary.get_filter("edit", field_name="page__path"),
+            Q(page__path__startswith="0001000100020003"),
+        )
+
+
+@override_settings(WAGTAIL_PAGE_PERMISSION_CACHE_ENABLED=True)
+class TestPagePermissionSummaryCache(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        self.event_editor = get_user_model().objects.get(
+            email="eventeditor@example.com"
+        )
+        self.about_us_page = Page.objects.get(url_path="/home/about-us/")
+
+    def get_editable_pages(self):
+        return UserPagePermissionsProxy(self.event_editor).editable_pages()
+
+    def test_summary_is_cached(self):
+        UserPagePermissionsProxy(self.event_editor).permission_summary
+
+        with CaptureQueriesContext(connection) as queries:
+            summary = UserPagePermissionsProxy(self.event_editor).permission_summary
+        self.assertIn("add", summary.permission_types)
+
+        # The test settings use the database cache, so only check that the permissions
+        # themselves weren't queried
+        for query in queries.captured_queries:
+            self.assertNotIn("wagtailcore_grouppagepermission", query["sql"])
+
+    def test_invalidated_by_new_permission(self):
+        self.assertNotIn(self.about_us_page, self.get_editable_pages())
+
+        GroupPagePermission.objects.create(
+            group=Group.objects.get(name="Event editors"),
+            page=self.about_us_page,
+            permission_type="edit",
+        )
+
+        self.assertIn(self.about_us_page, self.get_editable_pages())
+
+    def test_invalidated_by_group_membership(self):
+        self.assertNotIn(self.about_us_page, self.get_editable_pages())
+
+        self.event_editor.groups.add(Group.objects.get(name="Site-wide editors"))
+
+        self.assertIn(self.about_us_page, self.get_editable_pages())
+
+    def test_invalidated_by_page_move(self):
+        events_page = Page.objects.get(url_path="/home/events/")
+        self.assertIn(
+            "add",
+            UserPagePermissionsProxy(self.event_editor)
+            .for_page(events_page)
+            .permissions,
+        )
+
+        events_page.move(self.about_us_page, pos="last-child")
+
+        events_page.refresh_from_db()
+        self.assertIn(
+            "add",
+            UserPagePermissionsProxy(self.event_editor)
+            .for_page(events_page)
+            .permissions,
+        )
@@ -1,3 +1,4 @@
+import json
 from unittest import mock
 
 from django.contrib.contenttypes.models import ContentType
@@ -6,8 +7,11 @@ from django.test import TestCase
 
 from wagtail.core.models import Locale, Page, PageViewRestriction, Site
 from wagtail.core.signals import page_unpublished
+from wagtail.images.models import Image
+from wagtail.images.tests.utils import get_test_image_file
 from wagtail.search.query import MATCH_ALL
 from wagtail.tests.testapp.models import (
+    DefaultStreamPage,
     EventPage,
     SimplePage,
     SingleEventPage,
@@ -1048,3 +1052,98 @@ class TestFirstCommonAncestor(TestCase):
             self.assertNotIn("body", page.__dict__)
             with self.assertNumQueries(1):
                 page.body
+
+
+class TestPrefetchStreamBlocks(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        self.images = [
+            Image.objects.create(title="Test image %d" % i, file=get_test_image_file())
+            for i in range(3)
+        ]
+
+        self.homepage = Page.objects.get(url_path="/home/")
+        for i, image in enumerate(self.images):
+            self.homepage.add_child(
+                instance=DefaultStreamPage(
+                    title="Stream page %d" % i,
+                    body=json.dumps(
+                        [
+                            {"type": "text", "value": "Page %d" % i},
+                            {"type": "image", "value": image.pk},
+                            {"type": "image", "value": self.images[0].pk},
+                        ]
+                    ),
+                )
+            )
+
+    def get_queryset(self):
+        return self.homepage.get_children().exact_type(DefaultStreamPage)
+
+    def test_prefetch_stream_blocks(self):
+        # One query for the page types, one for the specific pages and one for all images
+        with self.assertNumQueries(3):
+            pages = list(self.get_queryset().specific().prefetch_stream_blocks())
+
+        with self.assertNumQueries(0):
+            images = [
+                block.value
+                for page in pages
+                for block in page.body
+                if block.block_type == "image"
+            ]
+
+        self.assertEqual(len(pages), 3)
+        self.assertEqual(
+            images,
+            [
+                self.images[0],
+                self.images[0],
+                self.images[1],
+                self.images[0],
+                self.images[2],
+                self.images[0],
+            ],
+        )
+        self.assertEqual(pages[1].body[0].value, "Page 1")
+
+    def test_without_prefetch_stream_blocks(self):
+        pages = list(self.get_queryset().specific())
+
+        # One query per page for its images
+        with self.assertNumQueries(3):
+            for page in pages:
+                list(page.body)
+
+    def test_prefetch_stream_blocks_is_cloned(self):
+        with self.assertNumQueries(3):
+            pages = list(
+                self.get_queryset()
+                .prefetch_stream_blocks()
+                .specific()
+                .order_by("-path")
+            )
+
+        with self.assertNumQueries(0):
+            for page in pages:
+                list(page.body)
+
+    def test_prefetch_other_field(self):
+        pages = list(self.get_queryset().specific().prefetch_stream_blocks("title"))
+
+        with self.assertNumQueries(3):
+            for page in pages:
+                list(page.body)
+
+    def test_prefetch_deferred_field(self):
+        with self.assertNumQueries(2):
+            pages = list(
+                self.get_queryset()
+                .defer_streamfields()
+                .specific()
+                .prefetch_stream_blocks()
+            )
+
+        for page in pages:
+            self.assertNotIn("body", page.__dict__)
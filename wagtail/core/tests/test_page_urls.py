@@ -0,0 +1,150 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import translation
+
+from wagtail.core.models import Page, Site, SiteRootPath
+from wagtail.core.page_urls import (
+    NOT_CACHED,
+    PageURLCache,
+    SiteRootPathIndex,
+    get_page_url_cache,
+)
+
+
+class TestSiteRootPathIndex(TestCase):
+    def setUp(self):
+        self.site_root_paths = [
+            SiteRootPath(3, "/home/events/christmas/", "http://christmas.test", "en"),
+            SiteRootPath(2, "/home/events/", "http://events.test", "en"),
+            SiteRootPath(4, "/home/events/", "http://events2.test", "en"),
+            SiteRootPath(1, "/home/", "http://localhost", "en"),
+            SiteRootPath(5, "/", "http://everything.test", "en"),
+        ]
+        self.index = SiteRootPathIndex(self.site_root_paths)
+
+    def test_matches_linear_scan(self):
+        for url_path in [
+            "/",
+            "/home/",
+            "/home/about/",
+            "/home/events/",
+            "/home/events/christmas/",
+            "/home/events/christmas/party/",
+            "/home/eventsandmore/",
+            "/other/",
+        ]:
+            with self.subTest(url_path=url_path):
+                self.assertEqual(
+                    self.index.get_relevant_site_root_paths(url_path),
+                    tuple(
+                        srp
+                        for srp in self.site_root_paths
+                        if url_path.startswith(srp.root_path)
+                    ),
+                )
+
+    def test_most_specific_first(self):
+        self.assertEqual(
+            [
+                srp.site_id
+                for srp in self.index.get_relevant_site_root_paths(
+                    "/home/events/christmas/"
+                )
+            ],
+            [3, 2, 4, 1, 5],
+        )
+
+    def test_no_match(self):
+        index = SiteRootPathIndex(self.site_root_paths[:-1])
+        self.assertEqual(index.get_relevant_site_root_paths("/other/"), ())
+
+
+class TestPageURLCache(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        # Start each test with an empty cache
+        patcher = mock.patch("wagtail.core.page_urls._page_url_cache", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(get_page_url_cache())
+
+    def test_lru_eviction(self):
+        url_cache = PageURLCache(maxsize=2)
+        url_cache.set("a", 1)
+        url_cache.set("b", 2)
+        url_cache.get("a")
+        url_cache.set("c", 3)
+
+        self.assertEqual(url_cache.get("a"), 1)
+        self.assertIs(url_cache.get("b"), NOT_CACHED)
+        self.assertEqual(url_cache.get("c"), 3)
+
+    @override_settings(WAGTAIL_PAGE_URL_CACHE_ENABLED=True)
+    def test_url_is_cached_by_url_path(self):
+        christmas_page = Page.objects.get(url_path="/home/events/christmas/")
+        self.assertEqual(christmas_page.url, "/events/christmas/")
+
+        # Another instance with the same url_path uses the cached URL parts
+        with mock.patch.object(Page, "_get_url_parts") as get_url_parts:
+            self.assertEqual(
+                Page.objects.get(id=christmas_page.id).url, "/events/christmas/"
+            )
+        get_url_parts.assert_not_called()
+
+    @override_settings(WAGTAIL_PAGE_URL_CACHE_ENABLED=True)
+    def test_slug_change(self):
+        events_page = Page.objects.get(url_path="/home/events/")
+        self.assertEqual(
+            Page.objects.get(url_path="/home/events/christmas/").url,
+            "/events/christmas/",
+        )
+
+        events_page.slug = "whats-on"
+        events_page.save()
+
+        self.assertEqual(
+            Page.objects.get(url_path="/home/whats-on/christmas/").url,
+            "/whats-on/christmas/",
+        )
+
+    @override_settings(WAGTAIL_PAGE_URL_CACHE_ENABLED=True)
+    def test_site_change(self):
+        christmas_page = Page.objects.get(url_path="/home/events/christmas/")
+        self.assertEqual(christmas_page.full_url, "http://localhost/events/christmas/")
+
+        # Bypass the signal handlers, which would clear the site root paths anyway
+        Site.objects.filter(is_default_site=True).update(hostname="example.com")
+        cache.delete("wagtail_site_root_paths")
+
+        self.assertEqual(
+            Page.objects.get(id=christmas_page.id).full_url,
+            "http://example.com/events/christmas/",
+        )
+
+    @override_settings(
+        WAGTAIL_PAGE_URL_CACHE_ENABLED=True,
+        ROOT_URLCONF="wagtail.tests.urls_multilang",
+        LANGUAGE_CODE="en",
+        WAGTAIL_I18N_ENABLED=True,
+        LANGUAGES=[("en", "English"), ("fr", "French")],
+        WAGTAIL_CONTENT_LANGUAGES=[("en", "English"), ("fr", "French")],
+    )
+    def test_language_is_part_of_key(self):
+        christmas_page = Page.objects.get(url_path="/home/events/christmas/")
+
+        with translation.override("en"):
+            self.assertEqual(
+                Page.objects.get(id=christmas_page.id).url, "/en/events/christmas/"
+            )
+        with translation.override("fr"):
+            # The page's own language is still used, but the key must be different
+            # for the active language to be respected by other URL configurations
+            self.assertEqual(
+                Page.objects.get(id=christmas_page.id).url, "/en/events/christmas/"
+            )
+        self.assertEqual(len(get_page_url_cache()._entries), 2)
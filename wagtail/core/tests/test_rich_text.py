@@ -1,13 +1,14 @@
 from unittest.mock import patch
 
+from django.contrib.contenttypes.models import ContentType
 from django.test import TestCase, override_settings
 from django.utils import translation
 
-from wagtail.core.models import Locale, Page
-from wagtail.core.rich_text import RichText, expand_db_html
+from wagtail.core.models import Locale, Page, Site
+from wagtail.core.rich_text import RichText, expand_db_html, features
 from wagtail.core.rich_text.feature_registry import FeatureRegistry
 from wagtail.core.rich_text.pages import PageLinkHandler
-from wagtail.core.rich_text.rewriters import LinkRewriter, extract_attrs
+from wagtail.core.rich_text.rewriters import EmbedRewriter, LinkRewriter, extract_attrs
 from wagtail.tests.testapp.models import EventPage
 
 
@@ -28,6 +29,55 @@ class TestPageLinktypeHandler(TestCase):
         result = PageLinkHandler.expand_db_attributes({"id": 1})
         self.assertEqual(result, '<a href="None">')
 
+    def test_expand_db_attributes_many(self):
+        christmas_page = Page.objects.get(url_path="/home/events/christmas/")
+        events_page = Page.objects.get(url_path="/home/events/")
+        result = PageLinkHandler.expand_db_attributes_many(
+            [
+                {"id": str(christmas_page.id)},
+                {"id": 0},
+                {"id": events_page.id},
+                {"id": christmas_page.id},
+            ]
+        )
+        self.assertEqual(
+            result,
+            [
+                '<a href="/events/christmas/">',
+                "<a>",
+                '<a href="/events/">',
+                '<a href="/events/christmas/">',
+            ],
+        )
+
+    def test_expand_db_attributes_many_respects_overridden_expand_db_attributes(self):
+        class CustomPageLinkHandler(PageLinkHandler):
+            @classmethod
+            def expand_db_attributes(cls, attrs):
+                return '<a href="/custom/%s/">' % attrs["id"]
+
+        result = CustomPageLinkHandler.expand_db_attributes_many([{"id": 1}, {"id": 2}])
+        self.assertEqual(result, ['<a href="/custom/1/">', '<a href="/custom/2/">'])
+
+    def test_expand_page_is_used_for_bulk_and_single_links(self):
+        class CustomPageLinkHandler(PageLinkHandler):
+            @classmethod
+            def expand_page(cls, page):
+                return '<a href="%s" data-id="%d">' % (page.url, page.id)
+
+        christmas_page = Page.objects.get(url_path="/home/events/christmas/")
+        expected = '<a href="/events/christmas/" data-id="%d">' % christmas_page.id
+        self.assertEqual(
+            CustomPageLinkHandler.expand_db_attributes({"id": christmas_page.id}),
+            expected,
+        )
+        self.assertEqual(
+            CustomPageLinkHandler.expand_db_attributes_many(
+                [{"id": christmas_page.id}]
+            ),
+            [expected],
+        )
+
 
 @override_settings(
     WAGTAIL_I18N_ENABLED=True,
@@ -70,6 +120,25 @@ class TestPageLinktypeHandlerWithI18N(TestCase):
             result = PageLinkHandler.expand_db_attributes({"id": self.event_page.id})
             self.assertEqual(result, '<a href="/en/events/christmas/">')
 
+    def test_expand_db_attributes_many_autolocalizes(self):
+        with translation.override("fr"):
+            result = PageLinkHandler.expand_db_attributes_many(
+                [{"id": self.event_page.id}, {"id": self.fr_event_page.id}]
+            )
+        self.assertEqual(
+            result, ['<a href="/fr/events/noel/">', '<a href="/fr/events/noel/">']
+        )
+
+    def test_expand_db_attributes_many_doesnt_autolocalize_unpublished_page(self):
+        self.fr_event_page.unpublish()
+        self.fr_event_page.save()
+
+        with translation.override("fr"):
+            result = PageLinkHandler.expand_db_attributes_many(
+                [{"id": self.event_page.id}]
+            )
+        self.assertEqual(result, ['<a href="/en/events/christmas/">'])
+
 
 class TestExtractAttrs(TestCase):
     def test_extract_attr(self):
@@ -98,6 +167,48 @@ class TestExpandDbHtml(TestCase):
         result = expand_db_html(html)
         self.assertIn("test html", result)
 
+    def test_expand_db_html_with_handler_without_bulk_method(self):
+        # Handlers only need to implement expand_db_attributes
+        class CustomLinkHandler:
+            identifier = "custom"
+
+            @staticmethod
+            def expand_db_attributes(attrs):
+                return '<a href="/custom/%s/">' % attrs["id"]
+
+        link_types = {**features.get_link_types(), "custom": CustomLinkHandler}
+        with patch("wagtail.core.rich_text.FRONTEND_REWRITER", None), patch.object(
+            features, "get_link_types", return_value=link_types
+        ):
+            result = expand_db_html('<a id="1" linktype="custom">foo</a>')
+
+        self.assertEqual(result, '<a href="/custom/1/">foo</a>')
+
+
+class TestExpandDbHtmlPageLinks(TestCase):
+    fixtures = ["test.json"]
+
+    def test_page_links_are_fetched_in_bulk(self):
+        pages = EventPage.objects.filter(
+            content_type=ContentType.objects.get_for_model(EventPage)
+        )
+        self.assertGreater(len(pages), 3)
+        html = "".join(
+            '<p><a linktype="page" id="%d">%s</a></p>' % (page.id, page.title)
+            for page in pages
+        )
+
+        # Populate the site root paths cache
+        Site.get_site_root_paths()
+
+        # One query for the base pages, one for the specific pages, one for the
+        # active locale and one to get the site root paths from the cache
+        with self.assertNumQueries(4):
+            result = expand_db_html(html)
+
+        for page in pages:
+            self.assertIn('<a href="%s">%s</a>' % (page.url, page.title), result)
+
 
 class TestRichTextValue(TestCase):
     fixtures = ["test.json"]
@@ -225,6 +336,52 @@ class TestLinkRewriterTagReplacing(TestCase):
         )
 
 
+class TestTagRewriterBulkRules(TestCase):
+    def test_bulk_rules_are_called_once_per_type(self):
+        calls = []
+
+        def expand_pages(attrs_list):
+            calls.append([attrs["id"] for attrs in attrs_list])
+            return [
+                '<a href="/article/{}">'.format(attrs["id"]) for attrs in attrs_list
+            ]
+
+        rewriter = LinkRewriter({"page": lambda attrs: "<a>"}, {"page": expand_pages})
+        result = rewriter(
+            '<a linktype="page" id="3">three</a>'
+            '<a href="https://wagtail.org/">external</a>'
+            '<a linktype="page" id="4">four</a>'
+            '<a linktype="unknown">unknown</a>'
+        )
+
+        self.assertEqual(calls, [["3", "4"]])
+        self.assertEqual(
+            result,
+            '<a href="/article/3">three</a>'
+            '<a href="https://wagtail.org/">external</a>'
+            '<a href="/article/4">four</a>'
+            "<a>unknown</a>",
+        )
+
+    def test_embed_bulk_rules(self):
+        rewriter = EmbedRewriter(
+            {},
+            {
+                "image": lambda attrs_list: [
+                    '<img src="{}.jpg">'.format(attrs["id"]) for attrs in attrs_list
+                ]
+            },
+        )
+        result = rewriter(
+            '<p><embed embedtype="image" id="1"/></p>'
+            '<p><embed embedtype="unknown" id="2"/></p>'
+            '<p><embed embedtype="image" id="3"/></p>'
+        )
+        self.assertEqual(
+            result, '<p><img src="1.jpg"></p><p></p><p><img src="3.jpg"></p>'
+        )
+
+
 class TestRichTextField(TestCase):
     fixtures = ["test.json"]
 
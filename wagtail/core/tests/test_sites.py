@@ -1,8 +1,15 @@
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.http.request import HttpRequest
 from django.test import TestCase, override_settings
 
 from wagtail.core.models import Page, Site
+from wagtail.core.sites import (
+    SITE_ROUTING_TABLE_GENERATION_CACHE_KEY,
+    get_site_for_hostname,
+    get_site_routing_table,
+    invalidate_site_routing_table,
+)
 
 
 class TestSiteNaturalKey(TestCase):
@@ -210,3 +217,93 @@ class TestGetSiteRootPaths(TestCase):
         # Followed by entries for others in 'host' alphabetical order
         self.assertEqual(result[1][0], self.abc_site.id)
         self.assertEqual(result[2][0], self.def_site.id)
+
+
+@override_settings(
+    ALLOWED_HOSTS=["example.com", "unknown.com"],
+    WAGTAIL_SITE_ROUTING_TABLE_ENABLED=True,
+)
+class TestSiteRoutingTable(TestCase):
+    def setUp(self):
+        invalidate_site_routing_table()
+        self.default_site = Site.objects.get()
+        self.site = Site.objects.create(
+            hostname="example.com", port=80, root_page=Page.objects.get(pk=2)
+        )
+        self.site_8080 = Site.objects.create(
+            hostname="example.com", port=8080, root_page=Page.objects.get(pk=2)
+        )
+
+    def find_site(self, host, port=80):
+        request = HttpRequest()
+        request.META = {"HTTP_HOST": host, "SERVER_PORT": port}
+        return Site.find_for_request(request)
+
+    def test_find_for_request(self):
+        self.assertEqual(self.find_site("example.com"), self.site)
+        self.assertEqual(self.find_site("example.com", 8080), self.site_8080)
+        self.assertEqual(self.find_site("unknown.com"), self.default_site)
+
+    def test_matches_get_site_for_hostname(self):
+        for hostname, port in [
+            ("example.com", 80),
+            ("example.com", 8080),
+            ("example.com", 8000),
+            ("unknown.com", 80),
+            ("localhost", 80),
+        ]:
+            with self.subTest(hostname=hostname, port=port):
+                self.assertEqual(
+                    get_site_routing_table().get_site_for_hostname(hostname, port),
+                    get_site_for_hostname(hostname, port),
+                )
+
+    def test_single_hostname_match_without_default(self):
+        self.site_8080.delete()
+        self.default_site.delete()
+        self.assertEqual(self.find_site("example.com", 8000), self.site)
+        self.assertIsNone(self.find_site("unknown.com"))
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_no_queries_once_built(self):
+        self.find_site("example.com")
+
+        with self.assertNumQueries(0):
+            site = self.find_site("example.com")
+            self.assertEqual(site.root_page.title, "Welcome to your new Wagtail site!")
+
+    def test_returns_new_instances(self):
+        first = self.find_site("example.com")
+        second = self.find_site("example.com")
+        self.assertIsNot(first, second)
+        self.assertIsNot(first.root_page, second.root_page)
+
+    def test_rebuilt_on_site_change(self):
+        self.assertEqual(self.find_site("unknown.com"), self.default_site)
+
+        new_site = Site.objects.create(
+            hostname="unknown.com", port=80, root_page=Page.objects.get(pk=2)
+        )
+        self.assertEqual(self.find_site("unknown.com"), new_site)
+
+        new_site.delete()
+        self.assertEqual(self.find_site("unknown.com"), self.default_site)
+
+    def test_rebuilt_on_root_page_change(self):
+        root_page = Page.objects.get(pk=2)
+        self.find_site("example.com")
+
+        root_page.title = "New title"
+        root_page.save()
+
+        self.assertEqual(self.find_site("example.com").root_page.title, "New title")
+
+    def test_rebuilt_when_generation_changes(self):
+        table = get_site_routing_table()
+        self.assertIs(get_site_routing_table(), table)
+
+        # Simulate another process invalidating the table
+        cache.set(SITE_ROUTING_TABLE_GENERATION_CACHE_KEY, "other-process")
+        self.assertIsNot(get_site_routing_table(), table)
@@ -174,6 +174,36 @@ class TestLazyStreamField(TestCase):
         with self.assertNumQueries(1):
             instance.save()
 
+    def test_json_is_decoded_on_first_access(self):
+        instance = StreamModel.objects.get(pk=self.with_image.pk)
+        self.assertNotIn("_raw_data", instance.body.__dict__)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(len(instance.body), 2)
+
+        self.assertEqual(instance.body.raw_data[1]["value"], "foo")
+        self.assertIsNone(instance.body.raw_text)
+
+    def test_unrecognised_block_types_are_dropped(self):
+        instance = StreamModel.objects.create(
+            body=json.dumps(
+                [
+                    {"type": "text", "value": "foo"},
+                    {"type": "unknown", "value": "bar"},
+                ]
+            )
+        )
+        instance = StreamModel.objects.get(pk=instance.pk)
+
+        self.assertEqual(len(instance.body), 1)
+        self.assertEqual(instance.body[0].value, "foo")
+
+    def test_null_json(self):
+        value = StreamModel._meta.get_field("body").to_python("null")
+
+        self.assertEqual(len(value), 0)
+        self.assertIsNone(value.raw_text)
+
 
 class TestSystemCheck(TestCase):
     def tearDown(self):
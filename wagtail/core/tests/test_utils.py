@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*
+import math
+
 from django.core.exceptions import ImproperlyConfigured, SuspiciousOperation
 from django.test import TestCase, override_settings
 from django.utils.text import slugify
@@ -14,6 +16,7 @@ from wagtail.core.utils import (
     get_content_languages,
     get_dummy_request,
     get_supported_content_language_variant,
+    json_loads,
     multigetattr,
     safe_snake_case,
     string_to_ascii,
@@ -405,3 +408,21 @@ class TestGetDummyRequest(TestCase):
 
         request = get_dummy_request(site=site)
         self.assertEqual(request.get_host(), "other.example.com:8888")
+
+
+class TestJsonLoads(TestCase):
+    def test_json_loads(self):
+        self.assertEqual(
+            json_loads('[{"type": "text", "value": "foo"}]'),
+            [{"type": "text", "value": "foo"}],
+        )
+
+    def test_json_loads_falls_back_to_json_module(self):
+        # orjson doesn't accept NaN, which the json module writes by default
+        value = json_loads('{"value": NaN, "big": 123456789012345678901234567890}')
+        self.assertTrue(math.isnan(value["value"]))
+        self.assertEqual(value["big"], 123456789012345678901234567890)
+
+    def test_json_loads_invalid(self):
+        with self.assertRaises(ValueError):
+            json_loads("<h1>hello world</h1>")
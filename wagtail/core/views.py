@@ -7,6 +7,7 @@ from django.utils.http import url_has_allowed_host_and_scheme
 from wagtail.core import hooks
 from wagtail.core.forms import PasswordViewRestrictionForm
 from wagtail.core.models import Page, PageViewRestriction, Site
+from wagtail.core.page_cache import get_page_response_cache
 
 
 def serve(request, path):
@@ -16,15 +17,24 @@ def serve(request, path):
         raise Http404
 
     path_components = [component for component in path.split("/") if component]
-    page, args, kwargs = site.root_page.localized.specific.route(
-        request, path_components
-    )
+    if getattr(settings, "WAGTAIL_URL_PATH_ROUTING_ENABLED", False):
+        page, args, kwargs = site.root_page.localized._route_by_url_path(
+            request, path_components
+        )
+    else:
+        page, args, kwargs = site.root_page.localized.specific.route(
+            request, path_components
+        )
 
     for fn in hooks.get_hooks("before_serve_page"):
         result = fn(page, request, args, kwargs)
         if isinstance(result, HttpResponse):
             return result
 
+    page_cache = get_page_response_cache()
+    if page_cache is not None and page_cache.can_cache_request(request):
+        return page_cache.serve(page, request, site, args, kwargs)
+
     return page.serve(request, *args, **kwargs)
 
 
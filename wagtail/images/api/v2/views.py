@@ -2,6 +2,7 @@ from wagtail.api.v2.filters import FieldsFilter, OrderingFilter, SearchFilter
 from wagtail.api.v2.views import BaseAPIViewSet
 
 from ... import get_image_model
+from ..fields import ImageRenditionField
 from .serializers import ImageSerializer
 
 
@@ -21,3 +22,26 @@ class ImagesAPIViewSet(BaseAPIViewSet):
     ]
     name = "images"
     model = get_image_model()
+
+    def get_rendition_filter_specs(self):
+        """
+        Return the filter specs of the ImageRenditionFields that will be output for each
+        image in the listing
+        """
+        serializer_class = self.get_serializer_class()
+        return [
+            field.filter_spec
+            for field_name, field in serializer_class._declared_fields.items()
+            if isinstance(field, ImageRenditionField)
+            and field.source == "*"
+            and field_name in serializer_class.Meta.fields
+        ]
+
+    def filter_queryset(self, queryset):
+        if self.action == "listing_view":
+            # Fetch the renditions for every image in the listing with one query
+            filter_specs = self.get_rendition_filter_specs()
+            if filter_specs:
+                queryset = queryset.prefetch_renditions(*filter_specs)
+
+        return super().filter_queryset(queryset)
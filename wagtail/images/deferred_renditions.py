@@ -0,0 +1,118 @@
+"""
+Background generation of image renditions.
+
+When WAGTAILIMAGES_DEFERRED_RENDITIONS is enabled, AbstractImage.get_rendition() does not
+generate missing renditions inside the request that asks for them. Instead, the work is
+handed to a DeferredRenditionGenerator, which runs Filter.run in a thread pool, and a
+placeholder rendition pointing at the image serve view is returned. If that URL is
+requested before the rendition is ready, the serve view waits for the pending job (or
+generates the rendition itself, if the job belongs to another process).
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger("wagtail.images")
+
+
+class DeferredRenditionGenerator:
+    """
+    Generates renditions in a pool of worker threads, ensuring that each rendition is only
+    queued once per process however many times it is requested while pending.
+    """
+
+    def __init__(self, max_workers=None, executor=None):
+        self.max_workers = max_workers
+        self._executor = executor
+        self._pending = {}
+        self._lock = threading.RLock()
+
+    @property
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="wagtail-renditions",
+                )
+            return self._executor
+
+    @staticmethod
+    def get_key(image, filter_spec, focal_point_key):
+        return (image._meta.label, image.pk, filter_spec, focal_point_key)
+
+    def submit(self, image, filter, focal_point_key):
+        """
+        Queue the rendition for the given image and filter to be generated, unless it is
+        already pending. Returns a Future that resolves to the rendition.
+        """
+        key = self.get_key(image, filter.spec, focal_point_key)
+
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                future = self.executor.submit(
+                    self.generate,
+                    type(image),
+                    image.pk,
+                    filter.spec,
+                    focal_point_key,
+                )
+                self._pending[key] = future
+                future.add_done_callback(lambda future: self._forget(key, future))
+
+        return future
+
+    def get_pending(self, image, filter_spec, focal_point_key):
+        """
+        Return the Future for a rendition that is queued in this process, or None
+        """
+        with self._lock:
+            return self._pending.get(self.get_key(image, filter_spec, focal_point_key))
+
+    def _forget(self, key, future):
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+
+    def generate(self, image_model, image_id, filter_spec, focal_point_key):
+        from wagtail.images.models import Filter
+
+        try:
+            # Use a fresh instance rather than sharing the requesting thread's one
+            image = image_model._default_manager.get(pk=image_id)
+            return image.create_rendition(Filter(spec=filter_spec), focal_point_key)
+        except Exception:
+            logger.exception(
+                "Failed to generate '%s' rendition for image %d in the background",
+                filter_spec,
+                image_id,
+            )
+            raise
+        finally:
+            # This runs on a pool thread, which has its own database connections
+            connections.close_all()
+
+
+_generator = None
+_generator_lock = threading.Lock()
+
+
+def get_deferred_rendition_generator():
+    """
+    Return the DeferredRenditionGenerator for this process
+    """
+    global _generator
+
+    with _generator_lock:
+        if _generator is None:
+            _generator = DeferredRenditionGenerator(
+                max_workers=getattr(
+                    settings, "WAGTAILIMAGES_DEFERRED_RENDITIONS_WORKERS", 2
+                )
+            )
+        return _generator
@@ -0,0 +1,254 @@
+import multiprocessing
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from wagtail.images import get_image_model
+from wagtail.images.exceptions import InvalidFilterSpecError
+from wagtail.images.models import Filter, SourceImageIOError
+
+DEFAULT_CHUNK_SIZE = 100
+
+
+def generate_renditions_for_images(image_ids, filter_specs):
+    """
+    Generate any missing renditions with the given filter specs for the given images.
+    Returns a tuple of (image_ids, renditions_created, errors).
+
+    This is run on the worker processes of the command's pool, so it must be importable
+    at module level and only take picklable arguments.
+    """
+    Image = get_image_model()
+    filters = [Filter(spec=spec) for spec in filter_specs]
+
+    created = 0
+    errors = []
+    for image in Image.objects.filter(id__in=image_ids).prefetch_renditions(
+        *filter_specs
+    ):
+        existing = image.find_existing_renditions(*filters)
+        missing_filters = [filter for filter in filters if filter.spec not in existing]
+        if not missing_filters:
+            continue
+
+        # Generate all of the image's missing renditions together, so that the source
+        # image is only decoded once
+        try:
+            renditions = image.create_renditions(*missing_filters)
+        except SourceImageIOError:
+            # Every rendition of this image fails the same way
+            errors.append(
+                (image.id, missing_filters[0].spec, "source image file not found")
+            )
+            continue
+        except Exception:
+            # Find out which of the filters failed, generating the others one at a time
+            renditions = {}
+            for filter in missing_filters:
+                try:
+                    renditions[filter.spec] = image.create_rendition(filter)
+                except Exception as e:
+                    errors.append((image.id, filter.spec, str(e)))
+
+        image._cache_renditions(renditions.values())
+        created += len(renditions)
+
+    return image_ids, created, errors
+
+
+def _generate_renditions_for_chunk(args):
+    return generate_renditions_for_images(*args)
+
+
+def _init_worker():
+    # Forked workers must not share the parent's database connections
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate missing image renditions with the given filter specs for all images"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "filter_specs",
+            nargs="*",
+            metavar="filter_spec",
+            help="Filter specs to generate renditions for, e.g. 'fill-300x150'",
+        )
+        parser.add_argument(
+            "--from-existing",
+            action="store_true",
+            help="Also generate renditions for every filter spec that has already been used on any image",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=1,
+            help="Number of worker processes to use (default: 1, meaning no pool). Pass 0 to use one per CPU",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="Number of images handed to a worker at a time (default: %d)"
+            % DEFAULT_CHUNK_SIZE,
+        )
+        parser.add_argument(
+            "--start-after",
+            type=int,
+            default=0,
+            help="Only process images with an ID greater than this",
+        )
+        parser.add_argument(
+            "--progress-file",
+            help="File to record the ID of the last processed image in. If it exists, "
+            "processing resumes after that image",
+        )
+
+    def get_filter_specs(self, options):
+        filter_specs = list(options["filter_specs"])
+
+        if options["from_existing"]:
+            Rendition = get_image_model().get_rendition_model()
+            filter_specs.extend(
+                Rendition.objects.order_by("filter_spec")
+                .values_list("filter_spec", flat=True)
+                .distinct()
+            )
+
+        # Remove duplicates, keeping the order they were given in
+        filter_specs = list(dict.fromkeys(filter_specs))
+
+        for spec in filter_specs:
+            try:
+                Filter(spec=spec).operations
+            except InvalidFilterSpecError as e:
+                raise CommandError("Invalid filter spec '%s': %s" % (spec, e))
+
+        return filter_specs
+
+    def get_image_id_chunks(self, start_after, chunk_size):
+        """
+        Yield lists of image IDs in ascending order, using keyset pagination so that
+        the query for each chunk stays cheap however far through the table we are.
+        """
+        Image = get_image_model()
+        last_id = start_after
+
+        while True:
+            image_ids = list(
+                Image.objects.filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", flat=True)[:chunk_size]
+            )
+            if not image_ids:
+                return
+
+            yield image_ids
+            last_id = image_ids[-1]
+
+    def read_progress(self, progress_file):
+        try:
+            with open(progress_file) as f:
+                return int(f.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+        except ValueError:
+            raise CommandError("Could not read progress file '%s'" % progress_file)
+
+    def write_progress(self, progress_file, last_id):
+        # Write to a temporary file first, so an interrupted run never leaves a
+        # truncated progress file behind
+        tmp_file = progress_file + ".tmp"
+        with open(tmp_file, "w") as f:
+            f.write(str(last_id))
+        os.replace(tmp_file, progress_file)
+
+    def handle(self, *args, **options):
+        filter_specs = self.get_filter_specs(options)
+        if not filter_specs:
+            raise CommandError(
+                "No filter specs given. Pass one or more filter specs, or --from-existing"
+            )
+
+        progress_file = options["progress_file"]
+        start_after = options["start_after"]
+        if progress_file:
+            start_after = max(start_after, self.read_progress(progress_file))
+
+        processes = options["processes"]
+        if processes < 0:
+            raise CommandError("--processes must not be negative")
+        processes = processes or os.cpu_count()
+
+        self.stdout.write(
+            "Generating renditions for: %s" % ", ".join(sorted(filter_specs))
+        )
+        if start_after:
+            self.stdout.write("Resuming after image %d" % start_after)
+
+        chunks = (
+            (image_ids, filter_specs)
+            for image_ids in self.get_image_id_chunks(
+                start_after, options["chunk_size"]
+            )
+        )
+
+        if processes > 1:
+            # Workers must be forked from this process, so that they inherit its Django
+            # setup; the default start method on some platforms spawns a fresh
+            # interpreter instead
+            try:
+                mp_context = multiprocessing.get_context("fork")
+            except ValueError:
+                raise CommandError(
+                    "--processes requires the 'fork' multiprocessing start method, which "
+                    "isn't available on this platform"
+                )
+            # Close this process's connections first, so they aren't shared
+            connections.close_all()
+            pool = mp_context.Pool(processes, initializer=_init_worker)
+            # imap() yields results in order, so the recorded progress never skips
+            # over a chunk that hasn't finished yet
+            results = pool.imap(_generate_renditions_for_chunk, chunks)
+        else:
+            pool = None
+            results = map(_generate_renditions_for_chunk, chunks)
+
+        images_processed = 0
+        renditions_created = 0
+        error_count = 0
+        try:
+            for image_ids, created, errors in results:
+                images_processed += len(image_ids)
+                renditions_created += created
+                error_count += len(errors)
+
+                for image_id, spec, message in errors:
+                    self.stderr.write(
+                        "Failed to generate '%s' rendition for image %d: %s"
+                        % (spec, image_id, message)
+                    )
+
+                if progress_file:
+                    self.write_progress(progress_file, image_ids[-1])
+
+                if options["verbosity"] >= 2:
+                    self.stdout.write(
+                        "Processed %d images (up to image %d)"
+                        % (images_processed, image_ids[-1])
+                    )
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Processed %d images, created %d renditions (%d errors)"
+                % (images_processed, renditions_created, error_count)
+            )
+        )
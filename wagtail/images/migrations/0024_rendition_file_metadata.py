@@ -0,0 +1,28 @@
+# Generated by Django 4.0.10 on 2026-10-17 06:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wagtailimages", "0023_add_choose_permissions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="rendition",
+            name="content_type",
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name="rendition",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="rendition",
+            name="file_hash",
+            field=models.CharField(blank=True, editable=False, max_length=40),
+        ),
+    ]
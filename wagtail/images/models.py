@@ -1,4 +1,5 @@
 import hashlib
+import imghdr
 import logging
 import os.path
 import time
@@ -45,7 +46,22 @@ class SourceImageIOError(IOError):
 
 
 class ImageQuerySet(SearchableQuerySetMixin, models.QuerySet):
-    pass
+    def prefetch_renditions(self, *filters):
+        """
+        Prefetch the existing renditions for the given filters (or filter spec strings)
+        with a single query, so that calling get_rendition() or get_renditions() with
+        those filters on the resulting images does not need any further lookups.
+        """
+        filter_specs = [
+            filter.spec if isinstance(filter, Filter) else filter for filter in filters
+        ]
+        rendition_model = self.model.get_rendition_model()
+        return self.prefetch_related(
+            models.Prefetch(
+                "renditions",
+                queryset=rendition_model.objects.filter(filter_spec__in=filter_specs),
+            )
+        )
 
 
 def get_upload_to(instance, filename):
@@ -304,88 +320,285 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
         if isinstance(filter, str):
             filter = Filter(spec=filter)
 
-        cache_key = filter.get_cache_key(self)
+        return self.get_renditions(filter)[filter.spec]
+
+    def get_renditions(self, *filters):
+        """
+        Return a dict mapping each of the given filter specs to a rendition of this image,
+        generating only those renditions that do not exist yet.
+
+        Existing renditions are looked up with one cache.get_many() call and (for any not in
+        the cache) a single database query; renditions prefetched with
+        ImageQuerySet.prefetch_renditions() are used without any lookups at all.
+        Missing renditions are generated together with create_renditions(), so the source
+        image is only decoded once.
+
+        If WAGTAILIMAGES_DEFERRED_RENDITIONS is enabled, missing renditions are generated in
+        the background, and placeholder renditions pointing at the image serve view are
+        returned in the meantime.
+        """
+        filters = [
+            Filter(spec=filter) if isinstance(filter, str) else filter
+            for filter in filters
+        ]
+
+        renditions = self.find_existing_renditions(*filters)
+
+        # Remove duplicates, so that each missing rendition is only generated once
+        missing_filters = list(
+            {
+                filter.spec: filter
+                for filter in filters
+                if filter.spec not in renditions
+            }.values()
+        )
+
+        if missing_filters:
+            if getattr(settings, "WAGTAILIMAGES_DEFERRED_RENDITIONS", False):
+                for filter in missing_filters:
+                    renditions[filter.spec] = self.get_deferred_rendition(filter)
+            else:
+                created = self.create_renditions(*missing_filters)
+                for rendition in created.values():
+                    self._add_to_prefetched_renditions(rendition)
+                renditions.update(created)
+                self._cache_renditions(created.values())
+
+        return {filter.spec: renditions[filter.spec] for filter in filters}
+
+    def find_existing_renditions(self, *filters):
+        """
+        Return a dict mapping filter specs to renditions of this image, for those of the
+        given filters that already have a rendition. Missing renditions are not generated.
+        """
+        filters = [
+            Filter(spec=filter) if isinstance(filter, str) else filter
+            for filter in filters
+        ]
+
         Rendition = self.get_rendition_model()
+        focal_point_keys = {
+            filter.spec: filter.get_cache_key(self) for filter in filters
+        }
+        renditions = self._get_prefetched_renditions(focal_point_keys)
 
         try:
-            rendition_caching = True
             cache = caches["renditions"]
-            rendition_cache_key = Rendition.construct_cache_key(
-                self.id, cache_key, filter.spec
-            )
-            cached_rendition = cache.get(rendition_cache_key)
-            if cached_rendition:
-                return cached_rendition
         except InvalidCacheBackendError:
-            rendition_caching = False
+            cache = None
+
+        if cache is not None:
+            cache_keys = {
+                spec: Rendition.construct_cache_key(self.id, focal_point_key, spec)
+                for spec, focal_point_key in focal_point_keys.items()
+                if spec not in renditions
+            }
+            if cache_keys:
+                cached_renditions = cache.get_many(cache_keys.values())
+                for spec, rendition_cache_key in cache_keys.items():
+                    cached_rendition = cached_renditions.get(rendition_cache_key)
+                    if cached_rendition:
+                        renditions[spec] = cached_rendition
+
+        missing_specs = [spec for spec in focal_point_keys if spec not in renditions]
+        if missing_specs:
+            found = [
+                rendition
+                for rendition in self.renditions.filter(filter_spec__in=missing_specs)
+                if rendition.focal_point_key == focal_point_keys[rendition.filter_spec]
+            ]
+            for rendition in found:
+                renditions[rendition.filter_spec] = rendition
+            self._cache_renditions(found)
+
+        return renditions
+
+    def _cache_renditions(self, renditions):
+        if not renditions:
+            return
 
         try:
-            rendition = self.renditions.get(
-                filter_spec=filter.spec,
-                focal_point_key=cache_key,
-            )
-        except Rendition.DoesNotExist:
-            # Generate the rendition image
-            try:
-                logger.debug(
-                    "Generating '%s' rendition for image %d",
-                    filter.spec,
-                    self.pk,
-                )
+            cache = caches["renditions"]
+        except InvalidCacheBackendError:
+            return
+
+        cache.set_many(
+            {
+                rendition.construct_cache_key(
+                    self.id, rendition.focal_point_key, rendition.filter_spec
+                ): rendition
+                for rendition in renditions
+            }
+        )
+
+    def get_deferred_rendition(self, filter):
+        """
+        Queue the given rendition to be generated in the background, and return an unsaved
+        placeholder rendition whose URL points at the image serve view, which generates the
+        rendition on demand if it is not ready by the time it is requested.
+        """
+        from wagtail.images.deferred_renditions import get_deferred_rendition_generator
+        from wagtail.images.views.serve import generate_image_url
 
-                start_time = time.time()
-                generated_image = filter.run(self, BytesIO())
+        focal_point_key = filter.get_cache_key(self)
+        get_deferred_rendition_generator().submit(self, filter, focal_point_key)
 
-                logger.debug(
-                    "Generated '%s' rendition for image %d in %.1fms",
-                    filter.spec,
-                    self.pk,
-                    (time.time() - start_time) * 1000,
-                )
-            except:  # noqa:B901,E722
-                logger.debug(
-                    "Failed to generate '%s' rendition for image %d",
-                    filter.spec,
-                    self.pk,
-                )
-                raise
+        Rendition = self.get_rendition_model()
+        rendition = Rendition(
+            image=self, filter_spec=filter.spec, focal_point_key=focal_point_key
+        )
+        rendition.width, rendition.height = filter.get_transform(self).size
+        rendition.pending_url = generate_image_url(
+            self,
+            filter.spec,
+            getattr(
+                settings,
+                "WAGTAILIMAGES_DEFERRED_RENDITIONS_VIEWNAME",
+                "wagtailimages_serve",
+            ),
+        )
+        return rendition
+
+    def _get_prefetched_renditions(self, focal_point_keys):
+        """
+        Return a dict of filter spec to rendition for any renditions matching the given
+        filter specs and focal point keys that were loaded by prefetch_renditions()
+        """
+        found = {}
+        if "renditions" not in getattr(self, "_prefetched_objects_cache", {}):
+            return found
+
+        for rendition in self.renditions.all():
+            if (
+                rendition.filter_spec in focal_point_keys
+                and focal_point_keys[rendition.filter_spec] == rendition.focal_point_key
+            ):
+                found[rendition.filter_spec] = rendition
+        return found
+
+    def _add_to_prefetched_renditions(self, rendition):
+        # Keep any prefetched renditions up to date, so that asking for the same
+        # rendition again doesn't regenerate it
+        try:
+            self._prefetched_objects_cache["renditions"]._result_cache.append(rendition)
+        except (AttributeError, KeyError):
+            pass
 
-            # Generate filename
-            input_filename = os.path.basename(self.file.name)
-            input_filename_without_extension, input_extension = os.path.splitext(
-                input_filename
+    def create_rendition(self, filter, focal_point_key=None):
+        """
+        Generate the rendition image for the given filter and save it as a new rendition.
+        If another process creates the same rendition at the same time, that rendition is
+        returned instead.
+        """
+        if focal_point_key is None:
+            focal_point_key = filter.get_cache_key(self)
+
+        # Generate the rendition image
+        try:
+            logger.debug(
+                "Generating '%s' rendition for image %d",
+                filter.spec,
+                self.pk,
             )
 
-            # A mapping of image formats to extensions
-            FORMAT_EXTENSIONS = {
-                "jpeg": ".jpg",
-                "png": ".png",
-                "gif": ".gif",
-                "webp": ".webp",
-            }
+            start_time = time.time()
+            generated_image = filter.run(self, BytesIO())
 
-            output_extension = (
-                filter.spec.replace("|", ".")
-                + FORMAT_EXTENSIONS[generated_image.format_name]
+            logger.debug(
+                "Generated '%s' rendition for image %d in %.1fms",
+                filter.spec,
+                self.pk,
+                (time.time() - start_time) * 1000,
+            )
+        except:  # noqa:B901,E722
+            logger.debug(
+                "Failed to generate '%s' rendition for image %d",
+                filter.spec,
+                self.pk,
             )
-            if cache_key:
-                output_extension = cache_key + "." + output_extension
+            raise
 
-            # Truncate filename to prevent it going over 60 chars
-            output_filename_without_extension = input_filename_without_extension[
-                : (59 - len(output_extension))
-            ]
-            output_filename = output_filename_without_extension + "." + output_extension
+        return self._save_rendition(filter, focal_point_key, generated_image)
+
+    def create_renditions(self, *filters):
+        """
+        Generate the rendition images for all of the given filters and save them as new
+        renditions, returning a dict mapping filter specs to renditions. The source image
+        is only opened and decoded once, however many filters there are.
+        """
+        filters = [
+            Filter(spec=filter) if isinstance(filter, str) else filter
+            for filter in filters
+        ]
+        if len(filters) == 1:
+            return {filters[0].spec: self.create_rendition(filters[0])}
 
-            rendition, created = self.renditions.get_or_create(
-                filter_spec=filter.spec,
-                focal_point_key=cache_key,
-                defaults={"file": File(generated_image.f, name=output_filename)},
+        specs = ", ".join(filter.spec for filter in filters)
+        try:
+            logger.debug("Generating '%s' renditions for image %d", specs, self.pk)
+
+            start_time = time.time()
+            generated_images = Filter.run_many(
+                filters, self, [BytesIO() for filter in filters]
+            )
+
+            logger.debug(
+                "Generated '%s' renditions for image %d in %.1fms",
+                specs,
+                self.pk,
+                (time.time() - start_time) * 1000,
             )
+        except:  # noqa:B901,E722
+            logger.debug(
+                "Failed to generate '%s' renditions for image %d", specs, self.pk
+            )
+            raise
 
-        if rendition_caching:
-            cache.set(rendition_cache_key, rendition)
+        return {
+            filter.spec: self._save_rendition(
+                filter, filter.get_cache_key(self), generated_image
+            )
+            for filter, generated_image in zip(filters, generated_images)
+        }
+
+    def _save_rendition(self, filter, focal_point_key, generated_image):
+        # Generate filename
+        input_filename = os.path.basename(self.file.name)
+        input_filename_without_extension, input_extension = os.path.splitext(
+            input_filename
+        )
 
+        # A mapping of image formats to extensions
+        FORMAT_EXTENSIONS = {
+            "jpeg": ".jpg",
+            "png": ".png",
+            "gif": ".gif",
+            "webp": ".webp",
+        }
+
+        output_extension = (
+            filter.spec.replace("|", ".")
+            + FORMAT_EXTENSIONS[generated_image.format_name]
+        )
+        if focal_point_key:
+            output_extension = focal_point_key + "." + output_extension
+
+        # Truncate filename to prevent it going over 60 chars
+        output_filename_without_extension = input_filename_without_extension[
+            : (59 - len(output_extension))
+        ]
+        output_filename = output_filename_without_extension + "." + output_extension
+
+        file_contents = generated_image.f.getvalue()
+        rendition, created = self.renditions.get_or_create(
+            filter_spec=filter.spec,
+            focal_point_key=focal_point_key,
+            defaults={
+                "file": File(generated_image.f, name=output_filename),
+                "content_type": "image/" + generated_image.format_name,
+                "file_hash": hashlib.sha1(file_contents).hexdigest(),
+            },
+        )
         return rendition
 
     def is_portrait(self):
@@ -507,75 +720,157 @@ class Filter:
             # Fix orientation of image
             willow = willow.auto_orient()
 
-            # Transform the image
+            return self._run(image, output, willow, original_format)
+
+    @classmethod
+    def run_many(cls, filters, image, outputs):
+        """
+        Run each of the given filters on the image, writing the results to the
+        corresponding item of outputs, and return a list of the results.
+
+        This is equivalent to calling filter.run(image, output) for each filter, except
+        that the source image is only opened, decoded and oriented once. Renditions that
+        only scale the whole image down are made from the smallest previously generated
+        rendition that is still at least twice their size, rather than from the original.
+        """
+        filters = list(filters)
+        outputs = list(outputs)
+        if len(filters) != len(outputs):
+            raise ValueError("run_many() needs exactly one output per filter")
+
+        with image.get_willow_image() as willow:
+            original_format = willow.format_name
+
+            # Fix orientation of image
+            willow = willow.auto_orient()
+
+            # Pillow decodes lazily; make sure it has read the whole file before it is
+            # closed, and that the decoding isn't repeated for each filter
+            if hasattr(willow.image, "load"):
+                willow.image.load()
+
+        size = (willow.image.width, willow.image.height)
+        transforms = [filter.get_transform(image, size) for filter in filters]
+
+        # Generate the largest renditions first, so that they can be reused as sources
+        # for the smaller ones
+        order = sorted(
+            range(len(filters)),
+            key=lambda i: transforms[i].size[0] * transforms[i].size[1],
+            reverse=True,
+        )
+
+        scaled_images = []
+        results = [None] * len(filters)
+        for i in order:
+            results[i] = filters[i]._run(
+                image,
+                outputs[i],
+                willow,
+                original_format,
+                transform=transforms[i],
+                scaled_images=scaled_images,
+            )
+        return results
+
+    def _run(
+        self,
+        image,
+        output,
+        willow,
+        original_format,
+        transform=None,
+        scaled_images=None,
+    ):
+        # Transform the image
+        if transform is None:
             transform = self.get_transform(
                 image, (willow.image.width, willow.image.height)
             )
-            willow = willow.crop(transform.get_rect().round())
+
+        rect = transform.get_rect().round()
+        if scaled_images is not None and rect == (
+            0,
+            0,
+            willow.image.width,
+            willow.image.height,
+        ):
+            # This is a plain downscale of the whole image, so it can be made from an
+            # earlier one if there is one big enough to give the same quality
+            width, height = transform.size
+            source = willow
+            for scaled_image in scaled_images:
+                if (
+                    scaled_image.image.width >= width * 2
+                    and scaled_image.image.height >= height * 2
+                ):
+                    source = scaled_image
+            willow = source.resize(transform.size)
+            scaled_images.append(willow)
+        else:
+            willow = willow.crop(rect)
             willow = willow.resize(transform.size)
 
-            # Apply filters
-            env = {
-                "original-format": original_format,
+        # Apply filters
+        env = {
+            "original-format": original_format,
+        }
+        for operation in self.filter_operations:
+            willow = operation.run(willow, image, env) or willow
+
+        # Find the output format to use
+        if "output-format" in env:
+            # Developer specified an output format
+            output_format = env["output-format"]
+        else:
+            # Convert bmp and webp to png by default
+            default_conversions = {
+                "bmp": "png",
+                "webp": "png",
             }
-            for operation in self.filter_operations:
-                willow = operation.run(willow, image, env) or willow
 
-            # Find the output format to use
-            if "output-format" in env:
-                # Developer specified an output format
-                output_format = env["output-format"]
-            else:
-                # Convert bmp and webp to png by default
-                default_conversions = {
-                    "bmp": "png",
-                    "webp": "png",
-                }
-
-                # Convert unanimated GIFs to PNG as well
-                if not willow.has_animation():
-                    default_conversions["gif"] = "png"
-
-                # Allow the user to override the conversions
-                conversion = getattr(settings, "WAGTAILIMAGES_FORMAT_CONVERSIONS", {})
-                default_conversions.update(conversion)
-
-                # Get the converted output format falling back to the original
-                output_format = default_conversions.get(
-                    original_format, original_format
-                )
+            # Convert unanimated GIFs to PNG as well
+            if not willow.has_animation():
+                default_conversions["gif"] = "png"
 
-            if output_format == "jpeg":
-                # Allow changing of JPEG compression quality
-                if "jpeg-quality" in env:
-                    quality = env["jpeg-quality"]
-                else:
-                    quality = getattr(settings, "WAGTAILIMAGES_JPEG_QUALITY", 85)
+            # Allow the user to override the conversions
+            conversion = getattr(settings, "WAGTAILIMAGES_FORMAT_CONVERSIONS", {})
+            default_conversions.update(conversion)
 
-                # If the image has an alpha channel, give it a white background
-                if willow.has_alpha():
-                    willow = willow.set_background_color_rgb((255, 255, 255))
+            # Get the converted output format falling back to the original
+            output_format = default_conversions.get(original_format, original_format)
 
-                return willow.save_as_jpeg(
-                    output, quality=quality, progressive=True, optimize=True
-                )
-            elif output_format == "png":
-                return willow.save_as_png(output, optimize=True)
-            elif output_format == "gif":
-                return willow.save_as_gif(output)
-            elif output_format == "webp":
-                # Allow changing of WebP compression quality
-                if (
-                    "output-format-options" in env
-                    and "lossless" in env["output-format-options"]
-                ):
-                    return willow.save_as_webp(output, lossless=True)
-                elif "webp-quality" in env:
-                    quality = env["webp-quality"]
-                else:
-                    quality = getattr(settings, "WAGTAILIMAGES_WEBP_QUALITY", 85)
+        if output_format == "jpeg":
+            # Allow changing of JPEG compression quality
+            if "jpeg-quality" in env:
+                quality = env["jpeg-quality"]
+            else:
+                quality = getattr(settings, "WAGTAILIMAGES_JPEG_QUALITY", 85)
+
+            # If the image has an alpha channel, give it a white background
+            if willow.has_alpha():
+                willow = willow.set_background_color_rgb((255, 255, 255))
+
+            return willow.save_as_jpeg(
+                output, quality=quality, progressive=True, optimize=True
+            )
+        elif output_format == "png":
+            return willow.save_as_png(output, optimize=True)
+        elif output_format == "gif":
+            return willow.save_as_gif(output)
+        elif output_format == "webp":
+            # Allow changing of WebP compression quality
+            if (
+                "output-format-options" in env
+                and "lossless" in env["output-format-options"]
+            ):
+                return willow.save_as_webp(output, lossless=True)
+            elif "webp-quality" in env:
+                quality = env["webp-quality"]
+            else:
+                quality = getattr(settings, "WAGTAILIMAGES_WEBP_QUALITY", 85)
 
-                return willow.save_as_webp(output, quality=quality)
+            return willow.save_as_webp(output, quality=quality)
 
     def get_cache_key(self, image):
         vary_parts = []
@@ -604,9 +899,19 @@ class AbstractRendition(ImageFileMixin, models.Model):
     focal_point_key = models.CharField(
         max_length=16, blank=True, default="", editable=False
     )
+    content_type = models.CharField(max_length=100, blank=True, editable=False)
+    # A SHA-1 hash of the file contents
+    file_hash = models.CharField(max_length=40, blank=True, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True, null=True, editable=False)
+
+    # Set on placeholder renditions returned while the real rendition is being
+    # generated in the background (see AbstractImage.get_deferred_rendition)
+    pending_url = None
 
     @property
     def url(self):
+        if self.pending_url:
+            return self.pending_url
         return self.file.url
 
     @property
@@ -683,6 +988,31 @@ class AbstractRendition(ImageFileMixin, models.Model):
     def __html__(self):
         return self.img_tag()
 
+    def _set_file_metadata(self, file_contents):
+        image_format = imghdr.what(None, h=file_contents)
+        self.content_type = (
+            "image/" + image_format if image_format else "application/octet-stream"
+        )
+        self.file_hash = hashlib.sha1(file_contents).hexdigest()
+
+    def _ensure_file_metadata(self):
+        # Renditions created before the content type and hash were stored on the row
+        # have them filled in the first time they are needed
+        if self.file_hash == "" or self.content_type == "":
+            with self.open_file() as f:
+                self._set_file_metadata(f.read())
+
+            self.save(update_fields=["content_type", "file_hash"])
+            self.purge_from_cache()
+
+    def get_content_type(self):
+        self._ensure_file_metadata()
+        return self.content_type
+
+    def get_file_hash(self):
+        self._ensure_file_metadata()
+        return self.file_hash
+
     def get_upload_to(self, filename):
         folder_name = "images"
         filename = self.file.field.storage.get_valid_name(filename)
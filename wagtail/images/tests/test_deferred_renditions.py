@@ -0,0 +1,155 @@
+from concurrent.futures import Future
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from wagtail.images.deferred_renditions import DeferredRenditionGenerator
+from wagtail.images.models import Rendition
+from wagtail.images.utils import generate_signature
+
+from .utils import Image, get_test_image_file
+
+
+class ManualExecutor:
+    """
+    An executor that only runs submitted jobs when asked to
+    """
+
+    def __init__(self):
+        self.jobs = []
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.jobs.append((future, fn, args))
+        return future
+
+    def run_all(self):
+        jobs, self.jobs = self.jobs, []
+        for future, fn, args in jobs:
+            future.set_result(fn(*args))
+
+
+@override_settings(WAGTAILIMAGES_DEFERRED_RENDITIONS=True)
+class TestDeferredRenditions(TestCase):
+    def setUp(self):
+        self.image = Image.objects.create(
+            title="Test image",
+            file=get_test_image_file(),
+        )
+        self.executor = ManualExecutor()
+        self.generator = DeferredRenditionGenerator(executor=self.executor)
+
+        patcher = mock.patch(
+            "wagtail.images.deferred_renditions._generator", self.generator
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # The generator closes its thread's database connections when done; don't
+        # close the connection used by the test case
+        patcher = mock.patch("wagtail.images.deferred_renditions.connections")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_get_rendition_returns_placeholder(self):
+        rendition = self.image.get_rendition("width-400")
+
+        self.assertIsNone(rendition.pk)
+        self.assertEqual(rendition.width, 400)
+        self.assertEqual(rendition.height, 300)
+        self.assertEqual(
+            rendition.url,
+            reverse(
+                "wagtailimages_serve",
+                args=(
+                    generate_signature(self.image.id, "width-400"),
+                    self.image.id,
+                    "width-400",
+                ),
+            )
+            + self.image.file.name[len("original_images/") :],
+        )
+        self.assertIn('width="400"', rendition.img_tag())
+        self.assertFalse(self.image.renditions.exists())
+
+    def test_pending_renditions_are_only_queued_once(self):
+        self.image.get_rendition("width-400")
+        self.image.get_rendition("width-400")
+        Image.objects.get(id=self.image.id).get_rendition("width-400")
+        self.image.get_rendition("width-200")
+
+        self.assertEqual(len(self.executor.jobs), 2)
+
+    def test_rendition_is_used_once_generated(self):
+        self.image.get_rendition("width-400")
+        self.executor.run_all()
+
+        rendition = self.image.renditions.get(filter_spec="width-400")
+        self.assertEqual(rendition.width, 400)
+        self.assertIsNone(
+            self.generator.get_pending(
+                self.image, "width-400", rendition.focal_point_key
+            )
+        )
+
+        self.assertEqual(self.image.get_rendition("width-400"), rendition)
+        self.assertEqual(self.executor.jobs, [])
+
+    @override_settings(
+        CACHES={
+            "renditions": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            },
+        },
+    )
+    def test_placeholders_are_not_cached(self):
+        rendition = self.image.get_rendition("width-400")
+
+        cache_key = Rendition.construct_cache_key(
+            self.image.id, rendition.focal_point_key, "width-400"
+        )
+        self.assertIsNone(caches["renditions"].get(cache_key))
+
+    def test_serve_view_generates_rendition(self):
+        rendition = self.image.get_rendition("width-400")
+
+        # Simulate the rendition having been queued by another process
+        self.generator._pending.clear()
+
+        response = self.client.get(rendition.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertTrue(self.image.renditions.filter(filter_spec="width-400").exists())
+
+    def test_serve_view_waits_for_pending_rendition(self):
+        rendition = self.image.get_rendition("width-400")
+        future = self.generator.get_pending(
+            self.image, "width-400", rendition.focal_point_key
+        )
+        self.executor.run_all()
+        self.assertTrue(future.done())
+
+        # Simulate the request arriving while the rendition is still pending
+        with mock.patch.object(
+            self.generator, "get_pending", return_value=future
+        ), mock.patch.object(
+            Image, "find_existing_renditions", return_value={}
+        ), mock.patch.object(
+            Image, "create_rendition"
+        ) as create_rendition:
+            response = self.client.get(rendition.url)
+
+        self.assertEqual(response.status_code, 200)
+        create_rendition.assert_not_called()
+
+    @override_settings(WAGTAILIMAGES_DEFERRED_RENDITIONS_TIMEOUT=0)
+    def test_serve_view_generates_rendition_if_pending_times_out(self):
+        rendition = self.image.get_rendition("width-400")
+
+        response = self.client.get(rendition.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(self.image.renditions.filter(filter_spec="width-400").exists())
@@ -2,6 +2,8 @@ from io import BytesIO
 from unittest.mock import patch
 
 from django.test import TestCase, override_settings
+from willow.image import Image as WillowImage
+from willow.plugins.pillow import PillowImage
 
 from wagtail.core import hooks
 from wagtail.images import image_operations
@@ -599,6 +601,79 @@ class TestFilter(TestCase):
         self.assertEqual(run_mock.call_count, 2)
 
 
+class TestFilterRunMany(TestCase):
+    def setUp(self):
+        self.image = Image.objects.create(
+            title="Test image",
+            file=get_test_image_file_jpeg(size=(1600, 1200)),
+        )
+
+    def test_run_many(self):
+        filters = [
+            Filter(spec="width-100"),
+            Filter(spec="width-800|format-png"),
+            Filter(spec="fill-50x50"),
+        ]
+        results = Filter.run_many(
+            filters, self.image, [BytesIO() for filter in filters]
+        )
+
+        self.assertEqual(
+            [result.format_name for result in results], ["jpeg", "png", "jpeg"]
+        )
+        sizes = []
+        for result in results:
+            result.f.seek(0)
+            sizes.append(WillowImage.open(result.f).get_size())
+        self.assertEqual(sizes, [(100, 75), (800, 600), (50, 50)])
+
+    def test_run_many_opens_image_once(self):
+        filters = [Filter(spec="width-100"), Filter(spec="width-400")]
+        with patch.object(
+            Image, "get_willow_image", autospec=True, side_effect=Image.get_willow_image
+        ) as get_willow_image:
+            Filter.run_many(filters, self.image, [BytesIO(), BytesIO()])
+
+        self.assertEqual(get_willow_image.call_count, 1)
+
+    def test_run_many_downscales_from_larger_rendition(self):
+        filters = [Filter(spec="width-100"), Filter(spec="width-400")]
+        with patch(
+            "willow.plugins.pillow.PillowImage.resize",
+            autospec=True,
+            side_effect=PillowImage.resize,
+        ) as resize:
+            Filter.run_many(filters, self.image, [BytesIO(), BytesIO()])
+
+        # The 400px wide rendition is made first, and the 100px one is made from it
+        self.assertEqual(
+            [call[0][0].get_size() for call in resize.call_args_list],
+            [(1600, 1200), (400, 300)],
+        )
+
+    def test_run_many_does_not_downscale_cropped_renditions(self):
+        filters = [Filter(spec="width-800"), Filter(spec="fill-100x100")]
+        with patch(
+            "willow.plugins.pillow.PillowImage.resize",
+            autospec=True,
+            side_effect=PillowImage.resize,
+        ) as resize:
+            Filter.run_many(filters, self.image, [BytesIO(), BytesIO()])
+
+        self.assertEqual(
+            [call[0][0].get_size() for call in resize.call_args_list],
+            [(1600, 1200), (1200, 1200)],
+        )
+
+    def test_run_many_matches_run(self):
+        filters = [Filter(spec="width-400"), Filter(spec="fill-100x100")]
+        results = Filter.run_many(filters, self.image, [BytesIO(), BytesIO()])
+
+        for filter, result in zip(filters, results):
+            expected = filter.run(self.image, BytesIO())
+            self.assertEqual(result.f.getvalue(), expected.f.getvalue())
+
+
 class TestFormatFilter(TestCase):
     def test_jpeg(self):
         fil = Filter(spec="width-400|format-jpeg")
@@ -0,0 +1,154 @@
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from wagtail.images.models import Rendition
+
+from .utils import Image, get_test_image_file
+
+
+class TestGenerateRenditions(TestCase):
+    def setUp(self):
+        self.images = [
+            Image.objects.create(
+                title="Test image %d" % i,
+                file=get_test_image_file(),
+            )
+            for i in range(3)
+        ]
+
+    def run_command(self, *args, **options):
+        stdout = StringIO()
+        stderr = StringIO()
+        call_command(
+            "generate_renditions", *args, stdout=stdout, stderr=stderr, **options
+        )
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_generates_missing_renditions(self):
+        self.images[0].get_rendition("width-400")
+
+        stdout, stderr = self.run_command("width-400", "fill-100x100")
+
+        for image in self.images:
+            self.assertEqual(
+                set(image.renditions.values_list("filter_spec", flat=True)),
+                {"width-400", "fill-100x100"},
+            )
+        self.assertIn("Processed 3 images, created 5 renditions (0 errors)", stdout)
+        self.assertEqual(stderr, "")
+
+    def test_from_existing(self):
+        self.images[0].get_rendition("width-400")
+        self.images[1].get_rendition("height-50")
+
+        self.run_command("--from-existing")
+
+        self.assertEqual(
+            Rendition.objects.filter(filter_spec="width-400").count(), len(self.images)
+        )
+        self.assertEqual(
+            Rendition.objects.filter(filter_spec="height-50").count(), len(self.images)
+        )
+
+    def test_start_after(self):
+        self.run_command("width-400", start_after=self.images[0].id)
+
+        self.assertFalse(self.images[0].renditions.exists())
+        self.assertTrue(self.images[1].renditions.exists())
+        self.assertTrue(self.images[2].renditions.exists())
+
+    def test_progress_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            progress_file = os.path.join(tmp_dir, "progress")
+            with open(progress_file, "w") as f:
+                f.write(str(self.images[1].id))
+
+            stdout, stderr = self.run_command(
+                "width-400", progress_file=progress_file, chunk_size=1
+            )
+
+            with open(progress_file) as f:
+                self.assertEqual(f.read(), str(self.images[2].id))
+
+        self.assertIn("Resuming after image %d" % self.images[1].id, stdout)
+        self.assertFalse(self.images[0].renditions.exists())
+        self.assertFalse(self.images[1].renditions.exists())
+        self.assertTrue(self.images[2].renditions.exists())
+
+    def test_missing_source_file(self):
+        self.images[0].file.delete(save=False)
+
+        stdout, stderr = self.run_command("width-400", "width-200")
+
+        self.assertIn(
+            "Failed to generate 'width-400' rendition for image %d" % self.images[0].id,
+            stderr,
+        )
+        self.assertIn("created 4 renditions (1 errors)", stdout)
+
+    def test_missing_renditions_are_generated_together(self):
+        self.images[0].get_rendition("width-400")
+
+        with mock.patch.object(
+            Image,
+            "create_renditions",
+            autospec=True,
+            side_effect=Image.create_renditions,
+        ) as create_renditions:
+            self.run_command("width-400", "fill-100x100", "width-200")
+
+        # One call per image, so that each source image is only decoded once
+        self.assertEqual(create_renditions.call_count, len(self.images))
+        calls = {
+            call.args[0].id: sorted(filter.spec for filter in call.args[1:])
+            for call in create_renditions.call_args_list
+        }
+        self.assertEqual(calls[self.images[0].id], ["fill-100x100", "width-200"])
+        self.assertEqual(
+            calls[self.images[1].id], ["fill-100x100", "width-200", "width-400"]
+        )
+
+    def test_failed_batch_falls_back_to_single_renditions(self):
+        with mock.patch.object(
+            Image, "create_renditions", side_effect=ValueError("Decoding failed")
+        ):
+            stdout, stderr = self.run_command("width-400", "width-200")
+
+        self.assertIn("created 6 renditions (0 errors)", stdout)
+
+    def test_processes_are_forked(self):
+        pool = mock.Mock()
+        pool.imap.side_effect = lambda func, iterable: map(func, iterable)
+
+        with mock.patch(
+            "wagtail.images.management.commands.generate_renditions.multiprocessing.get_context",
+            return_value=mock.Mock(Pool=mock.Mock(return_value=pool)),
+        ) as get_context:
+            self.run_command("width-400", processes=2)
+
+        # Workers are always forked, whatever the platform's default start method
+        get_context.assert_called_once_with("fork")
+        for image in self.images:
+            self.assertTrue(image.renditions.filter(filter_spec="width-400").exists())
+
+    def test_processes_require_fork(self):
+        with mock.patch(
+            "wagtail.images.management.commands.generate_renditions.multiprocessing.get_context",
+            side_effect=ValueError("cannot find context for 'fork'"),
+        ):
+            with self.assertRaises(CommandError):
+                self.run_command("width-400", processes=2)
+
+    def test_invalid_filter_spec(self):
+        with self.assertRaises(CommandError):
+            self.run_command("bogus-400")
+
+    def test_no_filter_specs(self):
+        with self.assertRaises(CommandError):
+            self.run_command()
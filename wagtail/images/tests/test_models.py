@@ -1,4 +1,5 @@
 import unittest
+from unittest import mock
 
 from django.contrib.auth.models import Group, Permission
 from django.core.cache import caches
@@ -346,6 +347,105 @@ class TestRenditions(TestCase):
             rendition.background_position_style, "background-position: 50% 50%;"
         )
 
+    def test_get_renditions(self):
+        renditions = self.image.get_renditions("width-400", "max-100x100", "original")
+
+        self.assertEqual(list(renditions), ["width-400", "max-100x100", "original"])
+        self.assertEqual(renditions["width-400"].width, 400)
+        self.assertEqual(renditions["max-100x100"].width, 100)
+        self.assertEqual(renditions["original"].width, 640)
+        self.assertEqual(renditions["width-400"], self.image.get_rendition("width-400"))
+
+    def test_get_renditions_only_generates_missing(self):
+        existing = self.image.get_rendition("width-400")
+
+        with mock.patch.object(
+            Image, "create_rendition", autospec=True, wraps=Image.create_rendition
+        ) as create_rendition:
+            renditions = self.image.get_renditions("width-400", "width-200")
+
+        self.assertEqual(renditions["width-400"], existing)
+        self.assertEqual(create_rendition.call_count, 1)
+        self.assertEqual(create_rendition.call_args[0][1].spec, "width-200")
+
+    def test_get_renditions_decodes_source_once(self):
+        with mock.patch.object(
+            Image, "get_willow_image", autospec=True, side_effect=Image.get_willow_image
+        ) as get_willow_image:
+            renditions = self.image.get_renditions(
+                "width-400", "width-200", "fill-100x100"
+            )
+
+        self.assertEqual(get_willow_image.call_count, 1)
+        self.assertEqual(renditions["width-200"].width, 200)
+        self.assertEqual(renditions["fill-100x100"].height, 100)
+        self.assertEqual(self.image.renditions.count(), 3)
+
+    def test_get_renditions_existing_uses_one_query(self):
+        self.image.get_renditions("width-400", "width-200", "fill-100x100")
+
+        with self.assertNumQueries(1):
+            renditions = self.image.get_renditions(
+                "width-400", "width-200", "fill-100x100"
+            )
+        self.assertEqual(len(renditions), 3)
+
+    @override_settings(
+        CACHES={
+            "renditions": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            },
+        },
+    )
+    def test_get_renditions_uses_cache(self):
+        renditions = self.image.get_renditions("width-400", "width-200")
+
+        cache = caches["renditions"]
+        for spec, rendition in renditions.items():
+            self.assertEqual(
+                cache.get(
+                    Rendition.construct_cache_key(
+                        self.image.id, rendition.focal_point_key, spec
+                    )
+                ),
+                rendition,
+            )
+
+        with self.assertNumQueries(0):
+            self.image.get_renditions("width-400", "width-200")
+
+    def test_prefetch_renditions(self):
+        self.image.get_renditions("width-400", "width-200")
+        other_image = Image.objects.create(
+            title="Other image",
+            file=get_test_image_file(),
+        )
+        other_image.get_renditions("width-400", "width-200")
+
+        with self.assertNumQueries(2):
+            images = list(
+                Image.objects.filter(
+                    id__in=[self.image.id, other_image.id]
+                ).prefetch_renditions("width-400", "width-200")
+            )
+
+        with self.assertNumQueries(0):
+            for image in images:
+                self.assertEqual(image.get_rendition("width-400").width, 400)
+                self.assertEqual(
+                    image.get_renditions("width-200")["width-200"].width, 200
+                )
+
+    def test_prefetch_renditions_missing_rendition(self):
+        image = Image.objects.prefetch_renditions("width-400").get(id=self.image.id)
+
+        rendition = image.get_rendition("width-400")
+        self.assertEqual(rendition.width, 400)
+
+        # The new rendition is added to the prefetched renditions
+        with self.assertNumQueries(0):
+            self.assertEqual(image.get_rendition("width-400"), rendition)
+
 
 class TestUsageCount(TestCase):
     fixtures = ["test.json"]
@@ -1,11 +1,13 @@
 import os
 import unittest
+from unittest import mock
 
 from django import forms, template
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 from django.test import TestCase, override_settings
 from django.urls import reverse
+from django.utils.http import http_date
 from taggit.forms import TagField, TagWidget
 
 from wagtail.images import get_image_model, get_image_model_string
@@ -13,6 +15,7 @@ from wagtail.images.fields import WagtailImageField
 from wagtail.images.formats import Format, get_image_format, register_image_format
 from wagtail.images.forms import get_image_form
 from wagtail.images.models import Image as WagtailImage
+from wagtail.images.models import Rendition
 from wagtail.images.rect import Rect, Vector
 from wagtail.images.utils import generate_signature, verify_signature
 from wagtail.images.views.serve import ServeView
@@ -342,6 +345,95 @@ class TestFrontendServeView(TestCase):
         self.assertTrue(response.streaming)
         self.assertEqual(response["Content-Type"], "image/png")
 
+    def test_get_sets_etag_and_last_modified(self):
+        rendition = self.image.get_rendition("fill-800x600")
+        signature = generate_signature(self.image.id, "fill-800x600")
+
+        response = self.client.get(
+            reverse(
+                "wagtailimages_serve", args=(signature, self.image.id, "fill-800x600")
+            )
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["ETag"], '"%s"' % rendition.file_hash)
+        self.assertIn("Last-Modified", response)
+        self.assertNotIn("Cache-Control", response)
+
+    def test_get_if_none_match(self):
+        rendition = self.image.get_rendition("fill-800x600")
+        signature = generate_signature(self.image.id, "fill-800x600")
+
+        with mock.patch("django.core.files.File.open") as open_file:
+            response = self.client.get(
+                reverse(
+                    "wagtailimages_serve",
+                    args=(signature, self.image.id, "fill-800x600"),
+                ),
+                HTTP_IF_NONE_MATCH='"%s"' % rendition.file_hash,
+            )
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], '"%s"' % rendition.file_hash)
+        open_file.assert_not_called()
+
+    def test_get_if_none_match_changed(self):
+        signature = generate_signature(self.image.id, "fill-800x600")
+
+        response = self.client.get(
+            reverse(
+                "wagtailimages_serve", args=(signature, self.image.id, "fill-800x600")
+            ),
+            HTTP_IF_NONE_MATCH='"not-the-hash"',
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_get_if_modified_since(self):
+        rendition = self.image.get_rendition("fill-800x600")
+        signature = generate_signature(self.image.id, "fill-800x600")
+
+        response = self.client.get(
+            reverse(
+                "wagtailimages_serve", args=(signature, self.image.id, "fill-800x600")
+            ),
+            HTTP_IF_MODIFIED_SINCE=http_date(rendition.created_at.timestamp() + 60),
+        )
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_get_with_cache_max_age(self):
+        signature = generate_signature(self.image.id, "fill-800x600")
+
+        response = self.client.get(
+            reverse(
+                "wagtailimages_serve_cache_max_age",
+                args=(signature, self.image.id, "fill-800x600"),
+            )
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Cache-Control"], "max-age=3600")
+
+    def test_get_fills_in_missing_file_metadata(self):
+        rendition = self.image.get_rendition("fill-800x600")
+        expected_hash = rendition.file_hash
+        Rendition.objects.filter(id=rendition.id).update(content_type="", file_hash="")
+        signature = generate_signature(self.image.id, "fill-800x600")
+
+        response = self.client.get(
+            reverse(
+                "wagtailimages_serve", args=(signature, self.image.id, "fill-800x600")
+            )
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertEqual(response["ETag"], '"%s"' % expected_hash)
+        rendition.refresh_from_db()
+        self.assertEqual(rendition.content_type, "image/png")
+        self.assertEqual(rendition.file_hash, expected_hash)
+
     def test_get_with_extra_component(self):
         """
         Test that a filename can be optionally added to the end of the URL.
@@ -555,6 +647,40 @@ class TestFrontendSendfileView(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTrue(response.content, "Dummy backend response")
 
+    @override_settings(SENDFILE_BACKEND="sendfile.backends.development")
+    def test_sendfile_if_none_match(self):
+        rendition = self.image.get_rendition("fill-800x600")
+        signature = generate_signature(self.image.id, "fill-800x600")
+
+        with mock.patch("wagtail.images.views.serve.sendfile") as mock_sendfile:
+            response = self.client.get(
+                reverse(
+                    "wagtailimages_sendfile_dummy",
+                    args=(signature, self.image.id, "fill-800x600"),
+                ),
+                HTTP_IF_NONE_MATCH='"%s"' % rendition.file_hash,
+            )
+
+        self.assertEqual(response.status_code, 304)
+        mock_sendfile.assert_not_called()
+
+    @override_settings(SENDFILE_BACKEND="sendfile.backends.development")
+    def test_sendfile_remote_storage(self):
+        signature = generate_signature(self.image.id, "fill-800x600")
+
+        with mock.patch.object(Rendition, "is_stored_locally", return_value=False):
+            response = self.client.get(
+                reverse(
+                    "wagtailimages_sendfile_dummy",
+                    args=(signature, self.image.id, "fill-800x600"),
+                )
+            )
+
+        # Files that aren't on the local filesystem are streamed by Django instead
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "image/png")
+
 
 class TestRect(TestCase):
     def test_init(self):
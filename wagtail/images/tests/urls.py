@@ -25,6 +25,11 @@ urlpatterns = [
         ServeView.as_view(),
         name="wagtailimages_serve_custom_view",
     ),
+    re_path(
+        r"^cache_max_age/(.*)/(\d*)/(.*)/[^/]*",
+        ServeView.as_view(cache_max_age=3600),
+        name="wagtailimages_serve_cache_max_age",
+    ),
     re_path(
         r"^sendfile/(.*)/(\d*)/(.*)/[^/]*",
         SendFileView.as_view(),
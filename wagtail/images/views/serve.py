@@ -1,6 +1,7 @@
-import imghdr
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from wsgiref.util import FileWrapper
 
+from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured, PermissionDenied
 from django.http import (
     HttpResponse,
@@ -9,12 +10,15 @@ from django.http import (
 )
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.utils.decorators import classonlymethod
+from django.utils.http import http_date, quote_etag
 from django.views.generic import View
 
 from wagtail.images import get_image_model
+from wagtail.images.deferred_renditions import get_deferred_rendition_generator
 from wagtail.images.exceptions import InvalidFilterSpecError
-from wagtail.images.models import SourceImageIOError
+from wagtail.images.models import Filter, SourceImageIOError
 from wagtail.images.utils import generate_signature, verify_signature
 from wagtail.utils.sendfile import sendfile
 
@@ -30,6 +34,7 @@ class ServeView(View):
     model = get_image_model()
     action = "serve"
     key = None
+    cache_max_age = None
 
     @classonlymethod
     def as_view(cls, **initkwargs):
@@ -51,7 +56,7 @@ class ServeView(View):
 
         # Get/generate the rendition
         try:
-            rendition = image.get_rendition(filter_spec)
+            rendition = self.get_rendition(image, filter_spec)
         except SourceImageIOError:
             return HttpResponse(
                 "Source image file not found", content_type="text/plain", status=410
@@ -65,12 +70,60 @@ class ServeView(View):
 
         return getattr(self, self.action)(rendition)
 
+    def get_rendition(self, image, filter_spec):
+        if not getattr(settings, "WAGTAILIMAGES_DEFERRED_RENDITIONS", False):
+            return image.get_rendition(filter_spec)
+
+        # Placeholder URLs for renditions being generated in the background point to this
+        # view, so never return another placeholder; wait for the pending rendition (or
+        # generate it here if it was queued by a different process) instead
+        filter = Filter(spec=filter_spec)
+        rendition = image.find_existing_renditions(filter).get(filter.spec)
+        if rendition is not None:
+            return rendition
+
+        focal_point_key = filter.get_cache_key(image)
+        pending = get_deferred_rendition_generator().get_pending(
+            image, filter.spec, focal_point_key
+        )
+        if pending is not None:
+            try:
+                return pending.result(
+                    timeout=getattr(
+                        settings, "WAGTAILIMAGES_DEFERRED_RENDITIONS_TIMEOUT", 10
+                    )
+                )
+            except FutureTimeoutError:
+                # The pool is backed up; don't keep the client waiting any longer
+                pass
+
+        return image.create_rendition(filter, focal_point_key)
+
     def serve(self, rendition):
+        etag = quote_etag(rendition.get_file_hash())
+        last_modified = (
+            int(rendition.created_at.timestamp()) if rendition.created_at else None
+        )
+
+        # Answer conditional requests from the rendition row, without opening the file
+        response = get_conditional_response(
+            self.request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = self.serve_file(rendition)
+
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        if self.cache_max_age is not None:
+            patch_cache_control(response, max_age=self.cache_max_age)
+        return response
+
+    def serve_file(self, rendition):
         # Open and serve the file
         rendition.file.open("rb")
-        image_format = imghdr.what(rendition.file)
         return StreamingHttpResponse(
-            FileWrapper(rendition.file), content_type="image/" + image_format
+            FileWrapper(rendition.file), content_type=rendition.get_content_type()
         )
 
     def redirect(self, rendition):
@@ -84,5 +137,14 @@ serve = ServeView.as_view()
 class SendFileView(ServeView):
     backend = None
 
-    def serve(self, rendition):
-        return sendfile(self.request, rendition.file.path, backend=self.backend)
+    def serve_file(self, rendition):
+        if not rendition.is_stored_locally():
+            # The web server can only send files it can find on the local filesystem
+            return super().serve_file(rendition)
+
+        return sendfile(
+            self.request,
+            rendition.file.path,
+            mimetype=rendition.get_content_type(),
+            backend=self.backend,
+        )
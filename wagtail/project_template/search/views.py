@@ -2,7 +2,7 @@ from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
 from django.template.response import TemplateResponse
 
 from wagtail.core.models import Page
-from wagtail.search.models import Query
+from wagtail.search.hits import add_hit
 
 
 def search(request):
@@ -12,10 +12,9 @@ def search(request):
     # Search
     if search_query:
         search_results = Page.objects.live().search(search_query)
-        query = Query.get(search_query)
 
         # Record hit
-        query.add_hit()
+        add_hit(search_query)
     else:
         search_results = Page.objects.none()
 
@@ -0,0 +1,189 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+from wagtail.search.utils import normalise_query_string
+
+logger = logging.getLogger("wagtail.search")
+
+# The number of query strings written in each set of queries when saving hits
+SAVE_BATCH_SIZE = 500
+
+
+def save_hits(hits):
+    """
+    Add hits to the search query logs. ``hits`` is a mapping of (query string, date) pairs
+    to the number of hits for that query string on that date.
+
+    This makes a fixed number of queries for each batch of query strings, however many
+    hits there are.
+    """
+    from wagtail.search.models import Query, QueryDailyHits
+
+    # Query strings are normally normalised by Query.save(), which bulk_create bypasses
+    normalised_hits = Counter()
+    for (query_string, date), count in hits.items():
+        normalised_hits[(normalise_query_string(query_string), date)] += count
+
+    items = list(normalised_hits.items())
+    for i in range(0, len(items), SAVE_BATCH_SIZE):
+        batch = items[i : i + SAVE_BATCH_SIZE]
+        query_strings = {query_string for (query_string, date), count in batch}
+        dates = {date for (query_string, date), count in batch}
+
+        with transaction.atomic():
+            Query.objects.bulk_create(
+                [Query(query_string=query_string) for query_string in query_strings],
+                ignore_conflicts=True,
+            )
+            query_ids = dict(
+                Query.objects.filter(query_string__in=query_strings).values_list(
+                    "query_string", "id"
+                )
+            )
+
+            daily_hits = {
+                (query_ids[query_string], date): count
+                for (query_string, date), count in batch
+            }
+            QueryDailyHits.objects.bulk_create(
+                [
+                    QueryDailyHits(query_id=query_id, date=date, hits=0)
+                    for query_id, date in daily_hits
+                ],
+                ignore_conflicts=True,
+            )
+            daily_hits_ids = {
+                (query_id, date): pk
+                for pk, query_id, date in QueryDailyHits.objects.filter(
+                    query_id__in=query_ids.values(), date__in=dates
+                ).values_list("pk", "query_id", "date")
+            }
+
+            QueryDailyHits.objects.filter(pk__in=daily_hits_ids.values()).update(
+                hits=F("hits")
+                + Case(
+                    *[
+                        When(pk=daily_hits_ids[key], then=Value(count))
+                        for key, count in daily_hits.items()
+                    ],
+                    default=Value(0),
+                    output_field=IntegerField(),
+                )
+            )
+
+
+class QueryHitBuffer:
+    """
+    Collects search query hits in memory and saves them to the database in bulk, once
+    ``max_hits`` hits have been collected or ``interval`` seconds after the first unsaved
+    hit was recorded (whichever comes first). The interval is enforced by a timer on a
+    daemon thread, so hits are saved even if no more searches are made.
+
+    Hits are counted per query string and day, so popular search terms only cost one
+    update per flush however often they're searched for.
+    """
+
+    def __init__(self, max_hits=100, interval=60):
+        self.max_hits = max_hits
+        self.interval = interval
+        self._hits = Counter()
+        self._hit_count = 0
+        self._first_hit_time = None
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def add_hit(self, query_string, date=None):
+        if date is None:
+            date = timezone.now().date()
+
+        with self._lock:
+            if self._first_hit_time is None:
+                self._first_hit_time = time.monotonic()
+            self._hits[(query_string, date)] += 1
+            self._hit_count += 1
+            should_flush = (
+                self._hit_count >= self.max_hits
+                or time.monotonic() - self._first_hit_time >= self.interval
+            )
+            if not should_flush and self._timer is None:
+                self._timer = threading.Timer(self.interval, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if should_flush:
+            self.flush()
+
+    def _flush_from_timer(self):
+        try:
+            self.flush()
+        finally:
+            # Close the database connections opened by this thread
+            connections.close_all()
+
+    def flush(self):
+        with self._lock:
+            hits = self._hits
+            self._hits = Counter()
+            self._hit_count = 0
+            self._first_hit_time = None
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        if not hits:
+            return
+
+        try:
+            save_hits(hits)
+        except Exception:
+            # Losing some hits is better than failing the search request that
+            # triggered the flush
+            logger.exception("Failed to save %d search query hits", sum(hits.values()))
+
+
+_query_hit_buffer = None
+_query_hit_buffer_lock = threading.Lock()
+
+
+def get_query_hit_buffer():
+    """
+    Return the QueryHitBuffer for this process, configured by the
+    WAGTAILSEARCH_HITS_BUFFER_SIZE and WAGTAILSEARCH_HITS_BUFFER_INTERVAL settings
+    """
+    global _query_hit_buffer
+
+    with _query_hit_buffer_lock:
+        if _query_hit_buffer is None:
+            _query_hit_buffer = QueryHitBuffer(
+                max_hits=getattr(settings, "WAGTAILSEARCH_HITS_BUFFER_SIZE", 100),
+                interval=getattr(settings, "WAGTAILSEARCH_HITS_BUFFER_INTERVAL", 60),
+            )
+            # Save any remaining hits when the process exits
+            atexit.register(_query_hit_buffer.flush)
+        return _query_hit_buffer
+
+
+def add_hit(query_string, date=None):
+    """
+    Record a hit for a search query string, without making any database queries until
+    the hits collected by this process are saved in bulk.
+
+    This can be used in place of ``Query.get(query_string).add_hit()`` in search views.
+    """
+    get_query_hit_buffer().add_hit(query_string, date=date)
+
+
+def flush_hits():
+    """
+    Save all search query hits collected by this process to the database
+    """
+    if _query_hit_buffer is not None:
+        _query_hit_buffer.flush()
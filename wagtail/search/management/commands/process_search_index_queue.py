@@ -0,0 +1,52 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from wagtail.search.queue import DEFAULT_BATCH_SIZE, process_index_queue
+
+
+class Command(BaseCommand):
+    help = "Apply pending changes recorded in the search index queue to the search backends"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Number of queue entries to process at a time (default: %d)"
+            % DEFAULT_BATCH_SIZE,
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running, waiting for new entries once the queue is empty",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Number of seconds to wait between checks for new entries when running with --loop (default: 1)",
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            try:
+                processed = process_index_queue(batch_size=options["batch_size"])
+            except Exception:
+                if not options["loop"]:
+                    raise
+
+                # The error has been logged; retry the same entries after a pause
+                processed = 0
+            else:
+                total += processed
+                if processed and options["verbosity"] >= 2:
+                    self.stdout.write("Processed %d queue entries" % processed)
+
+            if not processed:
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
+
+        self.stdout.write("Processed %d queue entries" % total)
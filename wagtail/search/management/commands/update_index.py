@@ -1,8 +1,12 @@
 import collections
+import multiprocessing
+import os
+import time
 
+from django.apps import apps
 from django.conf import settings
-from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
 
 from wagtail.search.backends import get_search_backend
 from wagtail.search.index import get_indexed_models
@@ -53,9 +57,58 @@ def group_models_by_index(backend, models):
     )
 
 
+def get_index_by_name(backend, model, index_name):
+    """
+    Return the index called index_name that the given model is being indexed into.
+
+    This is usually the backend's index for the model, but atomic Elasticsearch rebuilds
+    write into a new index, which only replaces it once the rebuild has finished.
+    """
+    index = backend.get_index_for_model(model)
+    if index.name != index_name:
+        index = backend.index_class(backend, index_name)
+    return index
+
+
+def index_objects(backend_name, index_name, model_label, first_pk, last_pk):
+    """
+    Add the indexed objects of the given model with primary keys between first_pk and
+    last_pk (inclusive) to an index. Returns the number of objects indexed.
+
+    This is run on the worker processes of the command's pool, so it must be importable
+    at module level and only take picklable arguments.
+    """
+    backend = get_search_backend(backend_name)
+    model = apps.get_model(model_label)
+    index = get_index_by_name(backend, model, index_name)
+
+    # get_indexed_objects() applies the select_related/prefetch_related calls needed by
+    # the model's RelatedFields
+    items = list(
+        model.get_indexed_objects()
+        .filter(pk__gte=first_pk, pk__lte=last_pk)
+        .order_by("pk")
+    )
+    index.add_items(model, items)
+    return len(items)
+
+
+def _index_objects_for_chunk(args):
+    return index_objects(*args)
+
+
+def _init_worker():
+    # Forked workers must not share the parent's database connections
+    connections.close_all()
+
+
 class Command(BaseCommand):
     def update_backend(
-        self, backend_name, schema_only=False, chunk_size=DEFAULT_CHUNK_SIZE
+        self,
+        backend_name,
+        schema_only=False,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        pool=None,
     ):
         self.stdout.write("Updating backend: " + backend_name)
 
@@ -78,6 +131,20 @@ class Command(BaseCommand):
             rebuilder = backend.rebuilder_class(index)
             index = rebuilder.start()
 
+            index_pool = pool
+            if index_pool is not None and getattr(
+                rebuilder, "transaction_opened", False
+            ):
+                # Atomic rebuilds of the database backends happen in a transaction on
+                # this process, which other processes can't write to
+                self.stdout.write(
+                    backend_name
+                    + ": Atomic rebuilds can't use worker processes, indexing serially"
+                )
+                index_pool = None
+
+            start_time = time.monotonic()
+
             # Add models
             for model in models:
                 index.add_model(model)
@@ -93,21 +160,54 @@ class Command(BaseCommand):
                         ending="",
                     )
 
-                    # Add items (chunk_size at a time)
-                    for chunk in self.print_iter_progress(
-                        self.queryset_chunks(
-                            model.get_indexed_objects().order_by("pk"), chunk_size
+                    model_start_time = time.monotonic()
+                    model_object_count = 0
+
+                    if index_pool is not None:
+                        # Hand out ranges of primary keys (chunk_size at a time) to
+                        # the workers, which fetch and index the objects themselves
+                        chunks = (
+                            (
+                                backend_name,
+                                index.name,
+                                model._meta.label,
+                                pks[0],
+                                pks[-1],
+                            )
+                            for pks in self.pk_chunks(
+                                model.get_indexed_objects(), chunk_size
+                            )
                         )
-                    ):
-                        index.add_items(model, chunk)
-                        object_count += len(chunk)
+                        for count in self.print_iter_progress(
+                            index_pool.imap_unordered(_index_objects_for_chunk, chunks)
+                        ):
+                            model_object_count += count
+                    else:
+                        # Add items (chunk_size at a time)
+                        for chunk in self.print_iter_progress(
+                            self.queryset_chunks(
+                                model.get_indexed_objects().order_by("pk"), chunk_size
+                            )
+                        ):
+                            index.add_items(model, chunk)
+                            model_object_count += len(chunk)
 
                     self.print_newline()
+                    self.print_throughput(
+                        " " * 35 + "%d objects" % model_object_count,
+                        model_object_count,
+                        model_start_time,
+                    )
+                    object_count += model_object_count
 
             # Finish rebuild
             rebuilder.finish()
 
-            self.stdout.write(backend_name + ": indexed %d objects" % object_count)
+            self.print_throughput(
+                backend_name + ": indexed %d objects" % object_count,
+                object_count,
+                start_time,
+            )
             self.print_newline()
 
     def add_arguments(self, parser):
@@ -133,6 +233,14 @@ class Command(BaseCommand):
             type=int,
             help="Set number of records to be fetched at once for inserting into the index",
         )
+        parser.add_argument(
+            "--workers",
+            action="store",
+            dest="workers",
+            default=1,
+            type=int,
+            help="Number of worker processes to index objects with (default: 1, meaning no pool). Pass 0 to use one per CPU",
+        )
 
     def handle(self, **options):
         # Get list of backends to index
@@ -146,17 +254,51 @@ class Command(BaseCommand):
             # index the 'default' backend only
             backend_names = ["default"]
 
+        workers = options.get("workers", 1)
+        if workers < 0:
+            raise CommandError("--workers must not be negative")
+        workers = workers or os.cpu_count()
+
+        pool = None
+        if workers > 1 and not options.get("schema_only", False):
+            # Workers must be forked from this process, so that they inherit its Django
+            # setup; the default start method on some platforms spawns a fresh
+            # interpreter instead
+            try:
+                mp_context = multiprocessing.get_context("fork")
+            except ValueError:
+                raise CommandError(
+                    "--workers requires the 'fork' multiprocessing start method, which "
+                    "isn't available on this platform"
+                )
+            # Close this process's connections first, so they aren't shared
+            connections.close_all()
+            pool = mp_context.Pool(workers, initializer=_init_worker)
+
         # Update backends
-        for backend_name in backend_names:
-            self.update_backend(
-                backend_name,
-                schema_only=options.get("schema_only", False),
-                chunk_size=options.get("chunk_size"),
-            )
+        try:
+            for backend_name in backend_names:
+                self.update_backend(
+                    backend_name,
+                    schema_only=options.get("schema_only", False),
+                    chunk_size=options.get("chunk_size"),
+                    pool=pool,
+                )
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
 
     def print_newline(self):
         self.stdout.write("")
 
+    def print_throughput(self, message, object_count, start_time):
+        elapsed = time.monotonic() - start_time
+        self.stdout.write(
+            "%s in %.1fs (%.0f objects/s)"
+            % (message, elapsed, object_count / elapsed if elapsed else 0)
+        )
+
     def print_iter_progress(self, iterable):
         """
         Print a progress meter while iterating over an iterable. Use it as part
@@ -180,19 +322,35 @@ class Command(BaseCommand):
 
             self.stdout.flush()
 
-    # Atomic so the count of models doesn't change as it is iterated
-    @transaction.atomic
     def queryset_chunks(self, qs, chunk_size=DEFAULT_CHUNK_SIZE):
         """
-        Yield a queryset in chunks of at most ``chunk_size``. The chunk yielded
-        will be a list, not a queryset. Iterating over the chunks is done in a
-        transaction so that the order and count of items in the queryset
-        remains stable.
+        Yield a queryset in chunks of at most ``chunk_size``, in primary key order. The
+        chunk yielded will be a list, not a queryset.
+
+        Each chunk is fetched by filtering on the last primary key of the previous one
+        (keyset pagination) rather than with an offset, so fetching a chunk stays equally
+        cheap however far through the queryset it is.
         """
-        i = 0
+        qs = qs.order_by("pk")
+        last_pk = None
         while True:
-            items = list(qs[i * chunk_size :][:chunk_size])
+            chunk_qs = qs if last_pk is None else qs.filter(pk__gt=last_pk)
+            items = list(chunk_qs[:chunk_size])
             if not items:
                 break
             yield items
-            i += 1
+            last_pk = items[-1].pk
+
+    def pk_chunks(self, qs, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Like ``queryset_chunks``, but yield lists of primary keys instead of objects
+        """
+        qs = qs.prefetch_related(None).order_by("pk").values_list("pk", flat=True)
+        last_pk = None
+        while True:
+            chunk_qs = qs if last_pk is None else qs.filter(pk__gt=last_pk)
+            pks = list(chunk_qs[:chunk_size])
+            if not pks:
+                break
+            yield pks
+            last_pk = pks[-1]
@@ -0,0 +1,50 @@
+# Generated by Django 4.0.10 on 2026-10-17 07:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("wagtailsearch", "0006_customise_indexentry"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IndexQueueEntry",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("object_id", models.CharField(max_length=50)),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[("update", "Update"), ("delete", "Delete")],
+                        max_length=10,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "index queue entry",
+                "verbose_name_plural": "index queue entries",
+            },
+        ),
+    ]
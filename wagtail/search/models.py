@@ -101,6 +101,35 @@ class QueryDailyHits(models.Model):
         verbose_name_plural = _("Query Daily Hits")
 
 
+class IndexQueueEntry(models.Model):
+    """
+    A pending change to the search index, recorded when WAGTAILSEARCH_INDEX_QUEUE is enabled
+    and applied in bulk by the process_search_index_queue management command
+    """
+
+    ACTION_UPDATE = "update"
+    ACTION_DELETE = "delete"
+    ACTION_CHOICES = [
+        (ACTION_UPDATE, _("Update")),
+        (ACTION_DELETE, _("Delete")),
+    ]
+
+    content_type = models.ForeignKey(
+        ContentType, on_delete=models.CASCADE, related_name="+"
+    )
+    # We do not use an IntegerField since primary keys are not always integers.
+    object_id = models.CharField(max_length=50)
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("index queue entry")
+        verbose_name_plural = _("index queue entries")
+
+    def __str__(self):
+        return "%s %s: %s" % (self.action, self.content_type.name, self.object_id)
+
+
 class TextIDGenericRelation(GenericRelation):
     auto_created = True
 
@@ -0,0 +1,194 @@
+import logging
+import threading
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import transaction
+
+from wagtail.search.backends import get_search_backends_with_name
+from wagtail.search.index import get_indexed_instance
+
+logger = logging.getLogger("wagtail.search.index")
+
+DEFAULT_BATCH_SIZE = 1000
+
+_index_update_batch = threading.local()
+
+
+def index_queue_enabled():
+    return getattr(settings, "WAGTAILSEARCH_INDEX_QUEUE", False)
+
+
+def index_updates_batched():
+    return getattr(_index_update_batch, "actions", None) is not None
+
+
+@contextmanager
+def batch_index_updates():
+    """
+    Collect the search index changes made by saving or deleting indexed objects within
+    the block, and apply them once it exits normally and the current transaction (if
+    any) commits, with repeated changes to the same object applied once and updates sent
+    to each backend in bulk. If the block raises an exception, the changes are discarded.
+
+    This has no effect if WAGTAILSEARCH_INDEX_QUEUE is enabled, as the queue already
+    coalesces changes.
+    """
+    if index_queue_enabled() or index_updates_batched():
+        yield
+        return
+
+    _index_update_batch.actions = OrderedDict()
+    try:
+        yield
+    finally:
+        actions = _index_update_batch.actions
+        _index_update_batch.actions = None
+
+    if actions:
+        transaction.on_commit(lambda: _apply_batched_index_actions(actions))
+
+
+def _apply_batched_index_actions(actions):
+    try:
+        _apply_index_actions(actions)
+    except Exception:
+        # The error has been logged, and the changes themselves have been committed, as
+        # when the index is updated for each object
+        pass
+
+
+def _add_queue_entry(content_type_id, object_id, action):
+    from wagtail.search.models import IndexQueueEntry
+
+    IndexQueueEntry.objects.create(
+        content_type_id=content_type_id, object_id=object_id, action=action
+    )
+
+
+def _enqueue(instance, action):
+    # The entry is only written once the current transaction commits, so changes that
+    # are rolled back never reach the queue
+    from django.contrib.contenttypes.models import ContentType
+
+    content_type_id = ContentType.objects.get_for_model(
+        type(instance), for_concrete_model=False
+    ).id
+    object_id = str(instance.pk)
+
+    if index_updates_batched():
+        # Keep the most recent action for each object
+        _index_update_batch.actions.pop((content_type_id, object_id), None)
+        _index_update_batch.actions[(content_type_id, object_id)] = action
+        return
+
+    transaction.on_commit(lambda: _add_queue_entry(content_type_id, object_id, action))
+
+
+def enqueue_update(instance):
+    """
+    Record that the given object needs to be added to or updated in the search index
+    """
+    from wagtail.search.models import IndexQueueEntry
+
+    _enqueue(instance, IndexQueueEntry.ACTION_UPDATE)
+
+
+def enqueue_delete(instance):
+    """
+    Record that the given object needs to be removed from the search index
+    """
+    from wagtail.search.models import IndexQueueEntry
+
+    # The object won't exist by the time the queue is processed, so record the model it
+    # was indexed as now
+    indexed_instance = get_indexed_instance(instance, check_exists=False)
+    if indexed_instance is not None:
+        _enqueue(indexed_instance, IndexQueueEntry.ACTION_DELETE)
+
+
+def process_index_queue(batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Apply the oldest entries in the search index queue (up to batch_size of them) to all
+    search backends with AUTO_UPDATE enabled, and remove them from the queue. Returns the
+    number of entries processed.
+
+    Entries for the same object are coalesced, so only the most recent action for each
+    object is applied, and updates are sent to each backend in bulk, one request per model.
+    If a backend raises an error, the entries are left in the queue to be retried.
+    """
+    from wagtail.search.models import IndexQueueEntry
+
+    entries = list(
+        IndexQueueEntry.objects.order_by("pk").values_list(
+            "pk", "content_type_id", "object_id", "action"
+        )[:batch_size]
+    )
+    if not entries:
+        return 0
+
+    # Keep the most recent action for each object
+    actions = OrderedDict()
+    for pk, content_type_id, object_id, action in entries:
+        actions.pop((content_type_id, object_id), None)
+        actions[(content_type_id, object_id)] = action
+
+    _apply_index_actions(actions)
+
+    IndexQueueEntry.objects.filter(pk__in=[entry[0] for entry in entries]).delete()
+
+    return len(entries)
+
+
+def _apply_index_actions(actions):
+    """
+    Apply a mapping of (content type ID, object ID) pairs to index actions to all search
+    backends with AUTO_UPDATE enabled
+    """
+    from django.contrib.contenttypes.models import ContentType
+
+    from wagtail.search.models import IndexQueueEntry
+
+    object_ids_to_update = defaultdict(list)
+    objects_to_delete = []
+    for (content_type_id, object_id), action in actions.items():
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        if model is None:
+            # The model has been removed since the entry was recorded
+            continue
+
+        if action == IndexQueueEntry.ACTION_DELETE:
+            objects_to_delete.append(model(pk=model._meta.pk.to_python(object_id)))
+        else:
+            object_ids_to_update[model].append(object_id)
+
+    # Find the model that each object is indexed as, which may differ from the model it
+    # was saved as (such as a page saved as a plain Page rather than its specific class)
+    indexed_object_ids = defaultdict(list)
+    for model, object_ids in object_ids_to_update.items():
+        for obj in model._default_manager.filter(pk__in=object_ids):
+            indexed_instance = obj.get_indexed_instance()
+            if indexed_instance is not None:
+                indexed_object_ids[type(indexed_instance)].append(indexed_instance.pk)
+
+    # Fetch the objects to update from their indexed model's indexed objects
+    objects_to_update = {
+        model: list(model.get_indexed_objects().filter(pk__in=object_ids))
+        for model, object_ids in indexed_object_ids.items()
+    }
+
+    for backend_name, backend in get_search_backends_with_name(with_auto_update=True):
+        try:
+            for model, objs in objects_to_update.items():
+                if objs:
+                    backend.add_bulk(model, objs)
+
+            for obj in objects_to_delete:
+                backend.delete(obj)
+        except Exception:
+            logger.exception(
+                "Exception raised while processing the search index queue for the '%s' search backend",
+                backend_name,
+            )
+            raise
@@ -1,9 +1,20 @@
 from django.db.models.signals import post_delete, post_save
 
 from wagtail.search import index
+from wagtail.search.queue import (
+    enqueue_delete,
+    enqueue_update,
+    index_queue_enabled,
+    index_updates_batched,
+)
 
 
 def post_save_signal_handler(instance, update_fields=None, **kwargs):
+    if index_queue_enabled() or index_updates_batched():
+        # The object will be fetched fresh from the database when the queue is processed
+        enqueue_update(instance)
+        return
+
     if update_fields is not None:
         # fetch a fresh copy of instance from the database to ensure
         # that we're not indexing any of the unsaved data contained in
@@ -14,6 +25,10 @@ def post_save_signal_handler(instance, update_fields=None, **kwargs):
 
 
 def post_delete_signal_handler(instance, **kwargs):
+    if index_queue_enabled() or index_updates_batched():
+        enqueue_delete(instance)
+        return
+
     index.remove_object(instance)
 
 
@@ -0,0 +1,216 @@
+import datetime
+from io import StringIO
+from unittest import mock
+
+from django.core import management
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from wagtail.search.models import IndexQueueEntry
+from wagtail.search.queue import batch_index_updates, process_index_queue
+from wagtail.tests.search import models
+
+
+@override_settings(WAGTAILSEARCH_INDEX_QUEUE=True)
+class TestIndexQueue(TestCase):
+    def setUp(self):
+        self.backend = mock.MagicMock()
+        patcher = mock.patch(
+            "wagtail.search.queue.get_search_backends_with_name",
+            return_value=[("default", self.backend)],
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_book(self, title):
+        with self.captureOnCommitCallbacks(execute=True):
+            return models.Book.objects.create(
+                title=title,
+                publication_date=datetime.date(2022, 1, 1),
+                number_of_pages=100,
+            )
+
+    def test_save_is_queued(self):
+        with mock.patch(
+            "wagtail.search.index.insert_or_update_object"
+        ) as insert_or_update_object:
+            book = self.create_book("Queued")
+
+        insert_or_update_object.assert_not_called()
+        entry = IndexQueueEntry.objects.get()
+        self.assertEqual(entry.content_type.model_class(), models.Book)
+        self.assertEqual(entry.object_id, str(book.pk))
+        self.assertEqual(entry.action, IndexQueueEntry.ACTION_UPDATE)
+
+    def test_delete_is_queued(self):
+        book = self.create_book("Deleted")
+        book_pk = book.pk
+
+        with self.captureOnCommitCallbacks(execute=True):
+            book.delete()
+
+        self.assertEqual(
+            list(
+                IndexQueueEntry.objects.order_by("pk").values_list("action", flat=True)
+            ),
+            [IndexQueueEntry.ACTION_UPDATE, IndexQueueEntry.ACTION_DELETE],
+        )
+        self.assertEqual(IndexQueueEntry.objects.latest("pk").object_id, str(book_pk))
+
+    def test_rolled_back_changes_are_not_queued(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    models.Book.objects.create(
+                        title="Rolled back",
+                        publication_date=datetime.date(2022, 1, 1),
+                        number_of_pages=100,
+                    )
+                    raise ValueError
+            except ValueError:
+                pass
+
+        self.assertFalse(IndexQueueEntry.objects.exists())
+
+    def test_process_coalesces_updates(self):
+        book = self.create_book("First")
+        other_book = self.create_book("Second")
+        with self.captureOnCommitCallbacks(execute=True):
+            book.title = "First, revised"
+            book.save()
+
+        self.assertEqual(process_index_queue(), 3)
+
+        self.backend.add_bulk.assert_called_once()
+        model, objs = self.backend.add_bulk.call_args[0]
+        self.assertEqual(model, models.Book)
+        self.assertEqual({obj.pk for obj in objs}, {book.pk, other_book.pk})
+        self.assertEqual(
+            [obj.title for obj in objs if obj.pk == book.pk], ["First, revised"]
+        )
+        self.backend.delete.assert_not_called()
+        self.assertFalse(IndexQueueEntry.objects.exists())
+
+    def test_process_applies_latest_action(self):
+        book = self.create_book("Short-lived")
+        book_pk = book.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            book.delete()
+
+        process_index_queue()
+
+        self.backend.add_bulk.assert_not_called()
+        self.backend.delete.assert_called_once()
+        deleted = self.backend.delete.call_args[0][0]
+        self.assertIsInstance(deleted, models.Book)
+        self.assertEqual(deleted.pk, book_pk)
+
+    def test_process_batch_size(self):
+        self.create_book("First")
+        self.create_book("Second")
+
+        self.assertEqual(process_index_queue(batch_size=1), 1)
+        self.assertEqual(IndexQueueEntry.objects.count(), 1)
+
+    def test_entries_are_kept_on_backend_error(self):
+        self.create_book("Failing")
+        self.backend.add_bulk.side_effect = Exception("Backend unavailable")
+
+        with self.assertRaises(Exception), self.assertLogs(
+            "wagtail.search.index", level="ERROR"
+        ):
+            process_index_queue()
+
+        self.assertEqual(IndexQueueEntry.objects.count(), 1)
+
+    def test_management_command(self):
+        self.create_book("First")
+        self.create_book("Second")
+
+        stdout = StringIO()
+        management.call_command(
+            "process_search_index_queue", batch_size=1, stdout=stdout
+        )
+
+        self.assertIn("Processed 2 queue entries", stdout.getvalue())
+        self.assertEqual(self.backend.add_bulk.call_count, 2)
+        self.assertFalse(IndexQueueEntry.objects.exists())
+
+
+class TestBatchIndexUpdates(TestCase):
+    def setUp(self):
+        self.backend = mock.MagicMock()
+        patcher = mock.patch(
+            "wagtail.search.queue.get_search_backends_with_name",
+            return_value=[("default", self.backend)],
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_book(self, title):
+        return models.Book.objects.create(
+            title=title,
+            publication_date=datetime.date(2022, 1, 1),
+            number_of_pages=100,
+        )
+
+    def test_updates_are_applied_in_bulk(self):
+        with mock.patch(
+            "wagtail.search.index.insert_or_update_object"
+        ) as insert_or_update_object:
+            with self.captureOnCommitCallbacks(execute=True):
+                with batch_index_updates():
+                    book = self.create_book("First")
+                    other_book = self.create_book("Second")
+                    book.title = "First, revised"
+                    book.save()
+                self.backend.add_bulk.assert_not_called()
+
+        insert_or_update_object.assert_not_called()
+        self.backend.add_bulk.assert_called_once()
+        model, objs = self.backend.add_bulk.call_args[0]
+        self.assertEqual(model, models.Book)
+        self.assertEqual(
+            sorted((obj.pk, obj.title) for obj in objs),
+            [(book.pk, "First, revised"), (other_book.pk, "Second")],
+        )
+        self.assertFalse(IndexQueueEntry.objects.exists())
+
+    def test_deleted_objects_are_removed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with batch_index_updates():
+                book = self.create_book("Short-lived")
+                book_pk = book.pk
+                book.delete()
+
+        self.backend.add_bulk.assert_not_called()
+        self.backend.delete.assert_called_once()
+        self.assertEqual(self.backend.delete.call_args[0][0].pk, book_pk)
+
+    def test_updates_are_discarded_on_error(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(ValueError):
+                with batch_index_updates():
+                    self.create_book("Doomed")
+                    raise ValueError
+
+        self.assertEqual(callbacks, [])
+        self.backend.add_bulk.assert_not_called()
+
+    def test_backend_errors_do_not_propagate(self):
+        self.backend.add_bulk.side_effect = Exception("Backend unavailable")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with batch_index_updates():
+                self.create_book("Unindexed")
+
+        self.backend.add_bulk.assert_called_once()
+
+    @override_settings(WAGTAILSEARCH_INDEX_QUEUE=True)
+    def test_queue_is_used_when_enabled(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with batch_index_updates():
+                self.create_book("Queued")
+
+        self.backend.add_bulk.assert_not_called()
+        self.assertEqual(IndexQueueEntry.objects.count(), 1)
@@ -1,12 +1,15 @@
 import datetime
 import json
+import threading
 from io import StringIO
+from unittest import mock
 
 from django.core import management
 from django.test import SimpleTestCase, TestCase
 
 from wagtail.contrib.search_promotions.models import SearchPromotion
 from wagtail.search import models
+from wagtail.search.hits import QueryHitBuffer, save_hits
 from wagtail.search.query import And, Or, Phrase, PlainText
 from wagtail.search.utils import (
     balanced_reduce,
@@ -37,6 +40,82 @@ class TestHitCounter(TestCase):
         self.assertEqual(models.Query.get("Hello").hits, 10)
 
 
+class TestQueryHitBuffer(TestCase):
+    def test_hits_are_buffered(self):
+        hit_buffer = QueryHitBuffer(max_hits=100, interval=60)
+
+        with self.assertNumQueries(0):
+            for i in range(10):
+                hit_buffer.add_hit("Hello")
+
+        self.assertEqual(models.Query.get("Hello").hits, 0)
+
+        hit_buffer.flush()
+        self.assertEqual(models.Query.get("Hello").hits, 10)
+
+    def test_flush_at_max_hits(self):
+        hit_buffer = QueryHitBuffer(max_hits=3, interval=60)
+        self.addCleanup(hit_buffer.flush)
+
+        for i in range(4):
+            hit_buffer.add_hit("Hello")
+
+        self.assertEqual(models.Query.get("Hello").hits, 3)
+
+    def test_flush_after_interval(self):
+        hit_buffer = QueryHitBuffer(max_hits=100, interval=60)
+        hit_buffer.add_hit("Hello")
+
+        with mock.patch(
+            "wagtail.search.hits.time.monotonic",
+            return_value=hit_buffer._first_hit_time + 61,
+        ):
+            hit_buffer.add_hit("Hello")
+
+        self.assertEqual(models.Query.get("Hello").hits, 2)
+
+    def test_timer_flushes_without_more_hits(self):
+        hit_buffer = QueryHitBuffer(max_hits=100, interval=0.01)
+        flushed = threading.Event()
+
+        with mock.patch.object(hit_buffer, "flush", side_effect=flushed.set):
+            hit_buffer.add_hit("Hello")
+            self.assertTrue(flushed.wait(timeout=5))
+
+    def test_flush_cancels_timer(self):
+        hit_buffer = QueryHitBuffer(max_hits=100, interval=60)
+        hit_buffer.add_hit("Hello")
+        timer = hit_buffer._timer
+        self.assertTrue(timer.daemon)
+
+        hit_buffer.flush()
+
+        self.assertIsNone(hit_buffer._timer)
+        self.assertTrue(timer.finished.is_set())
+        self.assertEqual(models.Query.get("Hello").hits, 1)
+
+    def test_save_hits(self):
+        today = datetime.date(2022, 3, 1)
+        yesterday = datetime.date(2022, 2, 28)
+        models.Query.get("hello").add_hit(date=today)
+
+        with self.assertNumQueries(7):
+            save_hits(
+                {
+                    ("Hello", today): 3,
+                    ("  HELLO ", today): 1,
+                    ("Hello", yesterday): 2,
+                    ("New query", today): 5,
+                }
+            )
+
+        hello = models.Query.get("hello")
+        self.assertEqual(hello.hits, 7)
+        self.assertEqual(hello.daily_hits.get(date=today).hits, 5)
+        self.assertEqual(hello.daily_hits.get(date=yesterday).hits, 2)
+        self.assertEqual(models.Query.get("New query").hits, 5)
+
+
 class TestQueryStringNormalisation(TestCase):
     def setUp(self):
         self.query = models.Query.get("  Hello  World!  ")
@@ -0,0 +1,166 @@
+import sqlite3
+import unittest
+from io import StringIO
+from unittest import mock
+
+from django.core import management
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from wagtail.search.backends import get_search_backend
+from wagtail.search.backends.database.sqlite.utils import fts5_available
+from wagtail.search.management.commands.update_index import Command, index_objects
+from wagtail.search.models import IndexEntry
+from wagtail.tests.search import models
+
+
+class InProcessPool:
+    """
+    Stands in for a multiprocessing pool, running tasks in the current process
+    """
+
+    def __init__(self, processes, initializer=None):
+        self.processes = processes
+
+    def imap_unordered(self, func, iterable):
+        return map(func, iterable)
+
+    def terminate(self):
+        pass
+
+    def join(self):
+        pass
+
+
+@unittest.skipUnless(
+    connection.vendor == "sqlite", "The current database is not SQLite"
+)
+@unittest.skipIf(
+    sqlite3.sqlite_version_info < (3, 19, 0), "This SQLite version is not supported"
+)
+@unittest.skipUnless(fts5_available(), "The SQLite fts5 extension is not available")
+@override_settings(
+    WAGTAILSEARCH_BACKENDS={
+        "default": {
+            "BACKEND": "wagtail.search.backends.database.sqlite.sqlite",
+        }
+    }
+)
+class TestUpdateIndex(TestCase):
+    fixtures = ["search"]
+
+    def setUp(self):
+        IndexEntry.objects.all().delete()
+
+    def run_command(self, **options):
+        stdout = StringIO()
+        management.call_command("update_index", stdout=stdout, **options)
+        return stdout.getvalue()
+
+    def get_indexed_book_ids(self):
+        return set(
+            IndexEntry.objects.filter(
+                content_type__model__in=["book", "novel", "programmingguide"]
+            ).values_list("object_id", flat=True)
+        )
+
+    def test_queryset_chunks_uses_keyset_pagination(self):
+        books = models.Book.objects.all()
+
+        with CaptureQueriesContext(connection) as queries:
+            chunks = list(Command().queryset_chunks(books, chunk_size=2))
+
+        self.assertEqual(
+            [book.pk for chunk in chunks for book in chunk],
+            list(books.order_by("pk").values_list("pk", flat=True)),
+        )
+        self.assertTrue(all(len(chunk) <= 2 for chunk in chunks))
+        for query in queries.captured_queries:
+            self.assertNotIn("OFFSET", query["sql"])
+
+    def test_pk_chunks(self):
+        pks = list(models.Author.objects.order_by("pk").values_list("pk", flat=True))
+
+        chunks = list(
+            Command().pk_chunks(models.Author.get_indexed_objects(), chunk_size=3)
+        )
+
+        self.assertEqual([pk for chunk in chunks for pk in chunk], pks)
+        self.assertEqual(chunks[0], pks[:3])
+
+    def test_index_objects(self):
+        backend = get_search_backend("default")
+        index = backend.get_index_for_model(models.Author)
+        author_ids = list(
+            models.Author.objects.order_by("pk").values_list("pk", flat=True)
+        )
+
+        count = index_objects(
+            "default", index.name, "searchtests.Author", author_ids[0], author_ids[1]
+        )
+
+        self.assertEqual(count, 2)
+        self.assertEqual(
+            set(
+                IndexEntry.objects.filter(content_type__model="author").values_list(
+                    "object_id", flat=True
+                )
+            ),
+            {str(author_ids[0]), str(author_ids[1])},
+        )
+
+    def test_prints_throughput(self):
+        output = self.run_command(chunk_size=2)
+
+        self.assertIn("objects/s", output)
+
+    def test_workers(self):
+        self.run_command(chunk_size=2)
+        serial_ids = self.get_indexed_book_ids()
+        IndexEntry.objects.all().delete()
+
+        with mock.patch(
+            "wagtail.search.management.commands.update_index.multiprocessing.get_context",
+            return_value=mock.Mock(Pool=InProcessPool),
+        ) as get_context:
+            self.run_command(chunk_size=2, workers=2)
+
+        # Workers are always forked, whatever the platform's default start method
+        get_context.assert_called_once_with("fork")
+
+        self.assertTrue(serial_ids)
+        self.assertEqual(self.get_indexed_book_ids(), serial_ids)
+
+    @override_settings(
+        WAGTAILSEARCH_BACKENDS={
+            "default": {
+                "BACKEND": "wagtail.search.backends.database.sqlite.sqlite",
+                "ATOMIC_REBUILD": True,
+            }
+        }
+    )
+    def test_atomic_rebuild_indexes_serially(self):
+        with mock.patch(
+            "wagtail.search.management.commands.update_index.multiprocessing.get_context",
+            return_value=mock.Mock(Pool=InProcessPool),
+        ), mock.patch(
+            "wagtail.search.management.commands.update_index.index_objects"
+        ) as mock_index_objects:
+            output = self.run_command(chunk_size=2, workers=2)
+
+        self.assertIn("Atomic rebuilds can't use worker processes", output)
+        mock_index_objects.assert_not_called()
+        self.assertTrue(self.get_indexed_book_ids())
+
+    def test_workers_require_fork(self):
+        with mock.patch(
+            "wagtail.search.management.commands.update_index.multiprocessing.get_context",
+            side_effect=ValueError("cannot find context for 'fork'"),
+        ):
+            with self.assertRaises(management.CommandError):
+                self.run_command(workers=2)
+
+    def test_negative_workers(self):
+        with self.assertRaises(management.CommandError):
+            self.run_command(workers=-1)
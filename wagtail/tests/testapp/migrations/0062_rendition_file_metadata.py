@@ -0,0 +1,43 @@
+# Generated by Django 4.0.10 on 2026-10-17 06:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tests", "0061_tag_fk_for_django_4"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customrendition",
+            name="content_type",
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name="customrendition",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="customrendition",
+            name="file_hash",
+            field=models.CharField(blank=True, editable=False, max_length=40),
+        ),
+        migrations.AddField(
+            model_name="customrenditionwithauthor",
+            name="content_type",
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name="customrenditionwithauthor",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="customrenditionwithauthor",
+            name="file_hash",
+            field=models.CharField(blank=True, editable=False, max_length=40),
+        ),
+    ]